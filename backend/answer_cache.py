@@ -0,0 +1,138 @@
+import os
+import re
+import math
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Cache configuration
+ANSWER_CACHE_MAX_ENTRIES = int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "1000"))
+ANSWER_CACHE_TTL = float(os.getenv("ANSWER_CACHE_TTL", "3600"))
+# Cosine similarity above which a different question counts as the same one (0 disables)
+ANSWER_CACHE_SIMILARITY = float(os.getenv("ANSWER_CACHE_SIMILARITY", "0"))
+
+
+def normalize_question(question: str) -> str:
+    """Lowercase, collapse whitespace and drop trailing punctuation."""
+    return re.sub(r"\s+", " ", question.strip().lower()).rstrip(" ?!.")
+
+
+def cosine_similarity(a: List[float], b: List[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+class _Entry:
+    __slots__ = ("chunks", "embedding", "version", "expires_at")
+
+    def __init__(self, chunks: List[str], embedding: Optional[List[float]], version: Optional[int], expires_at: float):
+        self.chunks = chunks
+        self.embedding = embedding
+        self.version = version
+        self.expires_at = expires_at
+
+
+class AnswerCache:
+    """
+    In-memory cache of generated context answers.
+
+    Entries are keyed by (model, sorted retrieved chunk ids, normalized
+    question) and hold the answer's stream chunks so a hit can be replayed in
+    the original framing. Entries expire after ttl seconds, the least recently
+    used ones are evicted past max_entries, and answers are ignored once the
+    collection version they were generated against changes. With a
+    similarity threshold, a question whose embedding is close enough to a
+    cached question over the same chunks is also a hit.
+    """
+
+    def __init__(self, max_entries: int = ANSWER_CACHE_MAX_ENTRIES, ttl: float = ANSWER_CACHE_TTL,
+                 similarity_threshold: float = ANSWER_CACHE_SIMILARITY):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.similarity_threshold = similarity_threshold
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[str, Tuple[str, ...], str], _Entry]" = OrderedDict()
+        # (model, chunk ids) -> normalized questions cached for that context
+        self._groups: Dict[Tuple[str, Tuple[str, ...]], Set[str]] = {}
+
+    def get(self, model: str, question: str, chunk_ids: Iterable[str] = (),
+            embedding: Optional[List[float]] = None, version: Optional[int] = None) -> Optional[List[str]]:
+        """Return the cached answer chunks, or None on a miss."""
+        group = (model, tuple(sorted(set(chunk_ids))))
+        key = group + (normalize_question(question),)
+
+        entry = self._live_entry(key, version)
+        if entry is not None:
+            self.hits += 1
+            return entry.chunks
+
+        if self.similarity_threshold and embedding is not None:
+            best_key, best_score = None, self.similarity_threshold
+            for cached_question in list(self._groups.get(group, ())):
+                candidate_key = group + (cached_question,)
+                candidate = self._live_entry(candidate_key, version, touch=False)
+                if candidate is None or candidate.embedding is None:
+                    continue
+                score = cosine_similarity(embedding, candidate.embedding)
+                if score >= best_score:
+                    best_key, best_score = candidate_key, score
+            if best_key is not None:
+                self._entries.move_to_end(best_key)
+                self.hits += 1
+                self.semantic_hits += 1
+                return self._entries[best_key].chunks
+
+        self.misses += 1
+        return None
+
+    def put(self, model: str, question: str, chunks: List[str], chunk_ids: Iterable[str] = (),
+            embedding: Optional[List[float]] = None, version: Optional[int] = None):
+        group = (model, tuple(sorted(set(chunk_ids))))
+        normalized = normalize_question(question)
+        key = group + (normalized,)
+
+        self._entries[key] = _Entry(list(chunks), embedding, version, time.monotonic() + self.ttl)
+        self._entries.move_to_end(key)
+        self._groups.setdefault(group, set()).add(normalized)
+
+        while len(self._entries) > self.max_entries:
+            oldest, _ = self._entries.popitem(last=False)
+            self._forget(oldest)
+
+    def clear(self):
+        self._entries.clear()
+        self._groups.clear()
+
+    def _live_entry(self, key, version: Optional[int], touch: bool = True) -> Optional[_Entry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at < time.monotonic() or entry.version != version:
+            del self._entries[key]
+            self._forget(key)
+            return None
+        if touch:
+            self._entries.move_to_end(key)
+        return entry
+
+    def _forget(self, key):
+        group, question = key[:2], key[2]
+        questions = self._groups.get(group)
+        if questions is not None:
+            questions.discard(question)
+            if not questions:
+                del self._groups[group]
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
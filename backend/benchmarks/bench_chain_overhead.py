@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark of per-request QA chain construction overhead.
+
+Compares building a new load_qa_chain(..., chain_type="stuff") for every
+request with fetching the compiled chain from ChainRegistry. Uses a fake
+LLM, so no Ollama server is needed.
+
+    python backend/benchmarks/bench_chain_overhead.py --iterations 2000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain.chains.question_answering import load_qa_chain
+from langchain_core.language_models.fake import FakeListLLM
+
+from bench_utils import print_summary, summarize, write_results
+from chain_registry import ChainRegistry
+
+
+def time_calls(fn, iterations: int) -> list:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="QA chain construction overhead benchmark")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--output", default=None, help="Optional JSON results path")
+    args = parser.parse_args()
+
+    llm = FakeListLLM(responses=["ok"])
+    registry = ChainRegistry()
+    registry.get(llm, "fake")  # Compile once, as the first request would
+
+    print("=== QA Chain Overhead Benchmark ===")
+    before = time_calls(lambda: load_qa_chain(llm, chain_type="stuff"), args.iterations)
+    after = time_calls(lambda: registry.get(llm, "fake"), args.iterations)
+    print_summary("load_qa_chain per request", before)
+    print_summary("ChainRegistry.get", after)
+
+    mean_before = sum(before) / len(before)
+    mean_after = sum(after) / len(after)
+    print(f"Mean overhead: {mean_before * 1e6:.1f}us -> {mean_after * 1e6:.2f}us per request")
+
+    if args.output:
+        write_results(args.output, {
+            "benchmark": "chain_overhead",
+            "iterations": args.iterations,
+            "load_qa_chain": summarize(before),
+            "registry": summarize(after),
+        })
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Concurrency benchmark for the async database layer.
+
+Measures history-read latency (GET /conversations/{thread_id}) on its own and
+again while many /llm_call streams are running. With the async session the
+p99 under load should stay close to the idle p99.
+
+Run this after starting the FastAPI server:
+    python backend/benchmarks/bench_concurrency.py --streams 32 --reads 500
+"""
+
+import argparse
+import sys
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_utils import print_summary, summarize, write_results
+
+
+def create_thread_with_history(base_url: str, messages: int) -> str:
+    """Create a thread and fill it with messages to read back."""
+    response = requests.post(f"{base_url}/threads")
+    response.raise_for_status()
+    thread_id = response.json()["thread_id"]
+
+    for i in range(messages):
+        requests.post(
+            f"{base_url}/conversations/{thread_id}/",
+            json={
+                "question": f"Benchmark question {i}",
+                "answer": f"Benchmark answer {i} " * 20,
+                "model": "benchmark",
+            },
+        ).raise_for_status()
+    return thread_id
+
+
+def read_history(base_url: str, thread_id: str, reads: int, workers: int) -> list:
+    """Issue history reads and return per-request latencies in seconds."""
+    session = requests.Session()
+
+    def one_read(_):
+        start = time.perf_counter()
+        response = session.get(f"{base_url}/conversations/{thread_id}")
+        response.raise_for_status()
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(one_read, range(reads)))
+
+
+def run_stream(base_url: str, model: str, stop: threading.Event, errors: list):
+    """Keep one /llm_call stream busy until stop is set."""
+    while not stop.is_set():
+        try:
+            with requests.post(
+                f"{base_url}/llm_call",
+                json={"question": "Write a long story about databases.", "model": model},
+                stream=True,
+                timeout=120,
+            ) as response:
+                for _ in response.iter_content(chunk_size=None):
+                    if stop.is_set():
+                        break
+        except requests.RequestException as e:
+            errors.append(str(e))
+            time.sleep(0.5)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Async DB concurrency benchmark")
+    parser.add_argument("--base-url", default="http://localhost:8001")
+    parser.add_argument("--model", default="qwen3:0.6b")
+    parser.add_argument("--streams", type=int, default=16, help="Concurrent /llm_call streams")
+    parser.add_argument("--reads", type=int, default=300, help="History reads per phase")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent history readers")
+    parser.add_argument("--messages", type=int, default=50, help="Messages in the benchmark thread")
+    parser.add_argument("--output", default=None, help="Optional JSON results path")
+    args = parser.parse_args()
+
+    print("=== Async DB Concurrency Benchmark ===")
+    thread_id = create_thread_with_history(args.base_url, args.messages)
+    print(f"Benchmark thread: {thread_id} ({args.messages} messages)")
+
+    idle = read_history(args.base_url, thread_id, args.reads, args.workers)
+    print_summary("history reads (idle)", idle)
+
+    stop = threading.Event()
+    errors = []
+    streamers = [
+        threading.Thread(target=run_stream, args=(args.base_url, args.model, stop, errors), daemon=True)
+        for _ in range(args.streams)
+    ]
+    for t in streamers:
+        t.start()
+    time.sleep(2)  # Let the streams reach steady state
+
+    loaded = read_history(args.base_url, thread_id, args.reads, args.workers)
+    stop.set()
+    for t in streamers:
+        t.join(timeout=5)
+
+    print_summary(f"history reads ({args.streams} streams)", loaded)
+    if errors:
+        print(f"Stream errors: {len(errors)} (first: {errors[0]})")
+
+    idle_p99 = summarize(idle)["p99_ms"]
+    loaded_p99 = summarize(loaded)["p99_ms"]
+    ratio = loaded_p99 / idle_p99 if idle_p99 else 0.0
+    print(f"p99 ratio loaded/idle: {ratio:.2f}x")
+
+    if args.output:
+        write_results(args.output, {
+            "benchmark": "concurrency",
+            "streams": args.streams,
+            "idle": summarize(idle),
+            "loaded": summarize(loaded),
+            "p99_ratio": round(ratio, 3),
+            "stream_errors": len(errors),
+        })
+
+
+if __name__ == "__main__":
+    main()
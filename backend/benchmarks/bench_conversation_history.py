@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Latency benchmark for GET /conversations/{thread_id} on a long thread.
+
+Seeds one thread with 5,000 edits (1,000 messages x 5 edits by default)
+straight into the database, then measures the full history read and paged
+reads (first and last page of --page-size messages). Run it before and after
+a change with --output to compare. The seeded thread is removed at the end.
+
+Run this after starting the FastAPI server (same DATABASE_URL):
+    python backend/benchmarks/bench_conversation_history.py --messages 1000 --edits 5
+"""
+
+import argparse
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import requests
+from sqlalchemy import delete, insert
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_utils import print_summary, summarize, write_results
+from database import get_db_session
+from models import Conversation, Thread, ThreadTitle
+
+
+def seed_thread(messages: int, edits: int) -> str:
+    """Create a thread with messages x edits conversation rows."""
+    thread_id = f"bench-history-{uuid.uuid4()}"
+    base = datetime.now() - timedelta(days=1)
+    rows = []
+    for m in range(messages):
+        message_id = str(uuid.uuid4())
+        for e in range(edits):
+            rows.append({
+                "thread_id": thread_id,
+                "message_id": message_id,
+                "edit_id": str(uuid.uuid4()),
+                "question": f"Benchmark question {m} edit {e}",
+                "answer": f"Benchmark answer {m} edit {e} " * 20,
+                # Edits of different messages interleave in time, as they do in real threads
+                "created_at": base + timedelta(seconds=m * 10 + e * 3),
+                "model": "benchmark",
+                "time_took": 1.0,
+            })
+
+    db = get_db_session()
+    try:
+        db.execute(insert(Thread), [{"thread_id": thread_id, "started_at": base}])
+        db.execute(insert(ThreadTitle), [{"thread_id": thread_id, "title": "History benchmark"}])
+        for start in range(0, len(rows), 5000):
+            db.execute(insert(Conversation), rows[start:start + 5000])
+        db.commit()
+    finally:
+        db.close()
+    return thread_id
+
+
+def remove_thread(thread_id: str):
+    db = get_db_session()
+    try:
+        db.execute(delete(Conversation).where(Conversation.thread_id == thread_id))
+        db.execute(delete(ThreadTitle).where(ThreadTitle.thread_id == thread_id))
+        db.execute(delete(Thread).where(Thread.thread_id == thread_id))
+        db.commit()
+    finally:
+        db.close()
+
+
+def timed_reads(session: requests.Session, url: str, params: dict, reads: int) -> list:
+    latencies = []
+    for _ in range(reads):
+        start = time.perf_counter()
+        response = session.get(url, params=params)
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Conversation history read benchmark")
+    parser.add_argument("--base-url", default="http://localhost:8001")
+    parser.add_argument("--messages", type=int, default=1000)
+    parser.add_argument("--edits", type=int, default=5, help="Edits per message")
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--reads", type=int, default=50)
+    parser.add_argument("--output", default=None, help="Optional JSON results path")
+    args = parser.parse_args()
+
+    print("=== Conversation History Benchmark ===")
+    thread_id = seed_thread(args.messages, args.edits)
+    url = f"{args.base_url}/conversations/{thread_id}"
+    session = requests.Session()
+    results = {"benchmark": "conversation_history", "messages": args.messages, "edits_per_message": args.edits}
+
+    try:
+        check = session.get(url).json()
+        print(f"Thread {thread_id}: {check['total_messages']} messages, {check['total_edits']} edits")
+
+        last_offset = max(0, args.messages - args.page_size)
+        cases = {
+            "full history": {},
+            f"first {args.page_size} messages": {"offset": 0, "limit": args.page_size},
+            f"last {args.page_size} messages": {"offset": last_offset, "limit": args.page_size},
+        }
+        for name, params in cases.items():
+            latencies = timed_reads(session, url, params, args.reads)
+            print_summary(name, latencies)
+            results[name] = summarize(latencies)
+    finally:
+        remove_thread(thread_id)
+
+    if args.output:
+        write_results(args.output, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Ingestion throughput benchmark for the batched embedding pipeline.
+
+Generates 10-, 100- and 1000-page PDFs and ingests each one into a fresh
+Chroma collection, reporting chunks/sec for the serial baseline
+(one batch, one worker) and for the configured batch size and concurrency.
+Requires a running Ollama server with the embedding model pulled.
+
+    python backend/benchmarks/bench_ingestion.py --batch-size 64 --concurrency 4
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_utils import make_pdf, write_results
+from rag import RAG
+
+
+def ingest_once(pdf_path: str, batch_size: int, concurrency: int) -> dict:
+    """Ingest pdf_path into an empty persist directory and time it."""
+    with tempfile.TemporaryDirectory() as workdir:
+        cwd = os.getcwd()
+        os.chdir(workdir)  # RAG persists relative to the working directory
+        try:
+            rag = RAG()
+            rag.embed_batch_size = batch_size
+            rag.embed_concurrency = concurrency
+            start = time.perf_counter()
+            stats = rag.ingest_pdf(pdf_path)
+            elapsed = time.perf_counter() - start
+        finally:
+            os.chdir(cwd)
+    return {
+        "chunks": stats["added"],
+        "seconds": round(elapsed, 3),
+        "chunks_per_sec": round(stats["added"] / elapsed, 2) if elapsed else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Embedding pipeline throughput benchmark")
+    parser.add_argument("--pages", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--skip-baseline", action="store_true", help="Only run the configured pipeline")
+    parser.add_argument("--output", default=None, help="Optional JSON results path")
+    args = parser.parse_args()
+
+    print("=== Ingestion Throughput Benchmark ===")
+    results = {"benchmark": "ingestion", "batch_size": args.batch_size, "concurrency": args.concurrency, "runs": []}
+
+    with tempfile.TemporaryDirectory() as pdf_dir:
+        for pages in args.pages:
+            pdf_path = os.path.join(pdf_dir, f"bench_{pages}.pdf")
+            make_pdf(pdf_path, pages)
+
+            run = {"pages": pages}
+            if not args.skip_baseline:
+                run["baseline"] = ingest_once(pdf_path, batch_size=1 << 30, concurrency=1)
+                print(f"{pages:>5} pages baseline: {run['baseline']['chunks']} chunks, "
+                      f"{run['baseline']['chunks_per_sec']:.1f} chunks/sec")
+            run["pipeline"] = ingest_once(pdf_path, args.batch_size, args.concurrency)
+            print(f"{pages:>5} pages pipeline: {run['pipeline']['chunks']} chunks, "
+                  f"{run['pipeline']['chunks_per_sec']:.1f} chunks/sec")
+            results["runs"].append(run)
+
+    if args.output:
+        write_results(args.output, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Peak memory benchmark for streaming PDF ingestion.
+
+Generates a 500-page PDF and ingests it twice, each time in a fresh
+process so the high-water marks are independent:
+
+- buffered: every page range is parsed before anything is embedded
+  (the whole document's chunks are held in memory at once)
+- streaming: chunks are embedded in windows while parsing is held back
+
+Reports peak RSS of the server process and of the largest parser worker.
+Requires a running Ollama server with the embedding model pulled.
+
+    python backend/benchmarks/bench_ingestion_memory.py --pages 500
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_utils import make_pdf, write_results
+
+
+def run_mode(mode: str, pdf_path: str, window_chunks: int) -> dict:
+    """Ingest pdf_path in this process and report its peak memory."""
+    from rag import RAG
+
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)  # RAG persists relative to the working directory
+        rag = RAG()
+        if mode == "buffered":
+            rag.ingest_window_chunks = 1 << 30
+            rag.ingest_worker.max_pending = 1 << 30
+        else:
+            rag.ingest_window_chunks = window_chunks
+
+        start = time.perf_counter()
+        stats = asyncio.run(rag.aingest_pdf(pdf_path))
+        elapsed = time.perf_counter() - start
+        # Reap the parser processes so their peak shows up in RUSAGE_CHILDREN
+        rag.ingest_worker.shutdown(wait=True)
+
+    # ru_maxrss is in kilobytes on Linux
+    return {
+        "mode": mode,
+        "chunks": stats["added"],
+        "seconds": round(elapsed, 3),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "peak_worker_rss_mb": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming ingestion peak memory benchmark")
+    parser.add_argument("--pages", type=int, default=500)
+    parser.add_argument("--window-chunks", type=int, default=512)
+    parser.add_argument("--mode", choices=["buffered", "streaming"], help=argparse.SUPPRESS)
+    parser.add_argument("--pdf", help=argparse.SUPPRESS)
+    parser.add_argument("--output", default=None, help="Optional JSON results path")
+    args = parser.parse_args()
+
+    if args.mode:
+        # Child run: print the measurement for the parent to collect
+        print(json.dumps(run_mode(args.mode, args.pdf, args.window_chunks)))
+        return
+
+    print("=== Ingestion Memory Benchmark ===")
+    results = {"benchmark": "ingestion_memory", "pages": args.pages, "window_chunks": args.window_chunks, "runs": []}
+
+    with tempfile.TemporaryDirectory() as pdf_dir:
+        pdf_path = os.path.join(pdf_dir, f"bench_{args.pages}.pdf")
+        make_pdf(pdf_path, args.pages)
+        print(f"PDF: {args.pages} pages, {os.path.getsize(pdf_path) / 1024 / 1024:.1f} MB")
+
+        for mode in ("buffered", "streaming"):
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--mode", mode, "--pdf", pdf_path,
+                 "--window-chunks", str(args.window_chunks)],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            run = json.loads(output.strip().splitlines()[-1])
+            print(f"{mode:>9}: {run['chunks']} chunks in {run['seconds']:.1f}s, "
+                  f"peak RSS {run['peak_rss_mb']:.1f} MB (largest worker {run['peak_worker_rss_mb']:.1f} MB)")
+            results["runs"].append(run)
+
+    if args.output:
+        write_results(args.output, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Load test of the backend against a local fake Ollama server.
+
+Starts fake_ollama.py (streams --tokens tokens at --rate tokens/second and
+serves embeddings) and the FastAPI app under uvicorn pointed at it through
+OLLAMA_HOST, each in its own process, the app in a temporary working
+directory so the vector store is a fresh one. It seeds a thread with
+--messages messages, ingests a --pdf-pages PDF, warms every endpoint up,
+then for --duration seconds runs --concurrency clients against each of
+these at the same time:
+
+  llm_call        POST /llm_call
+  rag             POST /rag/ (context-aware path over the ingested PDF)
+  thread_titles   GET /threads/titles
+  conversation    GET /conversations/{thread_id}
+
+Every question is distinct so answers don't come from the answer cache. For
+each endpoint it reports throughput, errors and p50/p95/p99 latency, and for
+the streaming ones time to first token and tokens/sec per stream (between
+the first and last content frames; answers sent as one frame have none).
+Save a run with --output and compare later runs against it with --baseline;
+the script exits non-zero if a p95 grows, or throughput drops, by more than
+--tolerance, or any request fails. The app needs the database in
+DATABASE_URL, as for the server itself.
+
+To load a server that is already running, start it with OLLAMA_HOST set to a
+fake_ollama.py instance and pass --base-url (the PDF is then ingested into
+that server's store).
+
+    python backend/benchmarks/bench_load.py --duration 30 --concurrency 8 --output load_baseline.json
+    python backend/benchmarks/bench_load.py --baseline load_baseline.json
+"""
+
+import argparse
+import itertools
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_utils import free_port, make_pdf, percentile, print_summary, summarize, write_results
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FAKE_OLLAMA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fake_ollama.py")
+
+ENDPOINTS = ["llm_call", "rag", "thread_titles", "conversation"]
+STREAMING = {"llm_call", "rag"}
+
+QUESTIONS = [
+    "What does the document describe about topic {i}?",
+    "Summarize the lines that mention identifier {i}.",
+    "Which page talks about benchmark text number {i}?",
+]
+
+
+def launch(command, url: str, workdir: str, name: str, timeout: float, env=None):
+    """Start command in workdir and wait until url answers; returns (process, response)."""
+    log = open(os.path.join(workdir, f"{name}.log"), "w")
+    process = subprocess.Popen(command, cwd=workdir, env=env, stdout=log, stderr=subprocess.STDOUT)
+
+    def log_tail() -> str:
+        log.flush()
+        with open(log.name) as f:
+            return "".join(f.readlines()[-20:])
+
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        if process.poll() is not None:
+            raise RuntimeError(f"{name} exited with code {process.returncode}:\n{log_tail()}")
+        try:
+            return process, requests.get(url, timeout=1)
+        except requests.ConnectionError:
+            time.sleep(0.05)
+    process.terminate()
+    raise RuntimeError(f"{name} didn't answer {url} within {timeout}s:\n{log_tail()}")
+
+
+def start_fake_ollama(args, workdir: str):
+    """Run fake_ollama.py in its own process; returns (process, url)."""
+    port = free_port()
+    url = f"http://127.0.0.1:{port}"
+    process, _ = launch(
+        [sys.executable, FAKE_OLLAMA, "--port", str(port), "--rate", str(args.rate), "--tokens", str(args.tokens),
+         "--ttft-ms", str(args.ttft_ms), "--embed-ms", str(args.embed_ms)],
+        url, workdir, "fake_ollama", args.timeout,
+    )
+    return process, url
+
+
+def start_server(ollama_url: str, workdir: str, timeout: float):
+    """Launch uvicorn in workdir against the fake Ollama server; returns (process, base_url)."""
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    server, response = launch(
+        [sys.executable, "-m", "uvicorn", "main:app", "--app-dir", BACKEND_DIR,
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        f"{base_url}/health", workdir, "server", timeout, env=dict(os.environ, OLLAMA_HOST=ollama_url),
+    )
+    if response.status_code != 200:
+        server.terminate()
+        raise RuntimeError(f"Server is unhealthy (check DATABASE_URL): {response.text}")
+    return server, base_url
+
+
+def seed(base_url: str, model: str, messages: int, pdf_path: str) -> str:
+    """Create a thread with history and ingest pdf_path; returns the thread id."""
+    response = requests.post(f"{base_url}/threads")
+    response.raise_for_status()
+    thread_id = response.json()["thread_id"]
+    for i in range(messages):
+        requests.post(
+            f"{base_url}/conversations/{thread_id}/",
+            json={"question": f"Load test question {i}", "answer": f"Load test answer {i} " * 20, "model": model},
+        ).raise_for_status()
+
+    with open(pdf_path, "rb") as f:
+        response = requests.post(f"{base_url}/documents", files={"pdf_file": (os.path.basename(pdf_path), f, "application/pdf")})
+    response.raise_for_status()
+    job = response.json()
+    while job["status"] not in ("completed", "failed"):
+        time.sleep(0.2)
+        job = requests.get(f"{base_url}/documents/{job['job_id']}").json()
+    if job["status"] == "failed":
+        raise RuntimeError(f"PDF ingestion failed: {job['error']}")
+    return thread_id
+
+
+def read_stream(response, start: float):
+    """Read a /llm_call or /rag/ stream; returns (ttft, last, words) and raises on an error frame."""
+    ttft = None
+    last = None
+    words = 0
+    buffered = b""
+    for block in response.iter_content(chunk_size=None):
+        buffered += block
+        *lines, buffered = buffered.split(b"\n")
+        for line in lines:
+            if not line.startswith(b"data: "):
+                continue
+            event = json.loads(line[6:])
+            if "error" in event:
+                raise RuntimeError(event["error"])
+            content = event.get("content")
+            if content:
+                last = time.perf_counter() - start
+                if ttft is None:
+                    ttft = last
+                words += len(content.split())
+    return ttft, last, words
+
+
+def request_once(session: requests.Session, base_url: str, endpoint: str, model: str, thread_id: str, i: int):
+    """
+    Issue one request; returns (latency, ttft, last content frame, words), the
+    last three None for plain requests.
+    """
+    question = QUESTIONS[i % len(QUESTIONS)].format(i=i)
+    start = time.perf_counter()
+    if endpoint in STREAMING:
+        if endpoint == "llm_call":
+            response = session.post(f"{base_url}/llm_call", json={"question": question, "model": model},
+                                    stream=True, timeout=300)
+        else:
+            response = session.post(f"{base_url}/rag/", data={"question": question, "model": model},
+                                    stream=True, timeout=300)
+        with response:
+            response.raise_for_status()
+            ttft, last, words = read_stream(response, start)
+        return time.perf_counter() - start, ttft, last, words
+    if endpoint == "thread_titles":
+        response = session.get(f"{base_url}/threads/titles", timeout=60)
+    else:
+        response = session.get(f"{base_url}/conversations/{thread_id}", timeout=60)
+    response.raise_for_status()
+    return time.perf_counter() - start, None, None, None
+
+
+def run_load(base_url: str, endpoints, model: str, thread_id: str, concurrency: int, duration: float):
+    """Run concurrency clients per endpoint until duration passes; returns (samples, errors, elapsed)."""
+    samples = {endpoint: [] for endpoint in endpoints}
+    errors = {endpoint: [] for endpoint in endpoints}
+    counter = itertools.count(1000)
+    deadline = time.perf_counter() + duration
+
+    def client(endpoint: str):
+        session = requests.Session()
+        while time.perf_counter() < deadline:
+            try:
+                samples[endpoint].append(request_once(session, base_url, endpoint, model, thread_id, next(counter)))
+            except Exception as e:
+                errors[endpoint].append(str(e))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency * len(endpoints)) as pool:
+        for future in [pool.submit(client, endpoint) for endpoint in endpoints for _ in range(concurrency)]:
+            future.result()
+    return samples, errors, time.perf_counter() - start
+
+
+def report(samples, errors, elapsed: float) -> dict:
+    """Print and return per-endpoint throughput, latency, TTFT and token rates."""
+    results = {}
+    for endpoint, rows in samples.items():
+        latencies = [latency for latency, _, _, _ in rows]
+        stats = {
+            "requests": len(rows),
+            "errors": len(errors[endpoint]),
+            "throughput_rps": round(len(rows) / elapsed, 2),
+            "latency": summarize(latencies),
+        }
+        print_summary(f"{endpoint} latency", latencies)
+        if endpoint in STREAMING:
+            ttfts = [ttft for _, ttft, _, _ in rows if ttft is not None]
+            rates = [(words - 1) / (last - ttft) for _, ttft, last, words in rows
+                     if ttft is not None and last > ttft and words > 1]
+            stats["ttft"] = summarize(ttfts)
+            stats["tokens_per_second_p50"] = round(percentile(rates, 50), 2)
+            stats["tokens_per_second_total"] = round(sum(words or 0 for _, _, _, words in rows) / elapsed, 2)
+            print_summary(f"{endpoint} time to first token", ttfts)
+        print(f"{endpoint:<32} {stats['throughput_rps']:>8.2f} req/s  errors={stats['errors']}"
+              + (f"  {stats['tokens_per_second_p50']:.1f} tokens/s per stream" if endpoint in STREAMING else ""))
+        if errors[endpoint]:
+            print(f"{'':<32} first error: {errors[endpoint][0]}")
+        results[endpoint] = stats
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Return descriptions of p95s above, or throughput below, the baseline by more than tolerance."""
+    regressions = []
+    for endpoint, previous in baseline.get("endpoints", {}).items():
+        current = results["endpoints"].get(endpoint)
+        if current is None:
+            continue
+        for metric in ("latency", "ttft"):
+            now, before = current.get(metric, {}).get("p95_ms"), previous.get(metric, {}).get("p95_ms")
+            if now is not None and before and now > before * (1 + tolerance):
+                regressions.append(f"{endpoint} {metric} p95: {now:.1f}ms vs baseline {before:.1f}ms")
+        if previous.get("throughput_rps") and current["throughput_rps"] < previous["throughput_rps"] * (1 - tolerance):
+            regressions.append(f"{endpoint} throughput: {current['throughput_rps']:.2f} req/s "
+                               f"vs baseline {previous['throughput_rps']:.2f} req/s")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backend load test against a fake Ollama server")
+    parser.add_argument("--base-url", default=None, help="Load a running server instead of launching one")
+    parser.add_argument("--model", default="qwen3:0.6b")
+    parser.add_argument("--endpoints", default=",".join(ENDPOINTS), help="Comma-separated endpoints to load")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent clients per endpoint")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of load")
+    parser.add_argument("--warmup", type=int, default=2, help="Requests per endpoint before measuring")
+    parser.add_argument("--rate", type=float, default=50.0, help="Fake model tokens/second per stream")
+    parser.add_argument("--tokens", type=int, default=64, help="Tokens per fake answer")
+    parser.add_argument("--ttft-ms", type=float, default=50.0, help="Fake model delay before the first token")
+    parser.add_argument("--embed-ms", type=float, default=5.0, help="Fake delay per embedding request")
+    parser.add_argument("--messages", type=int, default=50, help="Messages in the seeded thread")
+    parser.add_argument("--pdf-pages", type=int, default=20, help="Pages in the ingested PDF")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Seconds to wait for the server to start")
+    parser.add_argument("--baseline", default=None, help="JSON results of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed change against the baseline")
+    parser.add_argument("--output", default=None, help="Optional JSON results path")
+    args = parser.parse_args()
+
+    endpoints = [e.strip() for e in args.endpoints.split(",") if e.strip()]
+    unknown = set(endpoints) - set(ENDPOINTS)
+    if unknown:
+        parser.error(f"unknown endpoints: {', '.join(sorted(unknown))}")
+
+    workdir = tempfile.mkdtemp(prefix="asyst-load-")
+    fake = None
+    server = None
+    try:
+        base_url = args.base_url
+        if base_url is None:
+            fake, ollama_url = start_fake_ollama(args, workdir)
+            server, base_url = start_server(ollama_url, workdir, args.timeout)
+
+        print(f"=== Load Test ({args.concurrency} clients per endpoint for {args.duration:g}s against {base_url}) ===")
+        pdf_path = os.path.join(workdir, "load_test.pdf")
+        make_pdf(pdf_path, args.pdf_pages, label="LOAD")
+        thread_id = seed(base_url, args.model, args.messages, pdf_path)
+
+        session = requests.Session()
+        for endpoint in endpoints:
+            for i in range(args.warmup):
+                request_once(session, base_url, endpoint, args.model, thread_id, i)
+
+        samples, errors, elapsed = run_load(base_url, endpoints, args.model, thread_id, args.concurrency, args.duration)
+        results = {
+            "benchmark": "load",
+            "config": {
+                "concurrency": args.concurrency,
+                "duration": args.duration,
+                "model": args.model,
+                "fake_rate": args.rate,
+                "fake_tokens": args.tokens,
+                "fake_ttft_ms": args.ttft_ms,
+                "fake_embed_ms": args.embed_ms,
+                "messages": args.messages,
+                "pdf_pages": args.pdf_pages,
+            },
+            "elapsed_seconds": round(elapsed, 2),
+            "endpoints": report(samples, errors, elapsed),
+        }
+        if fake is not None:
+            results["fake_ollama"] = requests.get(f"{ollama_url}/_stats").json()
+    finally:
+        for process in (server, fake):
+            if process is not None:
+                process.terminate()
+                process.wait()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    failures = [f"{endpoint}: {stats['errors']} failed requests"
+                for endpoint, stats in results["endpoints"].items() if stats["errors"]]
+    if args.baseline:
+        with open(args.baseline) as f:
+            failures.extend(compare(results, json.load(f), args.tolerance))
+
+    if args.output:
+        write_results(args.output, results)
+
+    if failures:
+        print("Load test regressions:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    print("Load test within baseline")
+
+
+if __name__ == "__main__":
+    main()
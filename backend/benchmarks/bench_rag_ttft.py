@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Time-to-first-token benchmark for /rag/ under concurrent load.
+
+Sends batches of concurrent RAG questions and reports the latency until the
+first "data:" frame arrives and until the stream completes. Ingest at least
+one PDF first (e.g. via POST /documents) so the context-aware path is used.
+
+    python backend/benchmarks/bench_rag_ttft.py --concurrency 1 8 32
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_utils import print_summary, summarize, write_results
+
+QUESTIONS = [
+    "What is the main topic of the document?",
+    "Summarize the key points on page three.",
+    "Which identifiers are mentioned most often?",
+    "What does the document say about benchmarks?",
+]
+
+
+def rag_request(base_url: str, model: str, question: str):
+    """Return (ttft, total) in seconds for one streamed /rag/ call."""
+    start = time.perf_counter()
+    ttft = None
+    with requests.post(
+        f"{base_url}/rag/",
+        data={"question": question, "model": model},
+        stream=True,
+        timeout=300,
+    ) as response:
+        response.raise_for_status()
+        for line in response.iter_lines():
+            if ttft is None and line.startswith(b"data: "):
+                ttft = time.perf_counter() - start
+    total = time.perf_counter() - start
+    return (ttft if ttft is not None else total), total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RAG time-to-first-token benchmark")
+    parser.add_argument("--base-url", default="http://localhost:8001")
+    parser.add_argument("--model", default="qwen3:0.6b")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=64, help="Requests per concurrency level")
+    parser.add_argument("--output", default=None, help="Optional JSON results path")
+    args = parser.parse_args()
+
+    print("=== RAG Time-To-First-Token Benchmark ===")
+    results = {"benchmark": "rag_ttft", "model": args.model, "levels": []}
+
+    for level in args.concurrency:
+        with ThreadPoolExecutor(max_workers=level) as pool:
+            samples = list(pool.map(
+                lambda i: rag_request(args.base_url, args.model, QUESTIONS[i % len(QUESTIONS)]),
+                range(args.requests),
+            ))
+        ttfts = [ttft for ttft, _ in samples]
+        totals = [total for _, total in samples]
+        print_summary(f"ttft   (concurrency {level})", ttfts)
+        print_summary(f"total  (concurrency {level})", totals)
+        results["levels"].append({"concurrency": level, "ttft": summarize(ttfts), "total": summarize(totals)})
+
+    if args.output:
+        write_results(args.output, results)
+
+
+if __name__ == "__main__":
+    main()
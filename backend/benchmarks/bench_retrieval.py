@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Recall and latency benchmark for hybrid BM25 + vector retrieval.
+
+Ingests a generated PDF into a scratch persist directory, then asks
+identifier queries ("ID-00042-017"), natural-language queries and short
+natural questions with numbers in them ("What's on page 43 line 7?") whose
+answer page is known. Reports recall@k and retrieval latency for the pure
+vector retriever, the hybrid retriever and hybrid with the lexical fast path,
+and how many queries of each kind the fast path takes (only identifier
+queries should).
+With --documents N, N-1 unrelated PDFs are ingested as well and a scoped
+mode searches only the target document, showing how much of the search cost
+comes from the rest of the corpus.
+Requires a running Ollama server with the embedding model pulled.
+
+    python backend/benchmarks/bench_retrieval.py --pages 200 --queries 100 --documents 10
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_utils import make_pdf, print_summary, summarize, write_results
+from rag import RAG
+from bm25_index import is_keyword_query
+
+MODES = {
+    "vector": {"hybrid_retrieval": False, "lexical_fast_path": False},
+    "hybrid": {"hybrid_retrieval": True, "lexical_fast_path": False},
+    "hybrid+fast_path": {"hybrid_retrieval": True, "lexical_fast_path": True},
+    "hybrid+scoped": {"hybrid_retrieval": True, "lexical_fast_path": False},
+}
+
+
+def build_queries(pages: int, count: int, lines_per_page: int = 40):
+    """Return (query, expected page index, kind) tuples matching make_pdf's text."""
+    rng = random.Random(42)
+    queries = []
+    for i in range(count):
+        page = rng.randrange(pages)
+        line = rng.randrange(lines_per_page)
+        if i % 3 == 0:
+            queries.append((f"ID-{page:05d}-{line:03d}", page, "keyword"))
+        elif i % 3 == 1:
+            queries.append((f"What is on page {page + 1} line {line + 1} of the benchmark text?", page, "natural"))
+        else:
+            queries.append((f"What's on page {page + 1} line {line + 1}?", page, "short"))
+    return queries
+
+
+async def run_mode(rag: RAG, queries, k: int, scope=None):
+    latencies = {"keyword": [], "natural": [], "short": []}
+    hits = {"keyword": 0, "natural": 0, "short": 0}
+    for question, page, kind in queries:
+        start = time.perf_counter()
+        docs = await rag.aretrieve(question, scope)
+        latencies[kind].append(time.perf_counter() - start)
+        if any(doc.metadata.get("page") == page for doc in docs[:k]):
+            hits[kind] += 1
+    return latencies, hits
+
+
+async def main_async(args):
+    print("=== Hybrid Retrieval Benchmark ===")
+    results = {"benchmark": "retrieval", "pages": args.pages, "documents": args.documents, "k": args.k, "modes": {}}
+
+    with tempfile.TemporaryDirectory() as workdir:
+        cwd = os.getcwd()
+        os.chdir(workdir)  # RAG persists relative to the working directory
+        try:
+            pdf_path = os.path.join(workdir, "retrieval.pdf")
+            make_pdf(pdf_path, args.pages)
+            rag = RAG()
+            rag.retrieval_k = args.k
+            await rag.aingest_pdf(pdf_path)
+            for i in range(1, args.documents):
+                distractor_path = os.path.join(workdir, f"distractor_{i}.pdf")
+                make_pdf(distractor_path, args.pages, label=f"DOC{i}")
+                await rag.aingest_pdf(distractor_path)
+            target_scope = rag.resolve_scope(["retrieval.pdf"])
+
+            queries = build_queries(args.pages, args.queries)
+            for name, settings in MODES.items():
+                for attr, value in settings.items():
+                    setattr(rag, attr, value)
+                rag.embedding_cache.hits = rag.embedding_cache.misses = 0
+                scope = target_scope if name == "hybrid+scoped" else None
+                latencies, hits = await run_mode(rag, queries, args.k, scope)
+
+                mode_results = {}
+                for kind in ("keyword", "natural", "short"):
+                    total = len(latencies[kind])
+                    recall = hits[kind] / total if total else 0.0
+                    print_summary(f"{name:<17} {kind:<8} recall={recall:.2f}", latencies[kind])
+                    mode_results[kind] = {"recall_at_k": round(recall, 4), "latency": summarize(latencies[kind])}
+                results["modes"][name] = mode_results
+
+            # Natural questions, however short, must not skip vector search
+            results["fast_path_share"] = {}
+            for kind in ("keyword", "natural", "short"):
+                kind_queries = [question for question, _, query_kind in queries if query_kind == kind]
+                share = sum(map(is_keyword_query, kind_queries)) / len(kind_queries) if kind_queries else 0.0
+                print(f"fast path taken by {share:.0%} of {kind} queries")
+                results["fast_path_share"][kind] = round(share, 4)
+            rag.ingest_worker.shutdown()
+        finally:
+            os.chdir(cwd)
+
+    if args.output:
+        write_results(args.output, results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hybrid retrieval recall/latency benchmark")
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--k", type=int, default=4)
+    parser.add_argument("--documents", type=int, default=1, help="Documents in the corpus (the target plus distractors)")
+    parser.add_argument("--output", default=None, help="Optional JSON results path")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Benchmark of JSON serialization CPU cost on the streaming and history paths.
+
+Streams N fake tokens through a StreamingResponse into a no-op ASGI send,
+the way /llm_call and /rag/ do, and reports tokens per second of CPU time
+(one core) for:
+
+  legacy   f"data: {json.dumps({...})}\\n\\n" strings, as before
+  json     pre-encoded SSEFrame templates on the standard library encoder
+  orjson   pre-encoded SSEFrame templates on orjson (if installed)
+
+It also times rendering a large conversation history payload with FastAPI's
+default path (jsonable_encoder + JSONResponse) against FastJSONResponse.
+No server, database or Ollama is needed.
+
+    python backend/benchmarks/bench_serialization.py --tokens 200000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+
+import serialization
+from bench_utils import write_results
+
+TOKENS = [" the", " model", " answers", ",", " café", " résumé", "\n", " \"quoted\"", " 42", "."]
+
+
+def legacy_frames(tokens: int):
+    async def generate():
+        for i in range(tokens):
+            yield f"data: {json.dumps({'content': TOKENS[i % len(TOKENS)], 'context_used': True})}\n\n"
+    return generate()
+
+
+def template_frames(tokens: int, backend: str):
+    dumps = serialization.get_serializer(backend)
+    # Mirrors SSEFrame, bound to an explicit backend
+    prefix = b'data: {"content":'
+    suffix = b"," + dumps({"context_used": True})[1:] + b"\n\n"
+
+    async def generate():
+        for i in range(tokens):
+            yield prefix + dumps(TOKENS[i % len(TOKENS)]) + suffix
+    return generate()
+
+
+async def drive(response) -> int:
+    """Run a response against a no-op ASGI send; returns body bytes sent."""
+    sent = 0
+
+    async def receive():
+        await asyncio.sleep(3600)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal sent
+        sent += len(message.get("body", b""))
+
+    await response({"type": "http", "method": "POST", "path": "/"}, receive, send)
+    return sent
+
+
+def time_stream(make_frames, tokens: int):
+    response = StreamingResponse(make_frames(tokens), media_type="text/plain")
+    start = time.process_time()
+    sent = asyncio.run(drive(response))
+    elapsed = time.process_time() - start
+    return {"tokens_per_cpu_second": round(tokens / elapsed), "cpu_seconds": round(elapsed, 3), "bytes": sent}
+
+
+def history_payload(edits: int):
+    return {
+        "thread_id": "bench-thread",
+        "title": "Benchmark thread",
+        "started_at": "2026-01-01T00:00:00",
+        "messages": [
+            {"message_id": f"message-{i}", "edits": [{
+                "edit_id": f"edit-{i}",
+                "question": "What does the benchmark measure? " * 4,
+                "answer": "It measures serialization cost per response. " * 20,
+                "created_at": "2026-01-01T00:00:00",
+                "model": "qwen3:0.6b",
+                "time_took": 1.25,
+            }]}
+            for i in range(edits)
+        ],
+        "total_messages": edits,
+        "total_edits": edits,
+    }
+
+
+def time_render(render, iterations: int) -> float:
+    start = time.process_time()
+    for _ in range(iterations):
+        render()
+    return (time.process_time() - start) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON serialization benchmark")
+    parser.add_argument("--tokens", type=int, default=200000, help="Tokens streamed per variant")
+    parser.add_argument("--history-edits", type=int, default=2000, help="Edits in the history payload")
+    parser.add_argument("--iterations", type=int, default=20, help="History renders per variant")
+    parser.add_argument("--output", default=None, help="Optional JSON results path")
+    args = parser.parse_args()
+
+    backends = ["json"] + (["orjson"] if serialization.orjson is not None else [])
+    print("=== Serialization Benchmark ===")
+    if serialization.orjson is None:
+        print("orjson is not installed; only the json backend is measured")
+
+    streams = {"legacy": time_stream(legacy_frames, args.tokens)}
+    for backend in backends:
+        streams[backend] = time_stream(lambda tokens, b=backend: template_frames(tokens, b), args.tokens)
+    for name, stats in streams.items():
+        print(f"stream {name:<10} {stats['tokens_per_cpu_second']:>10,} tokens/s per core  {stats['bytes']:>10,} bytes")
+
+    payload = history_payload(args.history_edits)
+    renders = {"jsonable_encoder+JSONResponse": time_render(lambda: JSONResponse(jsonable_encoder(payload)), args.iterations)}
+    for backend in backends:
+        dumps = serialization.get_serializer(backend)
+        renders[backend] = time_render(lambda d=dumps: d(payload), args.iterations)
+    for name, seconds in renders.items():
+        print(f"history {name:<30} {seconds * 1000:>8.2f}ms CPU per response")
+
+    if args.output:
+        write_results(args.output, {
+            "benchmark": "serialization",
+            "tokens": args.tokens,
+            "history_edits": args.history_edits,
+            "stream": streams,
+            "history_render_ms": {name: round(seconds * 1000, 3) for name, seconds in renders.items()},
+        })
+
+
+if __name__ == "__main__":
+    main()
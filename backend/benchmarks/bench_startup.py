@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Startup-time benchmark and regression check for the backend.
+
+Measures, each in fresh interpreters:
+
+  - import time of each backend module (median of --repeat runs, including
+    the modules it pulls in)
+  - which heavy packages (LangChain, Chroma, Ollama, pypdf) `import main`
+    loads; none should be, they load on first RAG use
+  - time from launching uvicorn to the first /health response (any status)
+
+Save a run with --output and compare later runs against it with --baseline;
+the script exits non-zero if any measurement is more than --tolerance slower
+than the baseline or first /health exceeds --budget-ms, so startup
+regressions show up in CI. /health needs the database configured in
+DATABASE_URL, as for the server itself.
+
+    python backend/benchmarks/bench_startup.py --output startup_baseline.json
+    python backend/benchmarks/bench_startup.py --baseline startup_baseline.json
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_utils import free_port, write_results
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = [
+    "models",
+    "database",
+    "serialization",
+    "stream_coalescer",
+    "model_pool",
+    "chain_registry",
+    "ingest_worker",
+    "bm25_index",
+    "context_packer",
+    "rag",
+    "main",
+]
+
+HEAVY_PACKAGES = ["langchain", "langchain_core", "langchain_community", "langchain_ollama", "langchain_chroma",
+                  "chromadb", "pypdf"]
+
+IMPORT_SCRIPT = """
+import sys, time, json
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "heavy": [name for name in {heavy!r} if name in sys.modules]}}))
+"""
+
+
+def measure_import(module: str, repeat: int):
+    """Median import time of module in fresh interpreters, and the heavy packages it loaded."""
+    samples = []
+    heavy = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", IMPORT_SCRIPT.format(module=module, heavy=HEAVY_PACKAGES)],
+            cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        samples.append(result["seconds"])
+        heavy = result["heavy"]
+    return statistics.median(samples), heavy
+
+
+def measure_first_health(timeout: float) -> float:
+    """Seconds from launching uvicorn to the first /health response."""
+    port = free_port()
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            if server.poll() is not None:
+                raise RuntimeError(f"Server exited with code {server.returncode} before answering /health")
+            try:
+                urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1).read()
+                return time.perf_counter() - start
+            except urllib.error.HTTPError:
+                # 503 (database down) still means the app is serving
+                return time.perf_counter() - start
+            except (urllib.error.URLError, ConnectionError, socket.timeout):
+                time.sleep(0.01)
+        raise RuntimeError(f"No /health response within {timeout}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Return descriptions of measurements slower than baseline * (1 + tolerance)."""
+    regressions = []
+    pairs = [(f"import {module}", results["import_ms"].get(module), ms) for module, ms in baseline.get("import_ms", {}).items()]
+    pairs.append(("first /health", results.get("first_health_ms"), baseline.get("first_health_ms")))
+    for name, current, previous in pairs:
+        if current is not None and previous and current > previous * (1 + tolerance):
+            regressions.append(f"{name}: {current:.1f}ms vs baseline {previous:.1f}ms")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backend startup-time benchmark")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per module")
+    parser.add_argument("--modules", default=",".join(MODULES), help="Comma-separated modules to time")
+    parser.add_argument("--skip-server", action="store_true", help="Don't measure time to first /health")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Seconds to wait for /health")
+    parser.add_argument("--budget-ms", type=float, default=None, help="Fail if first /health takes longer")
+    parser.add_argument("--baseline", default=None, help="JSON results of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown against the baseline")
+    parser.add_argument("--output", default=None, help="Optional JSON results path")
+    args = parser.parse_args()
+
+    print("=== Startup Benchmark ===")
+    results = {"benchmark": "startup", "import_ms": {}, "heavy_on_import": {}}
+    for module in [m.strip() for m in args.modules.split(",") if m.strip()]:
+        seconds, heavy = measure_import(module, args.repeat)
+        results["import_ms"][module] = round(seconds * 1000, 1)
+        results["heavy_on_import"][module] = heavy
+        print(f"import {module:<18} {seconds * 1000:>8.1f}ms  heavy: {', '.join(heavy) or '-'}")
+
+    if not args.skip_server:
+        first_health = measure_first_health(args.timeout)
+        results["first_health_ms"] = round(first_health * 1000, 1)
+        print(f"first /health response   {first_health * 1000:>8.1f}ms")
+
+    failures = []
+    if results["heavy_on_import"].get("main"):
+        failures.append(f"import main loads {', '.join(results['heavy_on_import']['main'])}")
+    if args.budget_ms is not None and results.get("first_health_ms", 0) > args.budget_ms:
+        failures.append(f"first /health: {results['first_health_ms']:.1f}ms over budget {args.budget_ms:.1f}ms")
+    if args.baseline:
+        with open(args.baseline) as f:
+            failures.extend(compare(results, json.load(f), args.tolerance))
+
+    if args.output:
+        write_results(args.output, results)
+
+    if failures:
+        print("Startup regressions:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    print("Startup within budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Benchmark of token coalescing on the /llm_call and /rag/ stream path.
+
+A fake model emits single tokens at a fixed rate. They are framed the way
+main.py frames them and sent through a StreamingResponse into a counting
+ASGI send, once per flush setting. For each setting it reports frames
+written (one transport write each), bytes on the wire, time to first byte,
+total time, and the CPU a client spends parsing the frames
+(split + JSON.parse per data line, as apiService.processLLMStream does).
+
+    python backend/benchmarks/bench_stream_coalescing.py --tokens 2000 --rate 500
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import StreamingResponse
+
+from bench_utils import write_results
+from serialization import SSEFrame
+from stream_coalescer import coalesce
+
+WORDS = [" the", " answer", " is", " found", " in", " section", " 4", ".", "\n", " It", " explains", " why"]
+FRAME = SSEFrame("content")
+
+
+async def fake_model(tokens: int, rate: float):
+    """Yield single tokens at rate tokens/second."""
+    interval = 1.0 / rate
+    start = time.perf_counter()
+    for i in range(tokens):
+        delay = start + i * interval - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        yield WORDS[i % len(WORDS)]
+
+
+async def run_stream(tokens: int, rate: float, max_bytes: int, max_delay_ms: float):
+    async def generate():
+        async for chunk in coalesce(fake_model(tokens, rate), max_bytes=max_bytes, max_delay_ms=max_delay_ms):
+            yield FRAME(chunk)
+
+    bodies = []
+    first_byte = None
+    start = time.perf_counter()
+
+    async def receive():
+        await asyncio.sleep(3600)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal first_byte
+        body = message.get("body", b"")
+        if body:
+            if first_byte is None:
+                first_byte = time.perf_counter() - start
+            bodies.append(body)
+
+    response = StreamingResponse(generate(), media_type="text/plain")
+    await response({"type": "http", "method": "POST", "path": "/"}, receive, send)
+    return bodies, first_byte, time.perf_counter() - start
+
+
+def client_parse(bodies) -> float:
+    """CPU seconds to parse the frames the way the frontend does."""
+    start = time.process_time()
+    text = ""
+    buffered = ""
+    for body in bodies:
+        buffered += body.decode("utf-8")
+        lines = buffered.split("\n")
+        buffered = lines.pop()
+        for line in lines:
+            if line.startswith("data: "):
+                text += json.loads(line[6:]).get("content", "")
+    return time.process_time() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream token coalescing benchmark")
+    parser.add_argument("--tokens", type=int, default=2000, help="Tokens per response")
+    parser.add_argument("--rate", type=float, default=500, help="Fake model tokens/second")
+    parser.add_argument("--flush-bytes", type=int, default=64)
+    parser.add_argument("--flush-ms", type=float, default=20)
+    parser.add_argument("--output", default=None, help="Optional JSON results path")
+    args = parser.parse_args()
+
+    settings = {
+        "per_token": (0, 0),
+        f"{args.flush_bytes}B/{args.flush_ms:g}ms": (args.flush_bytes, args.flush_ms),
+    }
+    print(f"=== Stream Coalescing Benchmark ({args.tokens} tokens at {args.rate:g} tokens/s) ===")
+    asyncio.run(run_stream(10, 10000, 0, 0))  # Warm-up so the first setting doesn't pay import costs
+    results = {}
+    for name, (max_bytes, max_delay_ms) in settings.items():
+        bodies, first_byte, total = asyncio.run(run_stream(args.tokens, args.rate, max_bytes, max_delay_ms))
+        results[name] = {
+            "frames": len(bodies),
+            "bytes": sum(len(body) for body in bodies),
+            "first_byte_ms": round(first_byte * 1000, 2),
+            "total_ms": round(total * 1000, 2),
+            "client_parse_ms": round(client_parse(bodies) * 1000, 2),
+        }
+        stats = results[name]
+        print(
+            f"{name:<14} frames={stats['frames']:<6} bytes={stats['bytes']:<8} first_byte={stats['first_byte_ms']:>7.2f}ms "
+            f"total={stats['total_ms']:>8.2f}ms client_parse={stats['client_parse_ms']:>6.2f}ms"
+        )
+
+    if args.output:
+        write_results(args.output, {
+            "benchmark": "stream_coalescing",
+            "tokens": args.tokens,
+            "rate": args.rate,
+            "results": results,
+        })
+
+
+if __name__ == "__main__":
+    main()
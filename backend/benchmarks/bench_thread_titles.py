@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Load test for the paginated /threads/titles listing.
+
+Seeds the database with synthetic threads in steps (1k, 10k, 50k by default)
+and, at each size, measures:
+
+- first page latency
+- per-page latency while walking every page with the cursor
+- If-None-Match revalidation (304) latency of the first page
+
+With keyset pagination all three should stay flat as the thread count grows.
+Seeded threads are removed at the end.
+
+Run this after starting the FastAPI server (same DATABASE_URL):
+    python backend/benchmarks/bench_thread_titles.py --counts 1000 10000 50000
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import requests
+from sqlalchemy import delete, insert
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_utils import print_summary, summarize, write_results
+from database import get_db_session
+from models import Thread, ThreadTitle
+
+THREAD_PREFIX = "bench-titles-"
+
+
+def seed_threads(start: int, end: int, batch_size: int = 5000):
+    """Insert threads start..end-1 with titles, spaced a second apart in the past."""
+    base = datetime.now() - timedelta(days=365)
+    db = get_db_session()
+    try:
+        for batch_start in range(start, end, batch_size):
+            ids = [f"{THREAD_PREFIX}{i:07d}" for i in range(batch_start, min(batch_start + batch_size, end))]
+            db.execute(insert(Thread), [
+                {"thread_id": thread_id, "started_at": base + timedelta(seconds=int(thread_id[len(THREAD_PREFIX):]))}
+                for thread_id in ids
+            ])
+            db.execute(insert(ThreadTitle), [{"thread_id": thread_id, "title": f"Benchmark thread {thread_id}"} for thread_id in ids])
+            db.commit()
+    finally:
+        db.close()
+
+
+def remove_threads():
+    db = get_db_session()
+    try:
+        db.execute(delete(ThreadTitle).where(ThreadTitle.thread_id.like(f"{THREAD_PREFIX}%")))
+        db.execute(delete(Thread).where(Thread.thread_id.like(f"{THREAD_PREFIX}%")))
+        db.commit()
+    finally:
+        db.close()
+
+
+def measure(session: requests.Session, base_url: str, limit: int, first_page_reads: int) -> dict:
+    url = f"{base_url}/threads/titles"
+
+    first_page = []
+    for _ in range(first_page_reads):
+        start = time.perf_counter()
+        response = session.get(url, params={"limit": limit})
+        response.raise_for_status()
+        first_page.append(time.perf_counter() - start)
+    etag = response.headers.get("ETag")
+
+    revalidate = []
+    for _ in range(first_page_reads):
+        start = time.perf_counter()
+        response = session.get(url, params={"limit": limit}, headers={"If-None-Match": etag})
+        revalidate.append(time.perf_counter() - start)
+        if response.status_code != 304:
+            raise RuntimeError(f"Expected 304 for a matching ETag, got {response.status_code}")
+
+    walk = []
+    threads = 0
+    cursor = None
+    while True:
+        params = {"limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        start = time.perf_counter()
+        response = session.get(url, params=params)
+        response.raise_for_status()
+        walk.append(time.perf_counter() - start)
+        threads += len(response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    return {"first_page": first_page, "revalidate": revalidate, "walk": walk, "threads": threads}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="/threads/titles pagination load test")
+    parser.add_argument("--base-url", default="http://localhost:8001")
+    parser.add_argument("--counts", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--reads", type=int, default=200, help="First page and 304 requests per size")
+    parser.add_argument("--output", default=None, help="Optional JSON results path")
+    args = parser.parse_args()
+
+    print("=== Thread Titles Pagination Load Test ===")
+    results = {"benchmark": "thread_titles", "limit": args.limit, "runs": []}
+    session = requests.Session()
+
+    seeded = 0
+    try:
+        for count in sorted(args.counts):
+            seed_threads(seeded, count)
+            seeded = count
+
+            samples = measure(session, args.base_url, args.limit, args.reads)
+            print(f"--- {samples['threads']} threads ({len(samples['walk'])} pages) ---")
+            print_summary("first page", samples["first_page"])
+            print_summary("If-None-Match (304)", samples["revalidate"])
+            print_summary("page walk", samples["walk"])
+            results["runs"].append({
+                "threads": samples["threads"],
+                "pages": len(samples["walk"]),
+                "first_page": summarize(samples["first_page"]),
+                "revalidate": summarize(samples["revalidate"]),
+                "walk": summarize(samples["walk"]),
+            })
+    finally:
+        remove_threads()
+
+    if args.output:
+        write_results(args.output, results)
+
+
+if __name__ == "__main__":
+    main()
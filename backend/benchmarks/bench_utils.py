@@ -0,0 +1,100 @@
+"""
+Shared helpers for the benchmark scripts in this directory.
+"""
+
+import json
+import math
+import socket
+import time
+from typing import Dict, List
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Return the pct-th percentile (0-100) of samples using nearest-rank."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100.0 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Summarize latency samples (in seconds) as milliseconds."""
+    return {
+        "count": len(samples),
+        "p50_ms": round(percentile(samples, 50) * 1000, 2),
+        "p95_ms": round(percentile(samples, 95) * 1000, 2),
+        "p99_ms": round(percentile(samples, 99) * 1000, 2),
+        "max_ms": round(max(samples) * 1000, 2) if samples else 0.0,
+    }
+
+
+def print_summary(name: str, samples: List[float]):
+    """Print a one-line latency summary."""
+    stats = summarize(samples)
+    print(
+        f"{name:<32} n={stats['count']:<6} p50={stats['p50_ms']:>8.2f}ms "
+        f"p95={stats['p95_ms']:>8.2f}ms p99={stats['p99_ms']:>8.2f}ms max={stats['max_ms']:>8.2f}ms"
+    )
+
+
+def write_results(path: str, results: Dict):
+    """Write benchmark results as JSON so runs can be compared later."""
+    results = dict(results)
+    results.setdefault("timestamp", time.strftime("%Y-%m-%dT%H:%M:%S"))
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {path}")
+
+
+def free_port() -> int:
+    """Return a TCP port on 127.0.0.1 that is free right now."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def make_pdf(path: str, pages: int, lines_per_page: int = 40, label: str = "ID"):
+    """
+    Write a simple text PDF with the given number of pages.
+    Every page has distinct text so chunks don't dedupe away; PDFs with
+    different labels share no chunks.
+    """
+    def escape(text: str) -> str:
+        return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # Pages object, filled in once the page ids are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_ids = []
+    for page in range(pages):
+        lines = [
+            f"Page {page + 1} line {line + 1}: benchmark text about topic {(page * 31 + line) % 997} "
+            f"with identifier {label}-{page:05d}-{line:03d}."
+            for line in range(lines_per_page)
+        ]
+        stream = "BT /F1 9 Tf 11 TL 40 780 Td " + " ".join(f"({escape(l)}) '" for l in lines) + " ET"
+        stream_bytes = stream.encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream_bytes) + stream_bytes + b"\nendstream")
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        page_ids.append(len(objects))
+    kids = b" ".join(b"%d 0 R" % i for i in page_ids)
+    objects[1] = b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % pages
+
+    with open(path, "wb") as f:
+        f.write(b"%PDF-1.4\n")
+        offsets = []
+        for number, body in enumerate(objects, 1):
+            offsets.append(f.tell())
+            f.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+        xref_offset = f.tell()
+        f.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+        for offset in offsets:
+            f.write(b"%010d 00000 n \n" % offset)
+        f.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset))
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Local fake Ollama server for load tests and benchmarks.
+
+Speaks the parts of the Ollama HTTP API the backend uses, so the app can run
+without models or a GPU and with predictable generation speed:
+
+  POST /api/chat, /api/generate   stream --tokens tokens (or options.num_predict)
+                                  after --ttft-ms, at --rate tokens/second
+  POST /api/embed, /api/embeddings
+                                  deterministic bag-of-words vectors of --dim
+                                  dimensions after --embed-ms, so similar text
+                                  gets similar vectors and retrieval is meaningful
+  GET  /, /api/tags, /api/version, POST /api/show
+  GET  /_stats                    requests, texts embedded and tokens served so far
+
+Each streamed token is one word with a leading space. Point the backend at it
+with OLLAMA_HOST:
+
+    python backend/benchmarks/fake_ollama.py --port 11500 --rate 50
+    OLLAMA_HOST=http://127.0.0.1:11500 python backend/run_server.py
+
+bench_load.py runs it in its own process so its timing isn't skewed by the
+load generator; FakeOllama runs it in-process on a background thread instead.
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+WORDS = ("the document describes how the system stores threads messages and edits and how answers "
+         "are generated from retrieved context with citations to the relevant pages").split()
+
+
+def embed_text(text: str, dim: int) -> List[float]:
+    """Hash words into a unit vector of dim dimensions."""
+    vector = [0.0] * dim
+    for word in text.lower().split():
+        digest = hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest()
+        index = int.from_bytes(digest[:4], "little") % dim
+        vector[index] += 1.0 if digest[4] & 1 else -1.0
+    norm = math.sqrt(sum(v * v for v in vector))
+    if norm == 0:
+        vector[0], norm = 1.0, 1.0
+    return [v / norm for v in vector]
+
+
+class FakeOllama:
+    """A fake Ollama server on a background thread; counts requests and tokens served."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, rate: float = 50.0, tokens: int = 64,
+                 ttft_ms: float = 50.0, embed_ms: float = 5.0, dim: int = 384):
+        self.rate = rate
+        self.tokens = tokens
+        self.ttft_ms = ttft_ms
+        self.embed_ms = embed_ms
+        self.dim = dim
+        self.stats: Dict[str, int] = {"chat": 0, "generate": 0, "embed": 0, "texts_embedded": 0,
+                                      "tokens_streamed": 0, "streams_cancelled": 0}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeOllama":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def count(self, key: str, amount: int = 1):
+        with self._lock:
+            self.stats[key] += amount
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def read_json(self) -> Dict:
+                length = int(self.headers.get("Content-Length") or 0)
+                return json.loads(self.rfile.read(length) or b"{}") if length else {}
+
+            def send_json(self, payload: Dict, status: int = 200):
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if self.path == "/":
+                    body = b"Ollama is running"
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/plain")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                elif self.path == "/api/tags":
+                    self.send_json({"models": []})
+                elif self.path == "/api/version":
+                    self.send_json({"version": "0.0.0-fake"})
+                elif self.path == "/_stats":
+                    with fake._lock:
+                        self.send_json(dict(fake.stats))
+                else:
+                    self.send_json({"error": f"not found: {self.path}"}, 404)
+
+            def do_POST(self):
+                request = self.read_json()
+                if self.path == "/api/chat":
+                    fake.count("chat")
+                    self.generate(request, chat=True)
+                elif self.path == "/api/generate":
+                    fake.count("generate")
+                    self.generate(request, chat=False)
+                elif self.path in ("/api/embed", "/api/embeddings"):
+                    texts = request.get("input", request.get("prompt", ""))
+                    texts = [texts] if isinstance(texts, str) else list(texts)
+                    fake.count("embed")
+                    fake.count("texts_embedded", len(texts))
+                    time.sleep(fake.embed_ms / 1000)
+                    embeddings = [embed_text(text, fake.dim) for text in texts]
+                    if self.path == "/api/embeddings":
+                        self.send_json({"embedding": embeddings[0]})
+                    else:
+                        self.send_json({"model": request.get("model", ""), "embeddings": embeddings,
+                                        "prompt_eval_count": sum(len(t.split()) for t in texts)})
+                elif self.path == "/api/show":
+                    self.send_json({"modelfile": "", "parameters": "", "template": "", "model_info": {},
+                                    "details": {"family": "fake", "format": "gguf"},
+                                    "capabilities": ["completion", "embedding"]})
+                else:
+                    self.send_json({"error": f"not found: {self.path}"}, 404)
+
+            def generate(self, request: Dict, chat: bool):
+                model = request.get("model", "")
+                count = int((request.get("options") or {}).get("num_predict") or fake.tokens)
+                if count < 0:
+                    count = fake.tokens
+                prompt = request.get("messages") if chat else request.get("prompt", "")
+                prompt_tokens = len(json.dumps(prompt)) // 4
+
+                def part(text: str, done: bool) -> Dict:
+                    payload = {"model": model, "created_at": datetime.now(timezone.utc).isoformat(), "done": done}
+                    if chat:
+                        payload["message"] = {"role": "assistant", "content": text}
+                    else:
+                        payload["response"] = text
+                    if done:
+                        payload.update({"done_reason": "stop", "prompt_eval_count": prompt_tokens, "eval_count": count})
+                    return payload
+
+                start = time.perf_counter()
+                time.sleep(fake.ttft_ms / 1000)
+                words = [" " + WORDS[i % len(WORDS)] for i in range(count)]
+                if request.get("stream", True) is False:
+                    self.send_json(part("".join(words), True))
+                    fake.count("tokens_streamed", count)
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                first = time.perf_counter()
+                try:
+                    for i, word in enumerate(words):
+                        delay = first + i / fake.rate - time.perf_counter()
+                        if delay > 0:
+                            time.sleep(delay)
+                        self.write_chunk(part(word, False))
+                        fake.count("tokens_streamed")
+                    final = part("", True)
+                    final["total_duration"] = int((time.perf_counter() - start) * 1e9)
+                    self.write_chunk(final)
+                    self.wfile.write(b"0\r\n\r\n")
+                    self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    # The backend stopped reading (client cancelled the stream)
+                    fake.count("streams_cancelled")
+                    self.close_connection = True
+
+            def write_chunk(self, payload: Dict):
+                data = json.dumps(payload).encode("utf-8") + b"\n"
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+                self.wfile.flush()
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Ollama server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11500)
+    parser.add_argument("--rate", type=float, default=50.0, help="Streamed tokens/second per response")
+    parser.add_argument("--tokens", type=int, default=64, help="Tokens per response (unless num_predict is set)")
+    parser.add_argument("--ttft-ms", type=float, default=50.0, help="Delay before the first token")
+    parser.add_argument("--embed-ms", type=float, default=5.0, help="Delay per embedding request")
+    parser.add_argument("--dim", type=int, default=384, help="Embedding dimensions")
+    args = parser.parse_args()
+
+    fake = FakeOllama(args.host, args.port, args.rate, args.tokens, args.ttft_ms, args.embed_ms, args.dim).start()
+    print(f"Fake Ollama listening on {fake.url} ({args.tokens} tokens at {args.rate:g} tokens/s)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        fake.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+import os
+import re
+import json
+import math
+import threading
+from collections import Counter, defaultdict
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
+
+if TYPE_CHECKING:
+    from langchain_core.documents import Document
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[-_.][a-z0-9]+)*")
+# Tokens that look like error codes, part numbers or identifiers: letters and digits joined by
+# separators (ID-00042-017, v2.1-rc3), upper-case codes with digits (E1234, HTTP404) and constants
+# (ERR_CONN_RESET). Plain numbers and words (2020, iPhone, 15) don't count.
+CODE_PATTERN = re.compile(
+    r"^(?=.*\d)(?=.*[A-Za-z])[A-Za-z0-9]+(?:[-_.:/][A-Za-z0-9]+)+$"
+    r"|^(?=.*\d)[A-Z][A-Z0-9]+$"
+    r"|^[A-Z][A-Z0-9]*(?:_[A-Z0-9]+)+$"
+)
+QUOTED_PATTERN = re.compile(r'"[^"]+"')
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens; compound codes (ab-12_c) are kept whole and also split into parts."""
+    tokens = []
+    for match in TOKEN_PATTERN.findall(text.lower()):
+        tokens.append(match)
+        if any(sep in match for sep in "-_."):
+            tokens.extend(part for part in re.split(r"[-_.]", match) if part)
+    return tokens
+
+
+def is_keyword_query(question: str, max_terms: int = 6) -> bool:
+    """
+    True for short queries made only of codes, identifiers and quoted phrases.
+    A single natural-language word ("Who won in 2020?") makes it a question for
+    vector search.
+    """
+    terms = question.split()
+    if not terms or len(terms) > max_terms:
+        return False
+    rest = QUOTED_PATTERN.sub(" ", question).split()
+    return all(CODE_PATTERN.match(term.strip("'(),;?!").rstrip(".")) for term in rest)
+
+
+class BM25Index:
+    """
+    Local BM25 inverted index over ingested chunks.
+
+    Kept in sync with the Chroma collection during ingestion (chunk hashes are
+    the ids in both) and persisted as JSON next to it. Chunk text and metadata
+    are stored too, so lexical-only searches can return Documents without
+    touching the vector store. The file is read on first use rather than on
+    construction.
+    """
+
+    def __init__(self, path: str, k1: float = 1.5, b: float = 0.75):
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        self._postings: Dict[str, Dict[str, int]] = defaultdict(dict)
+        self._lengths: Dict[str, int] = {}
+        self._documents: Dict[str, Tuple[str, dict]] = {}
+        self._total_length = 0
+        self._loaded = False
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        with self._lock:
+            if not self._loaded:
+                self._loaded = True
+                self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r") as f:
+            data = json.load(f)
+        for chunk_id, (text, metadata) in data.get("documents", {}).items():
+            self.add(chunk_id, text, metadata)
+
+    def save(self):
+        self._ensure_loaded()
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({"documents": self._documents}, f)
+            os.replace(tmp_path, self.path)
+
+    def add(self, chunk_id: str, text: str, metadata: Optional[dict] = None):
+        self._ensure_loaded()
+        with self._lock:
+            if chunk_id in self._documents:
+                return
+            counts = Counter(tokenize(text))
+            for term, tf in counts.items():
+                self._postings[term][chunk_id] = tf
+            length = sum(counts.values())
+            self._lengths[chunk_id] = length
+            self._total_length += length
+            self._documents[chunk_id] = (text, metadata or {})
+
+    def remove(self, chunk_id: str):
+        self._ensure_loaded()
+        with self._lock:
+            entry = self._documents.pop(chunk_id, None)
+            if entry is None:
+                return
+            for term in set(tokenize(entry[0])):
+                postings = self._postings.get(term)
+                if postings is not None:
+                    postings.pop(chunk_id, None)
+                    if not postings:
+                        del self._postings[term]
+            self._total_length -= self._lengths.pop(chunk_id, 0)
+
+    def search(self, query: str, k: int, allowed: Optional[Set[str]] = None) -> List[Tuple[str, float]]:
+        """Return up to k (chunk_id, score) pairs, best first, optionally only among allowed ids."""
+        self._ensure_loaded()
+        with self._lock:
+            n = len(self._documents)
+            if n == 0:
+                return []
+            avg_length = self._total_length / n
+            scores: Dict[str, float] = defaultdict(float)
+            for term in set(tokenize(query)):
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+                for chunk_id, tf in postings.items():
+                    if allowed is not None and chunk_id not in allowed:
+                        continue
+                    norm = tf + self.k1 * (1 - self.b + self.b * self._lengths[chunk_id] / avg_length)
+                    scores[chunk_id] += idf * tf * (self.k1 + 1) / norm
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+
+    def document(self, chunk_id: str) -> "Document":
+        from langchain_core.documents import Document
+
+        self._ensure_loaded()
+        text, metadata = self._documents[chunk_id]
+        return Document(page_content=text, metadata=dict(metadata))
+
+    def __len__(self) -> int:
+        self._ensure_loaded()
+        return len(self._documents)
+
+
+def reciprocal_rank_fusion(rankings: List[List[str]], weights: Optional[List[float]] = None, k: int = 60) -> List[Tuple[str, float]]:
+    """Fuse ranked id lists into one ranking by weighted reciprocal rank."""
+    weights = weights or [1.0] * len(rankings)
+    scores: Dict[str, float] = defaultdict(float)
+    for ranking, weight in zip(rankings, weights):
+        for rank, item in enumerate(ranking):
+            scores[item] += weight / (k + rank + 1)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
@@ -0,0 +1,67 @@
+import threading
+from typing import TYPE_CHECKING, Dict, Optional, Tuple, Union
+
+# LangChain's chain modules are slow to import; they load with the first chain or prompt
+if TYPE_CHECKING:
+    from langchain_core.prompts import BasePromptTemplate
+
+DEFAULT_PROMPT = "default"
+
+
+class ChainRegistry:
+    """
+    Compiles QA chains once per (model, chain_type, prompt) and reuses them.
+
+    Prompts are registered by name; "default" uses load_qa_chain's built-in
+    prompt. A cached chain is rebuilt only if the pooled client for its model
+    has been replaced. discard_model drops a model's chains when the pool
+    evicts its client, so the cache doesn't keep evicted clients alive.
+    """
+
+    def __init__(self):
+        self._prompts: Dict[str, Optional["BasePromptTemplate"]] = {DEFAULT_PROMPT: None}
+        self._chains: Dict[Tuple[str, str, str], Tuple[object, object]] = {}
+        self._lock = threading.Lock()
+
+    def register_prompt(self, name: str, prompt: Union[str, "BasePromptTemplate"]):
+        """
+        Register a prompt template by name.
+        String templates must use the {context} and {question} variables.
+        """
+        from langchain_core.prompts import PromptTemplate
+
+        if isinstance(prompt, str):
+            prompt = PromptTemplate.from_template(prompt)
+        with self._lock:
+            self._prompts[name] = prompt
+            # Drop chains compiled against a previous version of this prompt
+            for key in [key for key in self._chains if key[2] == name]:
+                del self._chains[key]
+
+    def prompts(self):
+        return list(self._prompts)
+
+    def discard_model(self, model_name: str):
+        """Drop every chain compiled for model_name (ModelPool eviction hook)."""
+        with self._lock:
+            for key in [key for key in self._chains if key[0] == model_name]:
+                del self._chains[key]
+
+    def get(self, llm, model_name: str, chain_type: str = "stuff", prompt: str = DEFAULT_PROMPT):
+        """Return the compiled chain for this model, chain type and prompt name."""
+        key = (model_name, chain_type, prompt)
+        cached = self._chains.get(key)
+        if cached is not None and cached[0] is llm:
+            return cached[1]
+
+        if prompt not in self._prompts:
+            raise KeyError(f"Unknown prompt template: {prompt}")
+
+        from langchain.chains.question_answering import load_qa_chain
+
+        with self._lock:
+            template = self._prompts[prompt]
+            kwargs = {"prompt": template} if template is not None else {}
+            chain = load_qa_chain(llm, chain_type=chain_type, **kwargs)
+            self._chains[key] = (llm, chain)
+        return chain
@@ -0,0 +1,129 @@
+import os
+import math
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from ingest_worker import CHUNK_OVERLAP
+
+if TYPE_CHECKING:
+    from langchain_core.documents import Document
+
+# Packing configuration
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "1500"))
+
+# Context budgets for models whose Ollama context window is known to be tight
+MODEL_TOKEN_BUDGETS: Dict[str, int] = {
+    "tinyllama:latest": 1200,
+    "qwen3:0.6b": 1500,
+    "smollm2:360m": 1200,
+}
+
+# Approximate characters per token by model family; there is no local tokenizer for
+# Ollama models, so counts are estimates tuned to English text
+CHARS_PER_TOKEN: Dict[str, float] = {
+    "qwen": 3.8,
+    "smollm": 3.6,
+    "tinyllama": 3.4,
+    "llama": 3.6,
+}
+DEFAULT_CHARS_PER_TOKEN = 3.5
+
+# Shortest shared prefix/suffix treated as splitter overlap rather than a coincidence
+MIN_OVERLAP_CHARS = int(os.getenv("MIN_OVERLAP_CHARS", "20"))
+
+
+def count_tokens(text: str, model: str) -> int:
+    """Estimate the number of tokens text takes for model."""
+    family = model.split(":")[0].lower()
+    ratio = next((r for prefix, r in CHARS_PER_TOKEN.items() if family.startswith(prefix)), DEFAULT_CHARS_PER_TOKEN)
+    return math.ceil(len(text) / ratio)
+
+
+def token_budget(model: str) -> int:
+    return MODEL_TOKEN_BUDGETS.get(model, CONTEXT_TOKEN_BUDGET)
+
+
+def _strip_overlap(previous: str, text: str, max_overlap: int = CHUNK_OVERLAP,
+                   min_overlap: int = MIN_OVERLAP_CHARS) -> str:
+    """
+    Remove the prefix of text that repeats the end of previous (splitter overlap).
+    The splitter overlaps whole words, so shorter matches or matches that end
+    mid-word are coincidences and text is returned unchanged.
+    """
+    for size in range(min(max_overlap, len(previous), len(text)), min_overlap - 1, -1):
+        if previous.endswith(text[:size]) and (size == len(text) or text[size].isspace()):
+            return text[size:]
+    return text
+
+
+def _adjacent(a: "Document", b: "Document") -> bool:
+    """Whether two chunks can share splitter overlap: pages are split separately."""
+    return a.metadata.get("source") == b.metadata.get("source") and a.metadata.get("page") == b.metadata.get("page")
+
+
+class ContextPacker:
+    """
+    Fits retrieved chunks into a per-model token budget.
+
+    Candidates arrive ranked by similarity. Exact and contained duplicates are
+    dropped, the overlap the splitter repeats between neighbouring chunks is
+    trimmed, and chunks are added best-first until the budget is spent
+    (smaller lower-ranked chunks can still fill the remainder).
+    """
+
+    def __init__(self, budgets: Optional[Dict[str, int]] = None):
+        self.budgets = budgets
+
+    def budget_for(self, model: str) -> int:
+        if self.budgets is not None and model in self.budgets:
+            return self.budgets[model]
+        return token_budget(model)
+
+    def pack(self, ranked: List[Tuple["Document", float]], model: str) -> Tuple[List["Document"], Dict]:
+        """
+        Pack (document, score) pairs, best first.
+        Returns the packed documents and a report of what was kept and dropped.
+        """
+        from langchain_core.documents import Document
+
+        budget = self.budget_for(model)
+        kept: List[Document] = []
+        kept_texts: List[str] = []
+        used = 0
+        duplicates = 0
+        over_budget = 0
+
+        for doc, _ in ranked:
+            text = doc.page_content
+            if any(text in other for other in kept_texts):
+                duplicates += 1
+                continue
+
+            # Trim the splitter overlap shared with an already-kept chunk of the same page
+            for other in kept:
+                if _adjacent(other, doc):
+                    trimmed = _strip_overlap(other.page_content, text)
+                    if trimmed != text:
+                        text = trimmed
+                        break
+            if not text.strip():
+                duplicates += 1
+                continue
+
+            tokens = count_tokens(text, model)
+            if used + tokens > budget:
+                over_budget += 1
+                continue
+
+            kept.append(Document(page_content=text, metadata=doc.metadata))
+            kept_texts.append(doc.page_content)
+            used += tokens
+
+        report = {
+            "budget_tokens": budget,
+            "context_tokens": used,
+            "candidates": len(ranked),
+            "packed": len(kept),
+            "dropped_duplicates": duplicates,
+            "dropped_over_budget": over_budget,
+        }
+        return kept, report
@@ -0,0 +1,130 @@
+import os
+import json
+import hashlib
+import threading
+from typing import Dict, Iterable, List, Optional, Set
+
+
+def hash_file(path: str, block_size: int = 1 << 20) -> str:
+    """Return the sha256 hex digest of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def hash_text(text: str) -> str:
+    """Return the sha256 hex digest of a chunk's text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def document_key(source: str, thread_id: Optional[str] = None) -> str:
+    """Registry key of a document: its source name within the thread it was uploaded to."""
+    return f"{thread_id}/{source}" if thread_id else source
+
+
+class DocumentRegistry:
+    """
+    JSON-backed registry of ingested documents.
+
+    Each document is keyed by its source name within the thread it was
+    uploaded to (see document_key), so uploads with the same filename in
+    different threads are separate documents. An entry records the content
+    hash of the file, the hashes of the chunks it produced and its threads. Chunk hashes double as vector ids in the collection, so the
+    registry tells ingestion which chunks are already embedded and which ones
+    became stale, and tells retrieval which chunks a document or thread owns.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        # Held by readers too: ingestion threads update the registry while requests read it
+        self._lock = threading.RLock()
+        self._documents: Dict[str, Dict] = {}
+        self._load()
+
+    def _load(self):
+        if os.path.exists(self.path):
+            with open(self.path, "r") as f:
+                self._documents = json.load(f).get("documents", {})
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"documents": self._documents}, f)
+        os.replace(tmp_path, self.path)
+
+    def find_by_hash(self, doc_hash: str) -> Optional[str]:
+        """Return the source of an already-ingested document with this content hash."""
+        with self._lock:
+            for source, entry in self._documents.items():
+                if entry["doc_hash"] == doc_hash:
+                    return source
+        return None
+
+    def chunk_ids(self, source: str) -> Set[str]:
+        with self._lock:
+            entry = self._documents.get(source)
+            return set(entry["chunk_ids"]) if entry else set()
+
+    def all_chunk_ids(self, exclude: Optional[str] = None) -> Set[str]:
+        """Return every registered chunk id, optionally ignoring one document."""
+        ids = set()
+        with self._lock:
+            for source, entry in self._documents.items():
+                if source != exclude:
+                    ids.update(entry["chunk_ids"])
+        return ids
+
+    def find_source(self, document_id: str, thread_id: Optional[str] = None) -> Optional[str]:
+        """
+        Resolve a document id (content hash, or source name, looked up in
+        thread_id first) to its registry key.
+        """
+        with self._lock:
+            if thread_id and document_key(document_id, thread_id) in self._documents:
+                return document_key(document_id, thread_id)
+            if document_id in self._documents:
+                return document_id
+            return self.find_by_hash(document_id)
+
+    def register(self, source: str, doc_hash: str, chunk_ids: Iterable[str], thread_id: Optional[str] = None):
+        with self._lock:
+            # A new version of a document stays attached to the threads of the previous one
+            threads = self._documents.get(source, {}).get("threads", [])
+            if thread_id and thread_id not in threads:
+                threads = threads + [thread_id]
+            self._documents[source] = {"doc_hash": doc_hash, "chunk_ids": list(chunk_ids), "threads": threads}
+            self._save()
+
+    def thread_sources(self, thread_id: str) -> List[str]:
+        with self._lock:
+            return [source for source, entry in self._documents.items() if thread_id in entry.get("threads", ())]
+
+    def scope_chunk_ids(self, sources: Iterable[str] = (), thread_id: Optional[str] = None) -> Set[str]:
+        """Return the chunk ids of the given documents plus every document attached to thread_id."""
+        scoped = set(sources)
+        ids = set()
+        # One snapshot of the registry, so a concurrent upload can't leave the scope half-updated
+        with self._lock:
+            if thread_id:
+                scoped.update(self.thread_sources(thread_id))
+            for source in scoped:
+                ids.update(self.chunk_ids(source))
+        return ids
+
+    def remove(self, source: str):
+        with self._lock:
+            if self._documents.pop(source, None) is not None:
+                self._save()
+
+    def sources(self) -> List[str]:
+        with self._lock:
+            return list(self._documents)
+
+    def __contains__(self, source: str) -> bool:
+        return source in self._documents
+
+    def __len__(self) -> int:
+        return len(self._documents)
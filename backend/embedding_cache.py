@@ -0,0 +1,148 @@
+import os
+import time
+import sqlite3
+import threading
+from array import array
+from typing import Dict, List
+
+from langchain_core.embeddings import Embeddings
+
+from document_registry import hash_text
+
+# Cache configuration
+EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "200000"))
+
+
+class EmbeddingCache:
+    """
+    Disk-backed embedding cache keyed by (model, sha256 of text).
+
+    Vectors are stored as float32 blobs in SQLite. Once more than max_entries
+    vectors are stored, the least recently used ones are evicted. Hit and miss
+    counters are kept for the lifetime of the process.
+    """
+
+    def __init__(self, path: str, max_entries: int = EMBEDDING_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " model TEXT NOT NULL,"
+            " text_hash TEXT NOT NULL,"
+            " vector BLOB NOT NULL,"
+            " last_used REAL NOT NULL,"
+            " PRIMARY KEY (model, text_hash))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings (last_used)")
+        self._conn.commit()
+        self._size = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def get_many(self, model: str, text_hashes: List[str]) -> Dict[str, List[float]]:
+        """Return cached vectors for the given hashes, counting hits and misses."""
+        found = {}
+        now = time.time()
+        with self._lock:
+            # Stay well below SQLite's bound-parameter limit
+            for start in range(0, len(text_hashes), 500):
+                part = text_hashes[start:start + 500]
+                placeholders = ",".join("?" * len(part))
+                rows = self._conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings WHERE model = ? AND text_hash IN ({placeholders})",
+                    [model, *part],
+                ).fetchall()
+                for text_hash, blob in rows:
+                    found[text_hash] = array("f", blob).tolist()
+            if found:
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE model = ? AND text_hash = ?",
+                    [(now, model, text_hash) for text_hash in found],
+                )
+                self._conn.commit()
+            self.hits += len(found)
+            self.misses += len(set(text_hashes)) - len(found)
+        return found
+
+    def put_many(self, model: str, vectors: Dict[str, List[float]]):
+        """Store vectors and evict the least recently used entries over the limit."""
+        if not vectors:
+            return
+        now = time.time()
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO embeddings (model, text_hash, vector, last_used) VALUES (?, ?, ?, ?)",
+                [(model, text_hash, array("f", vector).tobytes(), now) for text_hash, vector in vectors.items()],
+            )
+            self._size += self._conn.total_changes - before
+            if self._size > self.max_entries:
+                excess = self._size - self.max_entries
+                self._conn.execute(
+                    "DELETE FROM embeddings WHERE rowid IN "
+                    "(SELECT rowid FROM embeddings ORDER BY last_used ASC LIMIT ?)",
+                    (excess,),
+                )
+                self._size -= excess
+                self.evictions += excess
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": self._size,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings wrapper that serves repeated texts from an EmbeddingCache.
+    Query vectors are cached under a separate key since the model may embed
+    queries and documents differently.
+    """
+
+    def __init__(self, embeddings: Embeddings, cache: EmbeddingCache, model: str):
+        self.embeddings = embeddings
+        self.cache = cache
+        self.model = model
+        self.query_model = f"{model}:query"
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        hashes = [hash_text(text) for text in texts]
+        cached = self.cache.get_many(self.model, hashes)
+
+        missing = {}
+        for text_hash, text in zip(hashes, texts):
+            if text_hash not in cached and text_hash not in missing:
+                missing[text_hash] = text
+        if missing:
+            computed = self.embeddings.embed_documents(list(missing.values()))
+            fresh = dict(zip(missing.keys(), computed))
+            self.cache.put_many(self.model, fresh)
+            cached.update(fresh)
+
+        return [cached[text_hash] for text_hash in hashes]
+
+    def embed_query(self, text: str) -> List[float]:
+        text_hash = hash_text(text)
+        cached = self.cache.get_many(self.query_model, [text_hash])
+        if text_hash in cached:
+            return cached[text_hash]
+        vector = self.embeddings.embed_query(text)
+        self.cache.put_many(self.query_model, {text_hash: vector})
+        return vector
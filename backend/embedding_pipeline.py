@@ -0,0 +1,99 @@
+import os
+import logging
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Iterable, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Pipeline configuration
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "64"))
+EMBED_CONCURRENCY = int(os.getenv("EMBED_CONCURRENCY", "4"))
+
+
+def upsert_embeddings(vectorstore, ids: List[str], embeddings: List[List[float]], documents: List[str],
+                      metadatas: List[dict]):
+    """
+    Write already-embedded chunks to a langchain_chroma vector store.
+
+    Chroma.add_texts() always embeds its texts itself, and the pipeline has
+    embedded them already, so this goes through the underlying chromadb
+    collection; ingestion writes nowhere else, so a langchain_chroma upgrade
+    that changes the private _collection only needs fixing here.
+    """
+    vectorstore._collection.upsert(
+        ids=ids,
+        embeddings=embeddings,
+        documents=documents,
+        metadatas=[metadata or None for metadata in metadatas],
+    )
+
+
+class EmbeddingPipeline:
+    """
+    Batched, parallel embedding stage for ingestion.
+
+    Chunks are embedded in batches of batch_size on a thread pool with at most
+    concurrency batches in flight. When the window is full the producer waits
+    for a batch to finish (backpressure), and every finished batch is written
+    to the vector store right away, so only the in-flight vectors are held in
+    memory.
+    """
+
+    def __init__(self, embedding_function, batch_size: int = EMBED_BATCH_SIZE, concurrency: int = EMBED_CONCURRENCY):
+        self.embedding_function = embedding_function
+        self.batch_size = max(1, batch_size)
+        self.concurrency = max(1, concurrency)
+
+    def _embed_batch(self, batch: List[Tuple[str, object]]):
+        texts = [chunk.page_content for _, chunk in batch]
+        return batch, self.embedding_function.embed_documents(texts)
+
+    def run(self, vectorstore, chunks: Iterable[Tuple[str, object]], progress=None) -> int:
+        """
+        Embed (id, Document) pairs and stream them into vectorstore.
+        progress(chunks_embedded=..., vectors_written=...) is called as batches finish.
+        Returns the number of chunks written.
+        """
+        embedded = 0
+        written = 0
+
+        def store(future):
+            nonlocal embedded, written
+            batch, embeddings = future.result()
+            embedded += len(batch)
+            if progress is not None:
+                progress(chunks_embedded=embedded)
+            upsert_embeddings(
+                vectorstore,
+                ids=[chunk_id for chunk_id, _ in batch],
+                embeddings=embeddings,
+                documents=[chunk.page_content for _, chunk in batch],
+                metadatas=[chunk.metadata for _, chunk in batch],
+            )
+            written += len(batch)
+            if progress is not None:
+                progress(vectors_written=written)
+
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="embed") as pool:
+            in_flight = set()
+            batch = []
+            for item in chunks:
+                batch.append(item)
+                if len(batch) < self.batch_size:
+                    continue
+                in_flight.add(pool.submit(self._embed_batch, batch))
+                batch = []
+                # Backpressure: wait for a slot before producing more batches
+                while len(in_flight) >= self.concurrency:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        store(future)
+            if batch:
+                in_flight.add(pool.submit(self._embed_batch, batch))
+            while in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    store(future)
+
+        logger.info(f"Embedded {written} chunks (batch_size={self.batch_size}, concurrency={self.concurrency})")
+        return written
@@ -0,0 +1,150 @@
+import os
+import time
+import uuid
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Job configuration
+INGEST_JOBS_RETAINED = int(os.getenv("INGEST_JOBS_RETAINED", "200"))
+
+
+class IngestJob:
+    """
+    Progress of one background PDF ingestion.
+
+    Counters are updated from the event loop, the ingestion process pool
+    callbacks and the embedding threads; update() is thread-safe and wakes
+    anyone streaming the job's progress.
+    """
+
+    FINISHED = ("completed", "failed")
+
+    def __init__(self, source: str, loop: asyncio.AbstractEventLoop, thread_id: Optional[str] = None):
+        self.job_id = str(uuid.uuid4())
+        self.source = source
+        self.thread_id = thread_id
+        self.status = "queued"
+        self.pages_total = 0
+        self.pages_parsed = 0
+        self.chunks_total = 0
+        self.chunks_embedded = 0
+        self.vectors_written = 0
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self._loop = loop
+        self._version = 0
+        self._changed = asyncio.Event()
+
+    def update(self, **fields):
+        """Set progress fields from any thread and notify listeners."""
+        for name, value in fields.items():
+            setattr(self, name, value)
+        if self.status in self.FINISHED and self.finished_at is None:
+            self.finished_at = time.time()
+        self._loop.call_soon_threadsafe(self._notify)
+
+    def _notify(self):
+        self._version += 1
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in self.FINISHED
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "source": self.source,
+            "thread_id": self.thread_id,
+            "status": self.status,
+            "pages_total": self.pages_total,
+            "pages_parsed": self.pages_parsed,
+            "chunks_total": self.chunks_total,
+            "chunks_embedded": self.chunks_embedded,
+            "vectors_written": self.vectors_written,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+    async def events(self, keepalive: float = 15.0) -> AsyncIterator[Dict[str, Any]]:
+        """Yield the job state on every change until it finishes."""
+        last_version = -1
+        while True:
+            changed = self._changed
+            if self._version != last_version:
+                last_version = self._version
+                yield self.to_dict()
+                if self.finished:
+                    return
+            try:
+                await asyncio.wait_for(changed.wait(), keepalive)
+            except asyncio.TimeoutError:
+                yield self.to_dict()
+
+
+class IngestJobManager:
+    """Runs PDF ingestions as background tasks and keeps their progress for polling."""
+
+    def __init__(self, rag, retained: int = INGEST_JOBS_RETAINED):
+        self.rag = rag
+        self.retained = retained
+        self._jobs: "OrderedDict[str, IngestJob]" = OrderedDict()
+        self._tasks = set()
+
+    def submit(self, pdf_path: str, source: str, cleanup: bool = True, thread_id: Optional[str] = None) -> IngestJob:
+        """
+        Start ingesting pdf_path in the background, attached to thread_id if given.
+        The file is removed afterwards when cleanup is set.
+        """
+        job = IngestJob(source, asyncio.get_running_loop(), thread_id)
+        self._jobs[job.job_id] = job
+        self._prune()
+
+        task = asyncio.create_task(self._run(job, pdf_path, cleanup))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    def get(self, job_id: str) -> Optional[IngestJob]:
+        return self._jobs.get(job_id)
+
+    async def _run(self, job: IngestJob, pdf_path: str, cleanup: bool):
+        job.update(status="running")
+        try:
+            result = await self.rag.aingest_pdf(pdf_path, source=job.source, progress=job.update,
+                                               thread_id=job.thread_id)
+            job.update(status="completed", result=result)
+            logger.info(f"Ingestion job {job.job_id} completed: {result}")
+        except Exception as e:
+            job.update(status="failed", error=str(e))
+            logger.error(f"Ingestion job {job.job_id} failed: {e}")
+        finally:
+            if cleanup:
+                try:
+                    os.unlink(pdf_path)
+                except OSError:
+                    pass
+
+    def _prune(self):
+        """Drop the oldest finished jobs beyond the retention limit."""
+        excess = len(self._jobs) - self.retained
+        for job_id in list(self._jobs):
+            if excess <= 0:
+                break
+            if self._jobs[job_id].finished:
+                del self._jobs[job_id]
+                excess -= 1
+
+    async def shutdown(self):
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
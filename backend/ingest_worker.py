@@ -0,0 +1,134 @@
+import os
+import asyncio
+import logging
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, AsyncIterator, List, Tuple
+
+# pypdf and the LangChain splitter are imported inside the functions that use them:
+# they are only needed once a PDF is ingested, mostly in the worker processes
+if TYPE_CHECKING:
+    from langchain_core.documents import Document
+
+logger = logging.getLogger(__name__)
+
+# Worker configuration
+INGEST_PROCESSES = int(os.getenv("INGEST_PROCESSES", str(max(1, (os.cpu_count() or 2) - 1))))
+INGEST_PAGES_PER_TASK = int(os.getenv("INGEST_PAGES_PER_TASK", "25"))
+# Parsed page ranges allowed to wait for indexing; bounds memory for large PDFs
+INGEST_MAX_PENDING = int(os.getenv("INGEST_MAX_PENDING", str(max(2, INGEST_PROCESSES * 2))))
+# Chunks collected before a window is embedded and written
+INGEST_WINDOW_CHUNKS = int(os.getenv("INGEST_WINDOW_CHUNKS", "512"))
+
+CHUNK_SIZE = 2000
+CHUNK_OVERLAP = 100
+
+
+def count_pages(pdf_path: str) -> int:
+    """Return the number of pages in a PDF."""
+    from pypdf import PdfReader
+
+    with open(pdf_path, "rb") as f:
+        return len(PdfReader(f).pages)
+
+
+def parse_page_range(pdf_path: str, start: int, end: int) -> List[Tuple[str, dict]]:
+    """
+    Extract and split pages [start, end) of a PDF, one page at a time.
+    Runs in a worker process, so it returns plain (text, metadata) tuples.
+    """
+    from pypdf import PdfReader
+    from langchain.text_splitter import RecursiveCharacterTextSplitter
+    from langchain_core.documents import Document
+
+    splitter = RecursiveCharacterTextSplitter(chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP)
+    chunks = []
+    # Reading from an open file lets pypdf seek to the pages it needs instead of loading the whole file
+    with open(pdf_path, "rb") as f:
+        reader = PdfReader(f)
+        for page in range(start, end):
+            document = Document(page_content=reader.pages[page].extract_text() or "", metadata={"source": pdf_path, "page": page})
+            chunks.extend((chunk.page_content, chunk.metadata) for chunk in splitter.split_documents([document]))
+    return chunks
+
+
+def page_ranges(pages: int, pages_per_task: int = INGEST_PAGES_PER_TASK) -> List[Tuple[int, int]]:
+    return [(start, min(start + pages_per_task, pages)) for start in range(0, pages, pages_per_task)]
+
+
+class IngestionWorker:
+    """
+    Process pool for CPU-bound PDF parsing and splitting.
+
+    Large PDFs are cut into page ranges of pages_per_task that are parsed on
+    separate cores. The async API keeps the event loop free while the
+    workers run.
+    """
+
+    def __init__(self, processes: int = INGEST_PROCESSES, pages_per_task: int = INGEST_PAGES_PER_TASK,
+                 max_pending: int = INGEST_MAX_PENDING):
+        self.processes = processes
+        self.pages_per_task = max(1, pages_per_task)
+        self.max_pending = max(1, max_pending)
+        self._executor = None
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Spawn rather than fork: the server process runs threads and an event loop
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.processes,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            logger.info(f"Started ingestion process pool with {self.processes} workers")
+        return self._executor
+
+    async def iter_chunks(self, pdf_path: str, progress=None) -> AsyncIterator[List["Document"]]:
+        """
+        Parse and split a PDF across the process pool, yielding each page range's
+        chunks in page order.
+
+        At most max_pending ranges are parsed ahead of the consumer, so a slow
+        consumer (embedding) holds back parsing instead of letting parsed pages
+        pile up in memory. progress(pages_total=..., pages_parsed=...) is called
+        as page ranges are yielded.
+        """
+        from langchain_core.documents import Document
+
+        loop = asyncio.get_running_loop()
+        pages = await loop.run_in_executor(self.executor, count_pages, pdf_path)
+        if progress is not None:
+            progress(pages_total=pages)
+
+        ranges = deque(page_ranges(pages, self.pages_per_task))
+        pending = deque()
+        pages_parsed = 0
+        try:
+            while ranges or pending:
+                while ranges and len(pending) < self.max_pending:
+                    start, end = ranges.popleft()
+                    future = loop.run_in_executor(self.executor, parse_page_range, pdf_path, start, end)
+                    pending.append((end - start, future))
+
+                page_count, future = pending.popleft()
+                part = await future
+                pages_parsed += page_count
+                if progress is not None:
+                    progress(pages_parsed=pages_parsed)
+                yield [Document(page_content=text, metadata=metadata) for text, metadata in part]
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+    async def load_chunks(self, pdf_path: str, progress=None) -> List["Document"]:
+        """Parse and split a whole PDF across the process pool, preserving page order."""
+        chunks = []
+        async for part in self.iter_chunks(pdf_path, progress):
+            chunks.extend(part)
+        return chunks
+
+    def shutdown(self, wait: bool = False):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
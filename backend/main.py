@@ -1,20 +1,33 @@
-from fastapi import FastAPI, Depends, HTTPException, UploadFile, File, Form
+from fastapi import FastAPI, Depends, HTTPException, UploadFile, File, Form, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
+from sqlalchemy import select, text, tuple_, func, and_
+from sqlalchemy.ext.asyncio import AsyncSession
 from contextlib import asynccontextmanager
-from typing import List, Dict, Any, AsyncIterator, Optional
+from typing import Dict, Any, AsyncIterator, Optional
 from pydantic import BaseModel, Field
 import logging
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
 import json
+import base64
+import hashlib
 import tempfile
+import asyncio
 import os
 
-from database import get_db, create_tables, engine
+from database import get_async_db, create_tables_async, engine, async_engine, AsyncSessionLocal
 from models import Thread, ThreadTitle, Conversation
 from rag import RAG
+from model_pool import WARM_MODELS
+from title_worker import TitleQueue
+from ingest_jobs import IngestJobManager
+from chain_registry import DEFAULT_PROMPT
+from serialization import dumps, sse_event, FastJSONResponse, SSEFrame
+from stream_coalescer import coalesce
+from context_packer import count_tokens
+from metrics import (RequestTrace, pop_trace, registry as metrics_registry, record_stage, record_model_load,
+                     instrument_engine, allow_model_labels)
 
 
 # Pydantic models for request validation
@@ -25,6 +38,7 @@ class CreateMessageRequest(BaseModel):
     model: str = Field(..., min_length=1, max_length=100, description="The model used to generate the answer")
     firstMessage: bool = Field(default=False, description="Whether this is the first message in the thread")
     time_took: Optional[float] = Field(None, description="Time taken to generate the answer in seconds")
+    trace_id: Optional[str] = Field(None, max_length=64, description="X-Trace-Id of the /llm_call or /rag/ response that produced the answer")
 
 
 class CreateEditRequest(BaseModel):
@@ -33,6 +47,7 @@ class CreateEditRequest(BaseModel):
     answer: str = Field(..., min_length=1, max_length=50000, description="The edited answer text")
     model: str = Field(..., min_length=1, max_length=100, description="The model used to generate the edited answer")
     time_took: Optional[float] = Field(None, description="Time taken to generate the edited answer in seconds")
+    trace_id: Optional[str] = Field(None, max_length=64, description="X-Trace-Id of the /llm_call or /rag/ response that produced the edited answer")
 
 
 class LLMRequest(BaseModel):
@@ -55,6 +70,85 @@ logger = logging.getLogger(__name__)
 # Initialize RAG instance
 rag_instance = RAG()
 
+# Server-side timings: RAG stages, model loads and database statements feed /metrics
+rag_instance.timing_hooks.append(record_stage)
+rag_instance.model_pool.load_hooks.append(record_model_load)
+allow_model_labels(WARM_MODELS)
+instrument_engine(async_engine.sync_engine)
+instrument_engine(engine)
+
+# Background queue for thread title generation
+title_queue = TitleQueue(rag_instance)
+
+# Background PDF ingestion jobs
+ingest_jobs = IngestJobManager(rag_instance)
+
+# Reopen the persisted vector store at startup instead of on the first /rag/ call
+RAG_WARM_START = os.getenv("RAG_WARM_START", "true").lower() == "true"
+
+# Thread listing page sizes for /threads/titles
+THREAD_PAGE_SIZE = int(os.getenv("THREAD_PAGE_SIZE", "50"))
+THREAD_PAGE_MAX = int(os.getenv("THREAD_PAGE_MAX", "200"))
+
+# Conversation rows fetched per round trip when streaming an export
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "100"))
+
+# Uploads are copied to disk in blocks of this size rather than read into memory whole
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(1024 * 1024)))
+
+# Pre-encoded stream frames; only the token text is serialized per event
+CONTENT_FRAME = SSEFrame("content")
+CONTEXT_CONTENT_FRAME = SSEFrame("content", context_used=True)
+FALLBACK_CONTENT_FRAME = SSEFrame("content", context_used=False)
+
+
+async def spool_upload(upload: UploadFile, suffix: str = ".pdf") -> str:
+    """Copy an uploaded file to a temporary file block by block and return its path."""
+    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
+    try:
+        with temp_file:
+            while True:
+                block = await upload.read(UPLOAD_CHUNK_SIZE)
+                if not block:
+                    break
+                await asyncio.to_thread(temp_file.write, block)
+    except BaseException:
+        os.unlink(temp_file.name)
+        raise
+    return temp_file.name
+
+
+async def open_persisted_documents() -> bool:
+    """Open the persisted collection and retriever off the event loop; failures are logged, not raised."""
+    try:
+        return await asyncio.to_thread(rag_instance.open_persisted)
+    except Exception as e:
+        logger.error(f"Failed to open persisted vector store: {e}")
+        return False
+
+
+def trace_timings(trace_id: Optional[str], model: str) -> Dict[str, Any]:
+    """
+    Conversation columns for the server-side trace of the response being saved.
+    
+    Unknown or expired trace ids (and traces of another model) leave the timing
+    columns empty rather than failing the save.
+    """
+    if not trace_id:
+        return {}
+    trace = pop_trace(trace_id)
+    if trace is None or trace.model != model:
+        logger.warning(f"No trace {trace_id} for model {model}; saving message without server timings")
+        return {}
+    return {
+        "trace_id": trace.trace_id,
+        "time_to_first_token": trace.ttft,
+        "generation_time": trace.duration,
+        "retrieval_time": trace.stages.get("retrieve"),
+        "prompt_tokens": trace.prompt_tokens,
+        "completion_tokens": trace.tokens,
+    }
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -66,16 +160,30 @@ async def lifespan(app: FastAPI):
     logger.info("Starting up FastAPI application...")
     try:
         # Create database tables if they don't exist
-        create_tables()
+        await create_tables_async()
         logger.info("Database tables created/verified successfully")
     except Exception as e:
         logger.error(f"Failed to create database tables: {e}")
         raise
     
+    # Warm up configured LLM clients so the first request doesn't pay for it
+    if WARM_MODELS:
+        await rag_instance.model_pool.warm_up(WARM_MODELS)
+    
+    # Documents ingested by earlier runs are searchable without re-uploading them
+    if RAG_WARM_START:
+        await open_persisted_documents()
+    
+    title_queue.start()
+    
     yield
     
     # Shutdown
     logger.info("Shutting down FastAPI application...")
+    await title_queue.stop()
+    await ingest_jobs.shutdown()
+    rag_instance.ingest_worker.shutdown()
+    await async_engine.dispose()
     engine.dispose()
 
 
@@ -84,7 +192,8 @@ app = FastAPI(
     title="Chat Data Modeling API",
     description="API for managing chat threads, messages, and conversation history",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
 
 # Add CORS middleware
@@ -94,6 +203,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor", "X-Trace-Id"],
 )
 
 
@@ -103,15 +213,95 @@ async def root():
     return {"message": "Chat Data Modeling API is running"}
 
 
+@app.get("/metrics")
+async def get_metrics() -> Response:
+    """
+    Prometheus metrics in the text exposition format.
+    
+    Histograms per endpoint and model cover request duration, time to first
+    token, tokens/sec and bytes streamed for /llm_call and /rag/, plus RAG
+    stage latency, model load time and database statement time.
+    """
+    return Response(content=metrics_registry.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/metrics/latency")
+async def get_latency_percentiles(
+    hours: float = Query(24, gt=0, le=24 * 90),
+    model: Optional[str] = Query(None, max_length=100),
+    db: AsyncSession = Depends(get_async_db)
+) -> Dict[str, Any]:
+    """
+    Latency percentiles per model from the timings stored with saved messages.
+    
+    For messages saved in the last `hours` (optionally one model) returns the
+    p50/p95/p99 of time to first token, generation time and retrieval time in
+    seconds, and tokens/sec after the first token. The aggregate reads only
+    a covering index: (model, created_at) for one model, (created_at) for all
+    of them, so either way only the time window is scanned.
+    """
+    columns = {
+        "time_to_first_token": Conversation.time_to_first_token,
+        "generation_time": Conversation.generation_time,
+        "retrieval_time": Conversation.retrieval_time,
+    }
+    percentiles = {"p50": 0.5, "p95": 0.95, "p99": 0.99}
+    try:
+        aggregates = [
+            func.percentile_cont(fraction).within_group(column.asc()).label(f"{name}_{label}")
+            for name, column in columns.items()
+            for label, fraction in percentiles.items()
+        ]
+        query = (
+            select(
+                Conversation.model,
+                func.count().label("count"),
+                func.sum(Conversation.completion_tokens).label("completion_tokens"),
+                func.sum(Conversation.generation_time - Conversation.time_to_first_token).label("decode_time"),
+                *aggregates
+            )
+            .where(
+                Conversation.created_at >= datetime.utcnow() - timedelta(hours=hours),
+                Conversation.generation_time.isnot(None)
+            )
+            .group_by(Conversation.model)
+            .order_by(Conversation.model)
+        )
+        if model:
+            query = query.where(Conversation.model == model)
+        
+        models = []
+        for row in (await db.execute(query)).mappings():
+            stats = {"model": row["model"], "count": row["count"]}
+            for name in columns:
+                stats[name] = {label: row[f"{name}_{label}"] for label in percentiles}
+            decode_time = row["decode_time"]
+            stats["tokens_per_second"] = (
+                row["completion_tokens"] / decode_time if decode_time and row["completion_tokens"] else None
+            )
+            models.append(stats)
+        
+        return {"hours": hours, "models": models}
+        
+    except Exception as e:
+        logger.error(f"Failed to compute latency percentiles: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "error": "Failed to compute latency percentiles",
+                "message": str(e)
+            }
+        )
+
+
 @app.get("/health")
-async def health_check(db: Session = Depends(get_db)):
+async def health_check(db: AsyncSession = Depends(get_async_db)):
     """
     Health check endpoint that verifies database connectivity.
     """
     try:
         # Test database connection by executing a simple query
-        from sqlalchemy import text
-        db.execute(text("SELECT 1"))
+        await db.execute(text("SELECT 1"))
         return {
             "status": "healthy",
             "database": "connected",
@@ -129,39 +319,93 @@ async def health_check(db: Session = Depends(get_db)):
         )
 
 
+def encode_thread_cursor(started_at: datetime, thread_id: str) -> str:
+    """Encode the position after a thread as an opaque pagination cursor."""
+    raw = json.dumps([started_at.isoformat(), thread_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_thread_cursor(cursor: str):
+    """Decode a pagination cursor into (started_at, thread_id); raises ValueError if malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        started_at, thread_id = json.loads(raw)
+        return datetime.fromisoformat(started_at), str(thread_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
 @app.get("/threads/titles")
-async def get_thread_titles(db: Session = Depends(get_db)) -> List[Dict[str, Any]]:
+async def get_thread_titles(
+    request: Request,
+    limit: int = Query(THREAD_PAGE_SIZE, ge=1, le=THREAD_PAGE_MAX),
+    cursor: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_async_db)
+) -> Response:
     """
-    Retrieve all thread titles for sidebar display.
+    Retrieve a page of thread titles for sidebar display.
     
     Returns a list of threads with their titles, ordered by creation date (newest first).
     Each thread includes thread_id, title, and started_at timestamp.
     
+    Pages are keyset-paginated on (started_at, thread_id): pass the X-Next-Cursor
+    header of a response as cursor to get the next page (the header is absent on
+    the last page). Every page is served by the same index range scan, so cost
+    doesn't grow with the number of threads. Responses carry an ETag, and a
+    matching If-None-Match gets 304 Not Modified.
+    
     Requirements: 1.1, 1.2, 4.1
     """
+    try:
+        position = decode_thread_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "error": "Invalid cursor",
+                "message": str(e)
+            }
+        )
+    
     try:
         # Query threads with their titles using a left join
         # This ensures we get all threads, even if they don't have a title yet
         query = (
-            db.query(Thread, ThreadTitle)
+            select(Thread.thread_id, Thread.started_at, ThreadTitle.title)
             .outerjoin(ThreadTitle, Thread.thread_id == ThreadTitle.thread_id)
-            .order_by(Thread.started_at.desc())
+            .order_by(Thread.started_at.desc(), Thread.thread_id.desc())
+            .limit(limit + 1)  # One extra row tells whether another page follows
         )
+        if position is not None:
+            query = query.where(tuple_(Thread.started_at, Thread.thread_id) < tuple_(*position))
         
-        results = query.all()
+        results = (await db.execute(query)).all()
+        has_more = len(results) > limit
+        results = results[:limit]
         
         # Format the response for frontend consumption
         thread_titles = []
-        for thread, title in results:
+        for thread_id, started_at, title in results:
             thread_data = {
-                "thread_id": thread.thread_id,
-                "title": title.title if title else f"Thread {thread.thread_id[:8]}...",  # Default title if none exists
-                "started_at": thread.started_at.isoformat()
+                "thread_id": thread_id,
+                "title": title if title else f"Thread {thread_id[:8]}...",  # Default title if none exists
+                "started_at": started_at.isoformat()
             }
             thread_titles.append(thread_data)
         
-        logger.info(f"Retrieved {len(thread_titles)} thread titles")
-        return thread_titles
+        body = dumps(thread_titles)
+        etag = f'W/"{hashlib.sha1(body).hexdigest()}"'
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if has_more:
+            last_id, last_started_at, _ = results[-1]
+            headers["X-Next-Cursor"] = encode_thread_cursor(last_started_at, last_id)
+        
+        if_none_match = request.headers.get("if-none-match", "")
+        if etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*":
+            return Response(status_code=304, headers=headers)
+        
+        logger.info(f"Retrieved {len(thread_titles)} thread titles (has_more={has_more})")
+        return Response(content=body, media_type="application/json", headers=headers)
         
     except Exception as e:
         logger.error(f"Failed to retrieve thread titles: {e}")
@@ -175,7 +419,7 @@ async def get_thread_titles(db: Session = Depends(get_db)) -> List[Dict[str, Any
 
 
 @app.post("/threads")
-async def create_thread(db: Session = Depends(get_db)) -> Dict[str, Any]:
+async def create_thread(db: AsyncSession = Depends(get_async_db)) -> Dict[str, Any]:
     """
     Create a new conversation thread.
     
@@ -197,8 +441,8 @@ async def create_thread(db: Session = Depends(get_db)) -> Dict[str, Any]:
         thread_title = ThreadTitle(thread_id=thread_id, title=default_title)
         db.add(thread_title)
         
-        db.commit()
-        db.refresh(thread)
+        await db.commit()
+        await db.refresh(thread)
         
         response = {
             "thread_id": thread_id,
@@ -211,7 +455,7 @@ async def create_thread(db: Session = Depends(get_db)) -> Dict[str, Any]:
         return response
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Failed to create thread: {e}")
         raise HTTPException(
             status_code=500,
@@ -223,20 +467,230 @@ async def create_thread(db: Session = Depends(get_db)) -> Dict[str, Any]:
 
 
 
+@app.get("/threads/{thread_id}/title")
+async def get_thread_title(
+    thread_id: str,
+    wait: float = Query(0, ge=0, le=60, description="Seconds to wait for a pending title to be generated"),
+    db: AsyncSession = Depends(get_async_db)
+) -> Dict[str, Any]:
+    """
+    Retrieve the current title of a thread.
+    
+    Titles for new threads are generated in the background. Pass wait > 0 to
+    long-poll until the pending title job finishes (or the wait expires), so the
+    sidebar can be updated as soon as the title is ready.
+    """
+    try:
+        if wait:
+            await title_queue.wait(thread_id, wait)
+        
+        thread_title = await db.scalar(select(ThreadTitle).where(ThreadTitle.thread_id == thread_id))
+        if not thread_title:
+            raise HTTPException(
+                status_code=404,
+                detail={
+                    "error": "Thread not found",
+                    "thread_id": thread_id
+                }
+            )
+        
+        return {
+            "thread_id": thread_id,
+            "title": thread_title.title,
+            "pending": title_queue.is_pending(thread_id)
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to retrieve title for thread {thread_id}: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "error": "Failed to retrieve thread title",
+                "thread_id": thread_id,
+                "message": str(e)
+            }
+        )
+
+
+@app.get("/threads/{thread_id}/export")
+async def export_thread(
+    thread_id: str,
+    format: str = Query("ndjson", pattern="^(ndjson|json)$", description="ndjson (one edit per line) or json"),
+    db: AsyncSession = Depends(get_async_db)
+) -> StreamingResponse:
+    """
+    Stream a full export of a thread.
+    
+    Edits are read from a server-side cursor EXPORT_BATCH_SIZE rows at a time
+    and encoded as they arrive, so memory stays flat and the first bytes are
+    sent before the query finishes, however long the thread is.
+    
+    ndjson emits a {"type": "thread"} line, one {"type": "edit"} line per edit
+    (grouped by message, in order) and a closing {"type": "end"} line with totals.
+    json emits the same shape as GET /conversations/{thread_id}.
+    """
+    thread = (await db.execute(
+        select(Thread.started_at, ThreadTitle.title)
+        .outerjoin(ThreadTitle, ThreadTitle.thread_id == Thread.thread_id)
+        .where(Thread.thread_id == thread_id)
+    )).first()
+    if thread is None:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "error": "Thread not found",
+                "thread_id": thread_id
+            }
+        )
+    
+    header = {
+        "thread_id": thread_id,
+        "title": thread.title if thread.title else f"Thread {thread_id[:8]}...",
+        "started_at": thread.started_at.isoformat()
+    }
+    query = (
+        select(
+            Conversation.message_id,
+            Conversation.edit_id,
+            Conversation.question,
+            Conversation.answer,
+            Conversation.created_at,
+            Conversation.model,
+            Conversation.time_took,
+        )
+        .where(Conversation.thread_id == thread_id)
+        .order_by(
+            func.min(Conversation.created_at).over(partition_by=Conversation.message_id),
+            Conversation.message_id,
+            Conversation.created_at,
+            Conversation.edit_id,
+        )
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    
+    async def generate_export() -> AsyncIterator[bytes]:
+        if format == "ndjson":
+            yield dumps({"type": "thread", **header}) + b"\n"
+        else:
+            yield dumps(header)[:-1] + b',"messages":['
+        
+        messages = 0
+        edits = 0
+        current_message = None
+        try:
+            # A separate session: the request's session is not meant to outlive the handler
+            async with AsyncSessionLocal() as export_db:
+                result = await export_db.stream(query)
+                async for batch in result.partitions():
+                    lines = []
+                    for row in batch:
+                        edit = {
+                            "edit_id": row.edit_id,
+                            "question": row.question,
+                            "answer": row.answer,
+                            "created_at": row.created_at.isoformat(),
+                            "model": row.model,
+                            "time_took": row.time_took
+                        }
+                        new_message = row.message_id != current_message
+                        if new_message:
+                            messages += 1
+                        if format == "ndjson":
+                            lines.append(dumps({"type": "edit", "message_id": row.message_id, **edit}) + b"\n")
+                        elif new_message:
+                            opening = b"]}," if current_message is not None else b""
+                            lines.append(opening + b'{"message_id":' + dumps(row.message_id) + b',"edits":[' + dumps(edit))
+                        else:
+                            lines.append(b"," + dumps(edit))
+                        current_message = row.message_id
+                        edits += 1
+                    yield b"".join(lines)
+        except Exception as e:
+            # Headers are already sent; end the body with an error marker instead of a 500
+            logger.error(f"Export of thread {thread_id} failed after {edits} edits: {e}")
+            if format == "ndjson":
+                yield dumps({"type": "error", "message": str(e)}) + b"\n"
+            return
+        
+        totals = {"total_messages": messages, "total_edits": edits}
+        if format == "ndjson":
+            yield dumps({"type": "end", **totals}) + b"\n"
+        else:
+            closing = b"]}" if current_message is not None else b""
+            yield closing + b"]," + dumps(totals)[1:]
+        logger.info(f"Exported thread {thread_id}: {messages} messages, {edits} edits")
+    
+    extension = "ndjson" if format == "ndjson" else "json"
+    return StreamingResponse(
+        generate_export(),
+        media_type="application/x-ndjson" if format == "ndjson" else "application/json",
+        headers={"Content-Disposition": f'attachment; filename="thread-{thread_id}.{extension}"'}
+    )
+
+
 @app.get("/conversations/{thread_id}")
-async def get_conversation_history(thread_id: str, db: Session = Depends(get_db)) -> Dict[str, Any]:
+async def get_conversation_history(
+    thread_id: str,
+    offset: int = Query(0, ge=0, description="Messages to skip, oldest first"),
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Maximum number of messages to return"),
+    db: AsyncSession = Depends(get_async_db)
+) -> Dict[str, Any]:
     """
     Retrieve full conversation history for a specific thread.
     
     Returns messages with all edits in chronological order, grouped by message_id.
     Each message includes all its edits with metadata for frontend consumption.
     
+    The thread, its title and its edits come from a single query that orders
+    edits by (message start, message_id, created_at), so they are grouped in one
+    pass without re-sorting. offset and limit page through the messages of very
+    long threads; without them every message is returned.
+    
     Requirements: 2.1, 2.2, 2.3, 2.4
     """
     try:
-        # First verify the thread exists
-        thread = db.query(Thread).filter(Thread.thread_id == thread_id).first()
-        if not thread:
+        # Edits of the thread, each tagged with when its message started
+        edits = (
+            select(
+                Conversation.message_id,
+                Conversation.edit_id,
+                Conversation.question,
+                Conversation.answer,
+                Conversation.created_at,
+                Conversation.model,
+                Conversation.time_took,
+                func.min(Conversation.created_at).over(partition_by=Conversation.message_id).label("message_started_at"),
+            )
+            .where(Conversation.thread_id == thread_id)
+            .subquery()
+        )
+        message_order = (edits.c.message_started_at, edits.c.message_id)
+        numbered = select(
+            edits,
+            func.dense_rank().over(order_by=message_order).label("message_number"),
+            # Ascending + descending rank - 1 is the number of messages in the thread
+            func.dense_rank().over(order_by=[column.desc() for column in message_order]).label("message_number_desc"),
+            func.count().over().label("total_edits"),
+        ).subquery()
+        
+        page = numbered.c.message_number > offset
+        if limit is not None:
+            page = and_(page, numbered.c.message_number <= offset + limit)
+        
+        # Left joins keep the thread row when it has no title or no edits in the page
+        query = (
+            select(Thread.started_at, ThreadTitle.title, numbered)
+            .select_from(Thread)
+            .outerjoin(ThreadTitle, ThreadTitle.thread_id == Thread.thread_id)
+            .outerjoin(numbered, page)
+            .where(Thread.thread_id == thread_id)
+            .order_by(numbered.c.message_number, numbered.c.created_at, numbered.c.edit_id)
+        )
+        rows = (await db.execute(query)).all()
+        
+        if not rows:
             raise HTTPException(
                 status_code=404,
                 detail={
@@ -245,59 +699,51 @@ async def get_conversation_history(thread_id: str, db: Session = Depends(get_db)
                 }
             )
         
-        # Query all conversations for this thread, ordered by creation time
-        conversations = (
-            db.query(Conversation)
-            .filter(Conversation.thread_id == thread_id)
-            .order_by(Conversation.created_at.asc())
-            .all()
-        )
+        # Rows arrive grouped by message and in edit order, so grouping is a single pass
+        messages = []
+        current = None
+        for row in rows:
+            if row.message_id is None:
+                continue
+            if current is None or current["message_id"] != row.message_id:
+                current = {"message_id": row.message_id, "edits": []}
+                messages.append(current)
+            current["edits"].append({
+                "edit_id": row.edit_id,
+                "question": row.question,
+                "answer": row.answer,
+                "created_at": row.created_at.isoformat(),
+                "model": row.model,
+                "time_took": row.time_took
+            })
         
-        # Group conversations by message_id and organize edits
-        messages_dict = {}
-        for conv in conversations:
-            message_id = conv.message_id
-            
-            if message_id not in messages_dict:
-                messages_dict[message_id] = {
-                    "message_id": message_id,
-                    "edits": []
-                }
-            
-            # Add this edit to the message
-            edit_data = {
-                "edit_id": conv.edit_id,
-                "question": conv.question,
-                "answer": conv.answer,
-                "created_at": conv.created_at.isoformat(),
-                "model": conv.model,
-                "time_took": conv.time_took
-            }
-            messages_dict[message_id]["edits"].append(edit_data)
-        
-        # Convert to list and sort messages by the earliest edit timestamp
-        messages = list(messages_dict.values())
-        for message in messages:
-            # Sort edits within each message by creation time
-            message["edits"].sort(key=lambda x: x["created_at"])
-        
-        # Sort messages by the timestamp of their first edit
-        messages.sort(key=lambda x: x["edits"][0]["created_at"] if x["edits"] else "")
-        
-        # Get thread title for context
-        thread_title = db.query(ThreadTitle).filter(ThreadTitle.thread_id == thread_id).first()
+        first = rows[0]
+        if first.message_id is not None:
+            total_messages = first.message_number + first.message_number_desc - 1
+            total_edits = first.total_edits
+        elif offset == 0:
+            total_messages = total_edits = 0
+        else:
+            # The page is past the last message; count separately
+            total_messages, total_edits = (await db.execute(
+                select(func.count(func.distinct(Conversation.message_id)), func.count())
+                .where(Conversation.thread_id == thread_id)
+            )).one()
         
         response = {
             "thread_id": thread_id,
-            "title": thread_title.title if thread_title else f"Thread {thread_id[:8]}...",
-            "started_at": thread.started_at.isoformat(),
+            "title": first.title if first.title else f"Thread {thread_id[:8]}...",
+            "started_at": first.started_at.isoformat(),
             "messages": messages,
-            "total_messages": len(messages),
-            "total_edits": len(conversations)
+            "total_messages": total_messages,
+            "total_edits": total_edits,
+            "offset": offset,
+            "has_more": offset + len(messages) < total_messages
         }
         
-        logger.info(f"Retrieved conversation history for thread {thread_id}: {len(messages)} messages, {len(conversations)} total edits")
-        return response
+        logger.info(f"Retrieved conversation history for thread {thread_id}: {len(messages)} of {total_messages} messages, {total_edits} total edits")
+        # Already JSON-ready; render directly instead of through FastAPI's encoder pass
+        return FastJSONResponse(response)
         
     except HTTPException:
         # Re-raise HTTP exceptions (like 404)
@@ -315,7 +761,7 @@ async def get_conversation_history(thread_id: str, db: Session = Depends(get_db)
 
 
 @app.get("/conversations/{thread_id}/{message_id}")
-async def get_message_edits(thread_id: str, message_id: str, db: Session = Depends(get_db)) -> Dict[str, Any]:
+async def get_message_edits(thread_id: str, message_id: str, db: AsyncSession = Depends(get_async_db)) -> Dict[str, Any]:
     """
     Retrieve all edits for a specific message within a thread.
     
@@ -326,7 +772,7 @@ async def get_message_edits(thread_id: str, message_id: str, db: Session = Depen
     """
     try:
         # First verify the thread exists
-        thread = db.query(Thread).filter(Thread.thread_id == thread_id).first()
+        thread = await db.scalar(select(Thread).where(Thread.thread_id == thread_id))
         if not thread:
             raise HTTPException(
                 status_code=404,
@@ -338,14 +784,15 @@ async def get_message_edits(thread_id: str, message_id: str, db: Session = Depen
         
         # Query all edits for this specific message, ordered by creation time
         edits = (
-            db.query(Conversation)
-            .filter(
-                Conversation.thread_id == thread_id,
-                Conversation.message_id == message_id
+            await db.scalars(
+                select(Conversation)
+                .where(
+                    Conversation.thread_id == thread_id,
+                    Conversation.message_id == message_id
+                )
+                .order_by(Conversation.created_at.asc())
             )
-            .order_by(Conversation.created_at.asc())
-            .all()
-        )
+        ).all()
         
         if not edits:
             raise HTTPException(
@@ -373,7 +820,7 @@ async def get_message_edits(thread_id: str, message_id: str, db: Session = Depen
             formatted_edits.append(edit_data)
         
         # Get thread title for context
-        thread_title = db.query(ThreadTitle).filter(ThreadTitle.thread_id == thread_id).first()
+        thread_title = await db.scalar(select(ThreadTitle).where(ThreadTitle.thread_id == thread_id))
         
         response = {
             "thread_id": thread_id,
@@ -386,7 +833,7 @@ async def get_message_edits(thread_id: str, message_id: str, db: Session = Depen
         }
         
         logger.info(f"Retrieved {len(formatted_edits)} edits for message {message_id} in thread {thread_id}")
-        return response
+        return FastJSONResponse(response)
         
     except HTTPException:
         # Re-raise HTTP exceptions (like 404)
@@ -408,7 +855,7 @@ async def get_message_edits(thread_id: str, message_id: str, db: Session = Depen
 async def create_message(
     thread_id: str,
     request: CreateMessageRequest, 
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Dict[str, Any]:
     """
     Create a new message in an existing conversation thread.
@@ -424,7 +871,7 @@ async def create_message(
         edit_id = str(uuid.uuid4())
         
         # Verify thread exists
-        thread = db.query(Thread).filter(Thread.thread_id == thread_id).first()
+        thread = await db.scalar(select(Thread).where(Thread.thread_id == thread_id))
         if not thread:
             raise HTTPException(
                 status_code=404,
@@ -438,13 +885,13 @@ async def create_message(
         logger.info(f"Creating message in existing thread {thread_id}")
         
         # Check if message_id already exists in this thread
-        existing_message = (
-            db.query(Conversation)
-            .filter(
+        existing_message = await db.scalar(
+            select(Conversation)
+            .where(
                 Conversation.thread_id == thread_id,
                 Conversation.message_id == message_id
             )
-            .first()
+            .limit(1)
         )
         
         if existing_message:
@@ -467,75 +914,20 @@ async def create_message(
             answer=request.answer,
             model=request.model,
             time_took=request.time_took,
-            created_at=datetime.utcnow()
+            created_at=datetime.utcnow(),
+            **trace_timings(request.trace_id, request.model)
         )
         
         db.add(conversation)
-        db.commit()
-        db.refresh(conversation)
+        await db.commit()
+        await db.refresh(conversation)
         
-        # Generate and update thread title automatically if this is the first message
-        # Use a separate database session to avoid affecting the main transaction
+        # Queue title generation for the first message; the title is written to
+        # ThreadTitle by a background worker so this request doesn't wait on the LLM
+        title_status = None
         if request.firstMessage:
-            from database import get_db_session
-            title_db = None
-            
-            try:
-                title_db = get_db_session()
-                
-                # Load the model for title generation
-                rag_instance.load_model(request.model)
-                
-                # Generate title using the question
-                title_chunks = []
-                async for chunk in rag_instance.generate_question(request.question):
-                    title_chunks.append(chunk)
-                
-                # Combine chunks and clean up the title
-                generated_title = "".join(title_chunks).strip()
-                
-                # Clean up the title extensively
-                # Remove thinking tags and content
-                if "<think>" in generated_title:
-                    # Extract content after </think> tag
-                    parts = generated_title.split("</think>")
-                    if len(parts) > 1:
-                        generated_title = parts[-1].strip()
-                    else:
-                        generated_title = generated_title.replace("<think>", "").strip()
-                
-                # Remove any remaining XML-like tags
-                import re
-                generated_title = re.sub(r'<[^>]+>', '', generated_title)
-                
-                # Remove quotes and extra whitespace
-                generated_title = generated_title.replace('"', '').replace("'", "").strip()
-                
-                # Limit to reasonable title length (much less than 500 chars)
-                if len(generated_title) > 100:
-                    generated_title = generated_title[:97] + "..."
-                
-                # Fallback to default if generation failed or is empty
-                if not generated_title or len(generated_title.strip()) == 0:
-                    generated_title = f"Conversation {thread_id[:8]}"
-                
-                # Update the thread title using separate session
-                thread_title = title_db.query(ThreadTitle).filter(ThreadTitle.thread_id == thread_id).first()
-                if thread_title:
-                    thread_title.title = generated_title
-                    title_db.commit()
-                    logger.info(f"Generated and updated title for thread {thread_id}: {generated_title}")
-                else:
-                    logger.warning(f"Thread title not found for thread {thread_id}")
-                
-            except Exception as e:
-                # Don't fail the message creation if title generation fails
-                logger.error(f"Failed to generate title for thread {thread_id}: {e}")
-                if title_db:
-                    title_db.rollback()
-            finally:
-                if title_db:
-                    title_db.close()
+            title_queue.enqueue(thread_id, request.question, request.model)
+            title_status = "pending"
         
         # Format response
         response = {
@@ -546,6 +938,7 @@ async def create_message(
             "answer": conversation.answer,
             "model": conversation.model,
             "created_at": conversation.created_at.isoformat(),
+            "title_status": title_status,
             "status": "created"
         }
         
@@ -554,10 +947,10 @@ async def create_message(
         
     except HTTPException:
         # Re-raise HTTP exceptions
-        db.rollback()
+        await db.rollback()
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Failed to create message in thread {thread_id}: {e}")
         raise HTTPException(
             status_code=500,
@@ -573,7 +966,7 @@ async def create_message(
 async def create_message_edit(
     message_id: str,
     request: CreateEditRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Dict[str, Any]:
     """
     Create a new edit for an existing message.
@@ -586,11 +979,12 @@ async def create_message_edit(
     try:
         # Find the existing message to get thread_id
         existing_edits = (
-            db.query(Conversation)
-            .filter(Conversation.message_id == message_id)
-            .order_by(Conversation.created_at.desc())
-            .all()
-        )
+            await db.scalars(
+                select(Conversation)
+                .where(Conversation.message_id == message_id)
+                .order_by(Conversation.created_at.desc())
+            )
+        ).all()
         
         if not existing_edits:
             raise HTTPException(
@@ -620,12 +1014,13 @@ async def create_message_edit(
             answer=request.answer,
             model=request.model,
             time_took=request.time_took,
-            created_at=datetime.utcnow()
+            created_at=datetime.utcnow(),
+            **trace_timings(request.trace_id, request.model)
         )
         
         db.add(new_edit)
-        db.commit()
-        db.refresh(new_edit)
+        await db.commit()
+        await db.refresh(new_edit)
         
         # Get total edit count for this message
         total_edits = len(existing_edits) + 1
@@ -649,10 +1044,10 @@ async def create_message_edit(
         
     except HTTPException:
         # Re-raise HTTP exceptions
-        db.rollback()
+        await db.rollback()
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Failed to create edit for message {message_id}: {e}")
         raise HTTPException(
             status_code=500,
@@ -670,24 +1065,38 @@ async def llm_call(request: LLMRequest) -> StreamingResponse:
     Generate LLM response for a given question using the specified model.
     
     This endpoint uses the RAG system to generate responses without document context.
-    Returns a streaming response for real-time UI updates.
+    Returns a streaming response for real-time UI updates. The first token is
+    sent immediately; later tokens are coalesced into frames of up to
+    STREAM_FLUSH_BYTES or STREAM_FLUSH_MS, whichever comes first.
+    
+    The request is traced (time to first token, tokens/sec, bytes streamed)
+    into /metrics; its trace id is returned in the X-Trace-Id header.
     
     Requirements: 1.1, 1.3, 6.1, 6.2
     """
     try:
-        # Load the specified model
+        # Fetch the pooled client for the specified model
         rag_instance.load_model(request.model)
-        logger.info(f"Loaded model {request.model} for LLM call")
+        logger.info(f"Using model {request.model} for LLM call")
+        trace = RequestTrace("/llm_call", request.model)
         
-        async def generate_response() -> AsyncIterator[str]:
+        async def generate_response() -> AsyncIterator[bytes]:
             """Generate streaming response chunks."""
             try:
-                async for chunk in rag_instance.answer(request.question):
+                async for chunk in coalesce(trace.stream(rag_instance.answer(request.question, request.model))):
                     # Format each chunk as JSON for consistent frontend parsing
-                    yield f"data: {json.dumps({'content': chunk})}\n\n"
+                    yield trace.sent(CONTENT_FRAME(chunk))
+                trace.prompt_tokens = count_tokens(request.question, request.model)
+            except (GeneratorExit, asyncio.CancelledError):
+                # The client went away mid-stream
+                trace.status = "cancelled"
+                raise
             except Exception as e:
                 logger.error(f"Error during response generation: {e}")
-                yield f"data: {json.dumps({'error': str(e)})}\n\n"
+                trace.status = "error"
+                yield trace.sent(sse_event({"error": str(e)}))
+            finally:
+                trace.finish()
         
         return StreamingResponse(
             generate_response(),
@@ -695,6 +1104,7 @@ async def llm_call(request: LLMRequest) -> StreamingResponse:
             headers={
                 "Cache-Control": "no-cache",
                 "Connection": "keep-alive",
+                "X-Trace-Id": trace.trace_id,
             }
         )
         
@@ -714,7 +1124,10 @@ async def rag_call(
     question: str = Form(...),
     model: str = Form(...),
     pdf_file: Optional[UploadFile] = File(None),
-    pdf_path: Optional[str] = Form(None)
+    pdf_path: Optional[str] = Form(None),
+    prompt: str = Form(DEFAULT_PROMPT),
+    thread_id: Optional[str] = Form(None),
+    document_ids: Optional[str] = Form(None)
 ) -> StreamingResponse:
     """
     Generate RAG-enhanced response for a given question using document context.
@@ -726,12 +1139,42 @@ async def rag_call(
     If pdf_path is provided, the PDF will be ingested into the vector database
     before processing the question, allowing for immediate context-aware responses.
     
+    prompt selects a QA prompt template registered with rag_instance.chains.
+    
+    Retrieval is scoped when thread_id and/or document_ids (comma-separated
+    document ids or source names) are given: only the listed documents, the
+    documents attached to the thread and the PDF uploaded with this request
+    are searched. A PDF uploaded with a thread_id is attached to that thread.
+    Without either, every ingested document is searched.
+    
     Requirements: 1.3, 4.1, 4.2, 4.3
     """
+    if prompt not in rag_instance.chains.prompts():
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "error": "Unknown prompt template",
+                "prompt": prompt,
+                "available": rag_instance.chains.prompts()
+            }
+        )
+    
+    requested_documents = [doc_id.strip() for doc_id in (document_ids or "").split(",") if doc_id.strip()]
+    unknown_documents = [doc_id for doc_id in requested_documents
+                         if rag_instance.registry.find_source(doc_id, thread_id) is None]
+    if unknown_documents:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "error": "Unknown documents",
+                "document_ids": unknown_documents
+            }
+        )
+    
     try:
-        # Load the specified model
+        # Fetch the pooled client for the specified model
         rag_instance.load_model(model)
-        logger.info(f"Loaded model {model} for RAG call")
+        logger.info(f"Using model {model} for RAG call")
         
         # Handle PDF ingestion - either from uploaded file or existing path
         if pdf_file:
@@ -739,16 +1182,13 @@ async def rag_call(
             try:
                 logger.info(f"Processing uploaded PDF file: {pdf_file.filename}")
                 
-                # Create a temporary file to store the uploaded PDF
-                with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as temp_file:
-                    # Read and write the uploaded file content
-                    content = await pdf_file.read()
-                    temp_file.write(content)
-                    temp_file_path = temp_file.name
+                # Spool the uploaded PDF to a temporary file without holding it in memory
+                temp_file_path = await spool_upload(pdf_file)
                 
-                # Ingest the PDF from the temporary file
-                rag_instance.ingest_pdf(temp_file_path)
-                logger.info(f"Successfully ingested uploaded PDF: {pdf_file.filename}")
+                # Ingest the PDF from the temporary file, keyed by its original filename within the thread
+                stats = await rag_instance.aingest_pdf(temp_file_path, source=pdf_file.filename, thread_id=thread_id)
+                requested_documents.append(stats["document_id"])
+                logger.info(f"Successfully ingested uploaded PDF: {pdf_file.filename} ({stats})")
                 
                 # Clean up the temporary file
                 os.unlink(temp_file_path)
@@ -773,8 +1213,9 @@ async def rag_call(
             # Handle PDF from existing file path
             try:
                 logger.info(f"Ingesting PDF from path: {pdf_path}")
-                rag_instance.ingest_pdf(pdf_path)
-                logger.info(f"Successfully ingested PDF: {pdf_path}")
+                stats = await rag_instance.aingest_pdf(pdf_path, source=pdf_path, thread_id=thread_id)
+                requested_documents.append(stats["document_id"])
+                logger.info(f"Successfully ingested PDF: {pdf_path} ({stats})")
             except Exception as e:
                 logger.error(f"Failed to ingest PDF {pdf_path}: {e}")
                 raise HTTPException(
@@ -786,29 +1227,54 @@ async def rag_call(
                     }
                 )
         
-        async def generate_response() -> AsyncIterator[str]:
+        # Without a warm start, open the persisted collection on first use
+        if rag_instance.vectorstore is None and len(rag_instance.registry):
+            await open_persisted_documents()
+        
+        # Chunk ids to search, or None for the whole collection
+        scope = None
+        if thread_id or document_ids:
+            scope = rag_instance.resolve_scope(requested_documents, thread_id)
+            logger.info(f"RAG retrieval scoped to {len(scope)} chunks (thread={thread_id}, documents={requested_documents})")
+        
+        trace = RequestTrace("/rag/", model)
+        
+        async def generate_response() -> AsyncIterator[bytes]:
             """Generate streaming RAG response chunks."""
             try:
                 # Check if vectorstore is available and has documents
                 if rag_instance.vectorstore is None or rag_instance.retriever is None:
                     logger.info("No documents available in ChromaDB, falling back to regular LLM response")
                     # Fall back to regular LLM response when no documents are available
-                    async for chunk in rag_instance.answer(question):
-                        yield f"data: {json.dumps({'content': chunk, 'context_used': False})}\n\n"
+                    async for chunk in coalesce(trace.stream(rag_instance.answer(question, model))):
+                        yield trace.sent(FALLBACK_CONTENT_FRAME(chunk))
+                    trace.prompt_tokens = count_tokens(question, model)
                 else:
                     # Use RAG context-aware response
                     logger.info("Using RAG context-aware response with document context")
-                    async for chunk in rag_instance.context_answer(question):
-                        yield f"data: {json.dumps({'content': chunk, 'context_used': True})}\n\n"
+                    context_stats = {}
+                    async for chunk in coalesce(trace.stream(rag_instance.context_answer(question, model, prompt, stats=context_stats, scope=scope))):
+                        yield trace.sent(CONTEXT_CONTENT_FRAME(chunk))
+                    trace.prompt_tokens = context_stats.get("prompt_tokens")
+                    # Report context packing (tokens sent, prefill latency) once the answer is done
+                    yield trace.sent(sse_event({"context_stats": context_stats, "context_used": True}))
                         
             except RuntimeError as e:
                 # Handle specific RAG errors (no documents, model not loaded)
                 logger.warning(f"RAG error, falling back to regular response: {e}")
-                async for chunk in rag_instance.answer(question):
-                    yield f"data: {json.dumps({'content': chunk, 'context_used': False})}\n\n"
+                async for chunk in coalesce(trace.stream(rag_instance.answer(question, model))):
+                    yield trace.sent(FALLBACK_CONTENT_FRAME(chunk))
+                trace.prompt_tokens = count_tokens(question, model)
+            except (GeneratorExit, asyncio.CancelledError):
+                # The client went away mid-stream
+                trace.status = "cancelled"
+                raise
             except Exception as e:
                 logger.error(f"Error during RAG response generation: {e}")
-                yield f"data: {json.dumps({'error': str(e)})}\n\n"
+                trace.status = "error"
+                yield trace.sent(sse_event({"error": str(e)}))
+            finally:
+                trace.finish()
         
         return StreamingResponse(
             generate_response(),
@@ -816,6 +1282,7 @@ async def rag_call(
             headers={
                 "Cache-Control": "no-cache",
                 "Connection": "keep-alive",
+                "X-Trace-Id": trace.trace_id,
             }
         )
         
@@ -830,6 +1297,123 @@ async def rag_call(
         )
 
 
+@app.post("/documents")
+async def create_document(
+    pdf_file: UploadFile = File(...),
+    thread_id: Optional[str] = Form(None)
+) -> Dict[str, Any]:
+    """
+    Upload a PDF and ingest it in the background.
+    
+    With a thread_id the document is attached to that thread, so /rag/ calls
+    scoped to the thread search it. The completed job's result carries the
+    document_id to pass in /rag/'s document_ids.
+    
+    Returns a job id right away. Progress is available from
+    GET /documents/{job_id} and as a server-sent event stream from
+    GET /documents/{job_id}/events. Chunks are searchable by /rag/ as soon
+    as each embedding batch is written, and by /rag/ calls scoped to the
+    thread once their window is indexed.
+    """
+    if not pdf_file.filename or not pdf_file.filename.lower().endswith(".pdf"):
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "error": "Only PDF files are supported",
+                "filename": pdf_file.filename
+            }
+        )
+    
+    try:
+        temp_file_path = await spool_upload(pdf_file)
+        
+        job = ingest_jobs.submit(temp_file_path, source=pdf_file.filename, thread_id=thread_id)
+        logger.info(f"Started ingestion job {job.job_id} for {pdf_file.filename}")
+        return job.to_dict()
+        
+    except Exception as e:
+        logger.error(f"Failed to start ingestion for {pdf_file.filename}: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "error": "Failed to start document ingestion",
+                "filename": pdf_file.filename,
+                "message": str(e)
+            }
+        )
+
+
+def get_ingest_job(job_id: str):
+    """Look up an ingestion job or raise 404."""
+    job = ingest_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "error": "Ingestion job not found",
+                "job_id": job_id
+            }
+        )
+    return job
+
+
+@app.get("/documents/{job_id}")
+async def get_document_job(job_id: str) -> Dict[str, Any]:
+    """
+    Retrieve the progress of an ingestion job.
+    
+    Reports pages parsed, chunks embedded and vectors written so far.
+    """
+    return get_ingest_job(job_id).to_dict()
+
+
+@app.get("/documents/{job_id}/events")
+async def stream_document_job(job_id: str) -> StreamingResponse:
+    """
+    Stream ingestion progress as server-sent events.
+    
+    Emits the job state on every change and closes once the job completes or fails.
+    """
+    job = get_ingest_job(job_id)
+    
+    async def generate_events() -> AsyncIterator[bytes]:
+        async for state in job.events():
+            yield sse_event(state)
+    
+    return StreamingResponse(
+        generate_events(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+        }
+    )
+
+
+@app.get("/rag/embedding_cache")
+async def get_embedding_cache_stats() -> Dict[str, Any]:
+    """
+    Report embedding cache hit/miss counters.
+    
+    Shows how many chunk and query embeddings were served from the
+    persistent cache instead of being recomputed by the embedding model.
+    """
+    if rag_instance.embedding_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **rag_instance.embedding_cache.stats()}
+
+
+@app.get("/rag/answer_cache")
+async def get_answer_cache_stats() -> Dict[str, Any]:
+    """
+    Report answer cache hit/miss counters.
+    
+    Hits are answers replayed without calling the model; semantic hits are
+    the subset matched by question embedding similarity.
+    """
+    return rag_instance.answer_cache.stats()
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
@@ -0,0 +1,327 @@
+import os
+import time
+import uuid
+import logging
+import threading
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Finished traces kept until the client saves the message they produced (see pop_trace)
+TRACE_RETENTION = int(os.getenv("TRACE_RETENTION", "1000"))
+# Distinct model label values; models past the limit are counted under "other"
+MAX_MODEL_LABELS = int(os.getenv("MAX_MODEL_LABELS", "20"))
+
+# Latency buckets in seconds, from cache hits to slow CPU generations
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+RATE_BUCKETS = (1, 2, 5, 10, 20, 30, 50, 75, 100, 150, 200, 500)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(zip(names, values))
+    if extra is not None:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"] + self._samples()
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonic counter per label set."""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: str):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+                    for key, value in sorted(self._values.items())]
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram per label set, as Prometheus expects."""
+
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # label key -> (per-bucket counts, sum, count)
+        self._values: Dict[Tuple[str, ...], List] = {}
+
+    def observe(self, value: float, **labels: str):
+        key = self._key(labels)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[0][i] += 1
+                    break
+            entry[1] += value
+            entry[2] += 1
+
+    def _samples(self) -> List[str]:
+        lines = []
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    labels = _format_labels(self.labelnames, key, ("le", _format_value(bound)))
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+                labels = _format_labels(self.labelnames, key)
+                lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+                lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named metrics rendered together in the Prometheus text exposition format."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def _register(self, metric: _Metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+REQUEST_SECONDS = registry.histogram(
+    "asyst_request_duration_seconds", "Total duration of streamed LLM/RAG requests", ("endpoint", "model", "status"))
+TIME_TO_FIRST_TOKEN = registry.histogram(
+    "asyst_time_to_first_token_seconds", "Time from request start to the first model token", ("endpoint", "model"))
+TOKENS_PER_SECOND = registry.histogram(
+    "asyst_tokens_per_second", "Generation rate after the first token", ("endpoint", "model"), RATE_BUCKETS)
+COMPLETION_TOKENS = registry.counter(
+    "asyst_completion_tokens_total", "Model output chunks streamed (about one token each)", ("endpoint", "model"))
+BYTES_STREAMED = registry.counter(
+    "asyst_stream_bytes_total", "Response bytes streamed to clients", ("endpoint", "model"))
+RESPONSE_BYTES = registry.histogram(
+    "asyst_stream_response_bytes", "Bytes streamed per response", ("endpoint", "model"), SIZE_BUCKETS)
+RAG_STAGE_SECONDS = registry.histogram(
+    "asyst_rag_stage_seconds", "RAG stage latency (embed, search, lexical, retrieve, prefill)", ("stage",))
+MODEL_LOAD_SECONDS = registry.histogram(
+    "asyst_model_load_seconds", "LLM client creation and warm-up time", ("model", "phase"))
+DB_QUERY_SECONDS = registry.histogram(
+    "asyst_db_query_seconds", "Database statement execution time", ("operation",))
+
+# Trace of the request being served by the current task, if any
+current_trace: ContextVar[Optional["RequestTrace"]] = ContextVar("current_trace", default=None)
+
+_finished_traces: "OrderedDict[str, RequestTrace]" = OrderedDict()
+_finished_lock = threading.Lock()
+
+
+_model_labels: Set[str] = set()
+_model_labels_lock = threading.Lock()
+
+
+def allow_model_labels(models: Iterable[str]):
+    """Give models their own label whatever the limit (e.g. the warm-started ones)."""
+    with _model_labels_lock:
+        _model_labels.update(models)
+
+
+def model_label(model: str, register: bool = True) -> str:
+    """
+    Label value for a model name taken from a request. New names get their own
+    label (if register and MAX_MODEL_LABELS isn't reached), anything else is
+    "other", so arbitrary model strings can't grow the metrics without bound.
+    """
+    with _model_labels_lock:
+        if model in _model_labels:
+            return model
+        if register and len(_model_labels) < MAX_MODEL_LABELS:
+            _model_labels.add(model)
+            return model
+    return "other"
+
+
+def pop_trace(trace_id: str) -> Optional["RequestTrace"]:
+    """Take a finished trace by id; each trace can be claimed by one saved message."""
+    with _finished_lock:
+        return _finished_traces.pop(trace_id, None)
+
+
+class RequestTrace:
+    """
+    Timings of one streamed LLM/RAG request.
+
+    Wrap the model's chunk stream with stream() and every frame sent with
+    sent(); finish() records the metrics, logs a one-line trace and keeps the
+    trace for pop_trace. While the trace is active, RAG stage timings (see
+    record_stage) are added to it. prompt_tokens is set by the endpoint.
+    """
+
+    def __init__(self, endpoint: str, model: str):
+        self.trace_id = uuid.uuid4().hex
+        self.endpoint = endpoint
+        self.model = model
+        self.status = "ok"
+        self.start = time.perf_counter()
+        self.first_token_at: Optional[float] = None
+        self.last_token_at: Optional[float] = None
+        self.tokens = 0
+        self.prompt_tokens: Optional[int] = None
+        self.bytes = 0
+        self.stages: Dict[str, float] = {}
+        self.duration: Optional[float] = None
+        current_trace.set(self)
+
+    async def stream(self, chunks: AsyncIterator[str]) -> AsyncIterator[str]:
+        """Pass model chunks through, timing the first one and counting them."""
+        async for chunk in chunks:
+            now = time.perf_counter()
+            if self.first_token_at is None:
+                self.first_token_at = now
+            self.last_token_at = now
+            self.tokens += 1
+            yield chunk
+
+    def sent(self, frame: bytes) -> bytes:
+        self.bytes += len(frame)
+        return frame
+
+    def add_stage(self, stage: str, seconds: float):
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    @property
+    def ttft(self) -> Optional[float]:
+        return None if self.first_token_at is None else self.first_token_at - self.start
+
+    @property
+    def tokens_per_second(self) -> Optional[float]:
+        if self.tokens < 2 or self.last_token_at == self.first_token_at:
+            return None
+        return (self.tokens - 1) / (self.last_token_at - self.first_token_at)
+
+    def finish(self) -> Dict:
+        if self.duration is not None:
+            return self.to_dict()
+        self.duration = time.perf_counter() - self.start
+        # Only models that streamed successfully claim a label of their own
+        model = model_label(self.model, register=self.status == "ok")
+        REQUEST_SECONDS.observe(self.duration, endpoint=self.endpoint, model=model, status=self.status)
+        if self.ttft is not None:
+            TIME_TO_FIRST_TOKEN.observe(self.ttft, endpoint=self.endpoint, model=model)
+        if self.tokens_per_second is not None:
+            TOKENS_PER_SECOND.observe(self.tokens_per_second, endpoint=self.endpoint, model=model)
+        COMPLETION_TOKENS.inc(self.tokens, endpoint=self.endpoint, model=model)
+        BYTES_STREAMED.inc(self.bytes, endpoint=self.endpoint, model=model)
+        RESPONSE_BYTES.observe(self.bytes, endpoint=self.endpoint, model=model)
+        with _finished_lock:
+            _finished_traces[self.trace_id] = self
+            while len(_finished_traces) > TRACE_RETENTION:
+                _finished_traces.popitem(last=False)
+        trace = self.to_dict()
+        logger.info(f"Trace {trace}")
+        return trace
+
+    def to_dict(self) -> Dict:
+        def ms(seconds: Optional[float]):
+            return None if seconds is None else round(seconds * 1000, 2)
+
+        return {
+            "trace_id": self.trace_id,
+            "endpoint": self.endpoint,
+            "model": self.model,
+            "status": self.status,
+            "ttft_ms": ms(self.ttft),
+            "duration_ms": ms(self.duration),
+            "tokens": self.tokens,
+            "prompt_tokens": self.prompt_tokens,
+            "tokens_per_second": None if self.tokens_per_second is None else round(self.tokens_per_second, 2),
+            "bytes": self.bytes,
+            "stages_ms": {stage: ms(seconds) for stage, seconds in self.stages.items()},
+        }
+
+
+def record_stage(stage: str, seconds: float):
+    """RAG timing hook: observe the stage and add it to the active request trace."""
+    RAG_STAGE_SECONDS.observe(seconds, stage=stage)
+    trace = current_trace.get()
+    if trace is not None:
+        trace.add_stage(stage, seconds)
+
+
+def record_model_load(model: str, phase: str, seconds: float):
+    """ModelPool load hook."""
+    MODEL_LOAD_SECONDS.observe(seconds, model=model_label(model, register=False), phase=phase)
+
+
+def instrument_engine(engine):
+    """Time every statement run by a (sync) SQLAlchemy engine, by SQL verb."""
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("query_start")
+        if not starts:
+            return
+        seconds = time.perf_counter() - starts.pop()
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "UNKNOWN"
+        DB_QUERY_SECONDS.observe(seconds, operation=operation)
+        trace = current_trace.get()
+        if trace is not None:
+            trace.add_stage("db", seconds)
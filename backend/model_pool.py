@@ -0,0 +1,126 @@
+import os
+import time
+import asyncio
+import logging
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, AsyncIterator, Callable, Dict, Iterable, List
+
+# Imported with the first client so the API boots without loading the Ollama stack
+if TYPE_CHECKING:
+    from langchain_ollama import ChatOllama
+
+logger = logging.getLogger(__name__)
+
+# Pool configuration
+MODEL_POOL_SIZE = int(os.getenv("MODEL_POOL_SIZE", "4"))
+MODEL_MAX_CONCURRENCY = int(os.getenv("MODEL_MAX_CONCURRENCY", "8"))
+WARM_MODELS = [m.strip() for m in os.getenv("WARM_MODELS", "").split(",") if m.strip()]
+
+
+class ModelPool:
+    """
+    Keyed, bounded pool of ChatOllama clients.
+
+    Clients are created once per model name and reused across requests, with
+    least-recently-used eviction once more than max_size models are cached.
+    Each model also has a semaphore limiting how many generations run against
+    it at the same time; it is dropped once the model is evicted and no
+    request holds or waits on it, so arbitrary model names can't grow it.
+    """
+
+    def __init__(self, max_size: int = MODEL_POOL_SIZE, max_concurrency: int = MODEL_MAX_CONCURRENCY):
+        self.max_size = max_size
+        self.max_concurrency = max_concurrency
+        self._clients: "OrderedDict[str, ChatOllama]" = OrderedDict()
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        # Requests holding or waiting on each model's semaphore
+        self._active: Dict[str, int] = {}
+        # Called as hook(model_name, phase, seconds) for the "create" and "warm_up" phases
+        self.load_hooks: List[Callable[[str, str, float], None]] = []
+        # Called as hook(model_name) when a model's client is evicted
+        self.eviction_hooks: List[Callable[[str], None]] = []
+
+    def get(self, model_name: str) -> "ChatOllama":
+        """Return the client for model_name, creating it if needed."""
+        client = self._clients.get(model_name)
+        if client is not None:
+            self._clients.move_to_end(model_name)
+            return client
+
+        from langchain_ollama import ChatOllama
+
+        start = time.perf_counter()
+        client = ChatOllama(model=model_name, temperature=0)
+        self._clients[model_name] = client
+        self._record_load(model_name, "create", time.perf_counter() - start)
+        logger.info(f"Created LLM client for model {model_name}")
+
+        while len(self._clients) > self.max_size:
+            evicted, _ = self._clients.popitem(last=False)
+            self._drop_semaphore(evicted)
+            logger.info(f"Evicted LLM client for model {evicted}")
+            for hook in self.eviction_hooks:
+                try:
+                    hook(evicted)
+                except Exception as e:
+                    logger.warning(f"Eviction hook failed for model {evicted}: {e}")
+        return client
+
+    def _semaphore(self, model_name: str) -> asyncio.Semaphore:
+        semaphore = self._semaphores.get(model_name)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphores[model_name] = semaphore
+        return semaphore
+
+    def _drop_semaphore(self, model_name: str):
+        """Forget the model's semaphore unless a request holds or waits on it."""
+        if not self._active.get(model_name):
+            self._active.pop(model_name, None)
+            self._semaphores.pop(model_name, None)
+
+    @asynccontextmanager
+    async def acquire(self, model_name: str) -> AsyncIterator["ChatOllama"]:
+        """Hold one of the model's concurrency slots for the duration of a generation."""
+        semaphore = self._semaphore(model_name)
+        self._active[model_name] = self._active.get(model_name, 0) + 1
+        try:
+            async with semaphore:
+                yield self.get(model_name)
+        finally:
+            self._active[model_name] -= 1
+            if model_name not in self._clients:
+                self._drop_semaphore(model_name)
+
+    async def warm_up(self, model_names: Iterable[str], ping: bool = True):
+        """
+        Create clients ahead of the first request.
+        With ping, a one-token generation through the pooled client (holding one
+        of the model's slots) also loads the model into Ollama's memory.
+        """
+        for model_name in model_names:
+            if not ping:
+                self.get(model_name)
+                continue
+            try:
+                start = time.perf_counter()
+                async with self.acquire(model_name) as client:
+                    await client.ainvoke("hi", options={"num_predict": 1, "temperature": 0})
+                self._record_load(model_name, "warm_up", time.perf_counter() - start)
+                logger.info(f"Warmed up model {model_name}")
+            except Exception as e:
+                logger.warning(f"Failed to warm up model {model_name}: {e}")
+
+    def _record_load(self, model_name: str, phase: str, seconds: float):
+        for hook in self.load_hooks:
+            try:
+                hook(model_name, phase, seconds)
+            except Exception as e:
+                logger.warning(f"Load hook failed for model {model_name}: {e}")
+
+    def __contains__(self, model_name: str) -> bool:
+        return model_name in self._clients
+
+    def __len__(self) -> int:
+        return len(self._clients)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Index, Float
+from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Index, Float, Integer
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -17,9 +17,9 @@ class Thread(Base):
     title = relationship("ThreadTitle", back_populates="thread", uselist=False, cascade="all, delete-orphan")
     conversations = relationship("Conversation", back_populates="thread", cascade="all, delete-orphan")
     
-    # Index
+    # Index (keyset pagination of the thread list orders by started_at, thread_id)
     __table_args__ = (
-        Index('idx_threads_started_at', 'started_at'),
+        Index('idx_threads_started_at_thread_id', 'started_at', 'thread_id'),
     )
 
 
@@ -45,6 +45,14 @@ class Conversation(Base):
     model = Column(String(100), nullable=False)
     time_took = Column(Float, nullable=True)  # Time in seconds for answer generation
     
+    # Timings measured by the server while streaming the answer (seconds), linked via the request trace
+    trace_id = Column(String(64), nullable=True)
+    time_to_first_token = Column(Float, nullable=True)
+    generation_time = Column(Float, nullable=True)
+    retrieval_time = Column(Float, nullable=True)
+    prompt_tokens = Column(Integer, nullable=True)
+    completion_tokens = Column(Integer, nullable=True)
+    
     # Relationships
     thread = relationship("Thread", back_populates="conversations")
     
@@ -52,6 +60,14 @@ class Conversation(Base):
     __table_args__ = (
         Index('idx_conversations_thread_id', 'thread_id'),
         Index('idx_conversations_message_id', 'thread_id', 'message_id'),
-        Index('idx_conversations_created_at', 'created_at'),
-        Index('idx_conversations_model', 'model'),
+        # Latency percentiles over a time window read only these: per model, and for all models
+        Index(
+            'idx_conversations_model_created_at', 'model', 'created_at',
+            postgresql_include=['time_to_first_token', 'generation_time', 'retrieval_time', 'completion_tokens'],
+        ),
+        Index(
+            'idx_conversations_created_at_model', 'created_at',
+            postgresql_include=['model', 'time_to_first_token', 'generation_time', 'retrieval_time',
+                                'completion_tokens'],
+        ),
     )
\ No newline at end of file
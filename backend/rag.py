@@ -1,65 +1,511 @@
 import os
+import time
 import asyncio
-from langchain.document_loaders import PyPDFLoader
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_community.embeddings import OllamaEmbeddings
-from langchain_chroma import Chroma
-from langchain.chains.question_answering import load_qa_chain
-from langchain_ollama import ChatOllama
+import functools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Set
+
+from model_pool import ModelPool
+from document_registry import DocumentRegistry, document_key, hash_file, hash_text
+from embedding_pipeline import EmbeddingPipeline, EMBED_BATCH_SIZE, EMBED_CONCURRENCY
+from ingest_worker import IngestionWorker, INGEST_WINDOW_CHUNKS, count_pages, page_ranges, parse_page_range
+from answer_cache import AnswerCache
+from chain_registry import ChainRegistry, DEFAULT_PROMPT
+from context_packer import ContextPacker, count_tokens
+from bm25_index import BM25Index, is_keyword_query, reciprocal_rank_fusion
+
+# LangChain, Chroma and Ollama are imported where they are first used, so importing
+# this module (and booting the API) doesn't pay for them
+if TYPE_CHECKING:
+    from langchain_core.documents import Document
+    from langchain_chroma import Chroma
+    from langchain_ollama import ChatOllama
+
+logger = logging.getLogger(__name__)
+
+# Retrieval configuration
+RETRIEVAL_THREADS = int(os.getenv("RETRIEVAL_THREADS", "8"))
+RETRIEVAL_K = int(os.getenv("RETRIEVAL_K", "4"))
+# Candidates fetched for the context packer, which trims them to the token budget
+RETRIEVAL_CANDIDATES = int(os.getenv("RETRIEVAL_CANDIDATES", "8"))
+# Fuse BM25 with vector results, and answer keyword-shaped queries from BM25 alone
+HYBRID_RETRIEVAL = os.getenv("HYBRID_RETRIEVAL", "true").lower() == "true"
+LEXICAL_FAST_PATH = os.getenv("LEXICAL_FAST_PATH", "true").lower() == "true"
+LEXICAL_WEIGHT = float(os.getenv("LEXICAL_WEIGHT", "1.0"))
+# Ollama model that embeds chunks and queries; recorded on the collection it built
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "all-minilm")
+# Ollama server; the chat client reads OLLAMA_HOST itself, the embeddings client needs it passed
+OLLAMA_HOST = os.getenv("OLLAMA_HOST", "http://localhost:11434")
+OLLAMA_BASE_URL = OLLAMA_HOST if "://" in OLLAMA_HOST else f"http://{OLLAMA_HOST}"
 
 
 class RAG:
-    def __init__(self):
+    def __init__(self, model_pool: ModelPool = None):
         self.vectorstore = None
         self.retriever = None
-        self.llm = None
+        self.model_pool = model_pool or ModelPool()
         self.persist_directory = "./chroma_persist_dir"
         self.collection_name = "pdf_documents"
-        self.embedding_model_name = "all-minilm" 
+        self.embedding_model_name = EMBEDDING_MODEL
         self.embedding_function = None
+        self.embedding_cache = None
+        self.embed_batch_size = EMBED_BATCH_SIZE
+        self.embed_concurrency = EMBED_CONCURRENCY
+        self.ingest_window_chunks = INGEST_WINDOW_CHUNKS
+        self.registry = DocumentRegistry(os.path.join(self.persist_directory, "document_registry.json"))
+        self.ingest_worker = IngestionWorker()
+        # Guards each indexing step (collection, BM25 index and registry writes); never held while parsing
+        self._ingest_lock = threading.Lock()
+        # Lets one async indexing step at a time take a thread, so queued uploads don't tie up the executor
+        self._index_step_lock = asyncio.Lock()
+        # Documents being indexed, by id(run); their chunks count as indexed and are never stale, and
+        # thread-scoped retrieval searches what they have indexed so far
+        self._runs: Dict[int, dict] = {}
+        # Guards opening the collection; taken after the ingest lock when both are held
+        self._open_lock = threading.Lock()
+        # Why the collection couldn't be opened (embedding model mismatch); not retried
+        self.open_error: Optional[Exception] = None
+        self.retrieval_k = RETRIEVAL_K
+        self.retrieval_candidates = RETRIEVAL_CANDIDATES
+        self.context_packer = ContextPacker()
+        self.lexical_index = BM25Index(os.path.join(self.persist_directory, "bm25_index.json"))
+        self.hybrid_retrieval = HYBRID_RETRIEVAL
+        self.lexical_fast_path = LEXICAL_FAST_PATH
+        self._retrieval_executor = ThreadPoolExecutor(max_workers=RETRIEVAL_THREADS, thread_name_prefix="retrieval")
+        # Called as hook(stage, seconds) for the "embed", "search", "lexical", "retrieve" (all of
+        # retrieval) and "prefill" stages
+        self.timing_hooks: List[Callable[[str, float], None]] = []
+        self.answer_cache = AnswerCache()
+        self.chains = ChainRegistry()
+        self.model_pool.eviction_hooks.append(self.chains.discard_model)
+        # Bumped whenever chunks are added to or removed from the collection
+        self.collection_version = 0
+
+    def ingest_pdf(self, pdf_path: str, source: str = None, thread_id: str = None) -> dict:
+        """
+        Ingest a PDF incrementally.
+
+        The file isn't parsed when a document with the same content hash is
+        already registered. Otherwise only chunks whose hash isn't in the
+        collection are embedded, and chunks the previous version of this source
+        no longer produces are deleted. With a thread_id the document belongs to
+        that thread, so retrieval can be scoped to it, and only an earlier upload
+        of the same source to the same thread counts as a previous version.
+        Returns the document id (content hash) and counts of added, removed and
+        unchanged chunks.
+
+        Pages are parsed and indexed one page range at a time, so memory use
+        doesn't grow with the size of the PDF.
+        """
+        source = source or os.path.basename(pdf_path)
+        doc_hash = hash_file(pdf_path)
+
+        skipped = self._locked(self._skip_if_ingested, doc_hash, source, thread_id)
+        if skipped is not None:
+            return skipped
+
+        from langchain_core.documents import Document
+
+        run = self._locked(self._start_indexing, source, thread_id)
+        try:
+            for start, end in page_ranges(count_pages(pdf_path), self.ingest_worker.pages_per_task):
+                window = [Document(page_content=text, metadata=metadata)
+                          for text, metadata in parse_page_range(pdf_path, start, end)]
+                self._locked(self._index_window, run, window, source, doc_hash)
+            return self._locked(self._finish_indexing, run, source, doc_hash, thread_id)
+        finally:
+            self._runs.pop(id(run), None)
+
+    async def aingest_pdf(self, pdf_path: str, source: str = None, progress=None, thread_id: str = None) -> dict:
+        """
+        Async version of ingest_pdf.
+
+        Parsing and splitting run on the ingestion process pool (page ranges in
+        parallel), and hashing, embedding and index writes run on a thread, so
+        the event loop is never blocked. Parsed chunks are embedded in windows of
+        ingest_window_chunks while later page ranges are still being parsed, and
+        parsing is held back while a window is embedded, so peak memory stays
+        flat whatever the PDF size. progress, if given, is called with keyword
+        counters (pages_parsed, chunks_embedded, vectors_written, ...).
+        """
+        source = source or os.path.basename(pdf_path)
+        doc_hash = await asyncio.to_thread(hash_file, pdf_path)
+
+        skipped = await self._alocked(self._skip_if_ingested, doc_hash, source, thread_id)
+        if skipped is not None:
+            return skipped
+
+        # Documents parse concurrently; only the indexing steps take the ingest lock
+        run = await self._alocked(self._start_indexing, source, thread_id)
+        try:
+            window = []
+            async for part in self.ingest_worker.iter_chunks(pdf_path, progress):
+                window.extend(part)
+                if len(window) >= self.ingest_window_chunks:
+                    await self._alocked(self._index_window, run, window, source, doc_hash, progress)
+                    window = []
+            if window:
+                await self._alocked(self._index_window, run, window, source, doc_hash, progress)
+            return await self._alocked(self._finish_indexing, run, source, doc_hash, thread_id)
+        finally:
+            self._runs.pop(id(run), None)
+
+    def _locked(self, step, *args):
+        with self._ingest_lock:
+            return step(*args)
+
+    async def _alocked(self, step, *args):
+        """Run an indexing step on a thread under the ingest lock, one step at a time."""
+        async with self._index_step_lock:
+            return await asyncio.to_thread(self._locked, step, *args)
+
+    def _skip_if_ingested(self, doc_hash: str, source: str, thread_id: str = None) -> Optional[dict]:
+        """
+        Register a document whose content is already indexed without parsing
+        or embedding it again; None if the content is new. Call with the
+        ingest lock held.
+        """
+        existing_key = self.registry.find_by_hash(doc_hash)
+        if existing_key is None:
+            return None
+        self._ensure_vectorstore()
+        removed = 0
+        if existing_key != document_key(source, thread_id):
+            # Uploaded elsewhere: this owner gets its own entry sharing the chunks
+            run = self._start_indexing(source, thread_id)
+            try:
+                run["seen_ids"] = dict.fromkeys(self.registry.chunk_ids(existing_key))
+                removed = self._finish_indexing(run, source, doc_hash, thread_id)["removed"]
+            finally:
+                self._runs.pop(id(run), None)
+        return {"status": "skipped", "source": source, "document_id": doc_hash, "added": 0, "removed": removed,
+                "unchanged": len(self.registry.chunk_ids(existing_key))}
+
+    def index_chunks(self, chunks: List["Document"], source: str, doc_hash: str, progress=None,
+                     thread_id: str = None) -> dict:
+        """Embed new chunks of a document, delete its stale ones and update the registry."""
+        with self._ingest_lock:
+            run = self._start_indexing(source, thread_id)
+            try:
+                self._index_window(run, chunks, source, doc_hash, progress)
+                return self._finish_indexing(run, source, doc_hash, thread_id)
+            finally:
+                self._runs.pop(id(run), None)
+
+    def _start_indexing(self, source: str, thread_id: str = None) -> dict:
+        """
+        State for indexing one document in windows. Each step is called with
+        the ingest lock held; other documents may be indexed between them.
+        """
+        # Only chunk ids are kept across windows, never chunk text. indexed_ids is replaced, never
+        # changed in place, so retrieval can read it without the ingest lock.
+        run = {"key": document_key(source, thread_id), "thread_id": thread_id, "seen_ids": {},
+               "indexed_ids": frozenset(), "added": 0}
+        self._runs[id(run)] = run
+        return run
+
+    def _in_flight_ids(self, run: dict) -> Set[str]:
+        """Chunk ids claimed by documents other than run that are still being indexed."""
+        ids = set()
+        for other in list(self._runs.values()):
+            if other is not run:
+                ids.update(other["seen_ids"])
+        return ids
+
+    def _index_window(self, run: dict, chunks: List["Document"], source: str, doc_hash: str, progress=None):
+        """Embed and write the chunks of one window that aren't indexed yet."""
+        # Chunk hashes are used as vector ids; identical chunks collapse into one.
+        # Checked against the current registry, since other documents may have changed since the last window
+        indexed_ids = self.registry.all_chunk_ids() | self._in_flight_ids(run)
+        new_chunks = {}
+        for chunk in chunks:
+            chunk_id = hash_text(chunk.page_content)
+            if chunk_id in run["seen_ids"]:
+                continue
+            run["seen_ids"][chunk_id] = None
+            if chunk_id not in indexed_ids:
+                chunk.metadata.update({"source": source, "doc_hash": doc_hash, "chunk_hash": chunk_id})
+                new_chunks[chunk_id] = chunk
+
+        vectorstore = self._ensure_vectorstore()
+        if not new_chunks:
+            run["indexed_ids"] = frozenset(run["seen_ids"])
+            return
+
+        # Counters continue from the previous windows
+        offset = run["added"]
+        run["added"] += len(new_chunks)
+        window_progress = None
+        if progress is not None:
+            progress(chunks_total=run["added"])
+
+            def window_progress(**counters):
+                progress(**{name: offset + value for name, value in counters.items()})
+
+        pipeline = EmbeddingPipeline(self.embedding_function, self.embed_batch_size, self.embed_concurrency)
+        pipeline.run(vectorstore, new_chunks.items(), window_progress)
+        # Keep the BM25 index in sync with the collection
+        for chunk_id, chunk in new_chunks.items():
+            self.lexical_index.add(chunk_id, chunk.page_content, chunk.metadata)
+        run["indexed_ids"] = frozenset(run["seen_ids"])
+        self.collection_version += 1
+
+    def _finish_indexing(self, run: dict, source: str, doc_hash: str, thread_id: str = None) -> dict:
+        """Delete chunks the previous version of the document no longer produces and register it."""
+        key = run["key"]
+        seen_ids = run["seen_ids"]
+        kept_ids = self.registry.all_chunk_ids(exclude=key) | self._in_flight_ids(run)
+        stale_ids = [chunk_id for chunk_id in self.registry.chunk_ids(key)
+                     if chunk_id not in seen_ids and chunk_id not in kept_ids]
+
+        vectorstore = self._ensure_vectorstore()
+        if stale_ids:
+            vectorstore.delete(ids=stale_ids)
+            for chunk_id in stale_ids:
+                self.lexical_index.remove(chunk_id)
+            self.collection_version += 1
+        if run["added"] or stale_ids:
+            self.lexical_index.save()
+
+        self.registry.register(key, doc_hash, seen_ids.keys(), thread_id)
+
+        return {"status": "ingested", "source": source, "document_id": doc_hash, "added": run["added"],
+                "removed": len(stale_ids), "unchanged": len(seen_ids) - run["added"]}
+
+    def _ensure_vectorstore(self) -> "Chroma":
+        if self.vectorstore is not None:
+            return self.vectorstore
+        with self._open_lock:
+            if self.open_error is not None:
+                raise self.open_error
+            if self.vectorstore is None:
+                self._open_vectorstore()
+        return self.vectorstore
+
+    def _open_vectorstore(self):
+        from langchain_chroma import Chroma
 
-    def ingest_pdf(self, pdf_path: str):
         if self.embedding_function is None:
-            self.embedding_function = OllamaEmbeddings(model=self.embedding_model_name)
+            from langchain_community.embeddings import OllamaEmbeddings
+            from embedding_cache import EmbeddingCache, CachedEmbeddings
 
-        loader = PyPDFLoader(pdf_path)
-        documents = loader.load()
-        splitter = RecursiveCharacterTextSplitter(chunk_size=2000, chunk_overlap=100)
-        chunks = splitter.split_documents(documents)
+            self.embedding_cache = EmbeddingCache(os.path.join(self.persist_directory, "embedding_cache.sqlite3"))
+            self.embedding_function = CachedEmbeddings(
+                OllamaEmbeddings(model=self.embedding_model_name, base_url=OLLAMA_BASE_URL),
+                self.embedding_cache,
+                self.embedding_model_name,
+            )
 
-        if self.vectorstore is None:
-            self.vectorstore = Chroma.from_documents(
-                documents=chunks,
-                embedding=self.embedding_function,
-                persist_directory=self.persist_directory,
-                collection_name=self.collection_name,
+        vectorstore = Chroma(
+            collection_name=self.collection_name,
+            embedding_function=self.embedding_function,
+            persist_directory=self.persist_directory,
+            collection_metadata={"embedding_model": self.embedding_model_name},
+        )
+        try:
+            self._check_embedding_model(vectorstore)
+        except RuntimeError as e:
+            self.open_error = e
+            raise
+        self._sync_lexical_index(vectorstore)
+        self.retriever = vectorstore.as_retriever()
+        self.vectorstore = vectorstore
+
+    def _check_embedding_model(self, vectorstore: "Chroma"):
+        """Refuse a collection whose vectors came from a different embedding model."""
+        collection = vectorstore._collection
+        metadata = dict(collection.metadata or {})
+        stored_model = metadata.get("embedding_model")
+        if stored_model is None:
+            # Collections created before the model was recorded are assumed to match
+            collection.modify(metadata={**metadata, "embedding_model": self.embedding_model_name})
+        elif stored_model != self.embedding_model_name:
+            raise RuntimeError(
+                f"Collection {self.collection_name} was embedded with {stored_model}, "
+                f"not {self.embedding_model_name}; set EMBEDDING_MODEL={stored_model} or re-ingest into a new collection."
             )
-        else:
-            self.vectorstore.add_documents(chunks)
 
-        self.retriever = self.vectorstore.as_retriever()
+    def open_persisted(self) -> bool:
+        """
+        Open the collection persisted by a previous run so context answers work
+        without re-ingesting. Returns whether a collection is open; nothing is
+        opened if no document was ever ingested. Raises RuntimeError the first
+        time if the collection was embedded with a different model, and returns
+        False after that.
+        """
+        if self.vectorstore is not None:
+            return True
+        if not len(self.registry) or self.open_error is not None:
+            return False
+        self._ensure_vectorstore()
+        logger.info(f"Opened persisted collection {self.collection_name} ({len(self.registry)} documents)")
+        return True
+
+    def _sync_lexical_index(self, vectorstore: "Chroma"):
+        """Build the BM25 index from the collection if it predates the index."""
+        if len(self.lexical_index) or not len(self.registry):
+            return
+        existing = vectorstore.get(include=["documents", "metadatas"])
+        for chunk_id, text, metadata in zip(existing["ids"], existing["documents"], existing["metadatas"]):
+            self.lexical_index.add(chunk_id, text, metadata)
+        self.lexical_index.save()
+        logger.info(f"Built BM25 index from {len(self.lexical_index)} existing chunks")
 
-    def load_model(self, model_name: str):
-        # Lazily create the Ollama Chat model from LangChain integration
-        self.llm = ChatOllama(model=model_name, temperature=0)
+    def load_model(self, model_name: str) -> "ChatOllama":
+        # Fetch (or lazily create) the pooled Ollama Chat model; shared state is never replaced
+        return self.model_pool.get(model_name)
         
-    async def generate_question(self, question: str):
-        async for chunk in self.llm.astream(f'write a maximum 6 word title for this question: {question[:100]}'):
-            yield chunk.content
+    async def generate_question(self, question: str, model_name: str):
+        async with self.model_pool.acquire(model_name) as llm:
+            async for chunk in llm.astream(f'write a maximum 6 word title for this question: {question[:100]}'):
+                yield chunk.content
+
+    async def answer(self, question: str, model_name: str):
+        # Not cached: without retrieved context there's no collection version to invalidate the answer
+        async with self.model_pool.acquire(model_name) as llm:
+            async for chunk in llm.astream(question):
+                yield chunk.content
+
+    def _record_timing(self, stage: str, seconds: float):
+        logger.debug(f"Retrieval {stage} took {seconds * 1000:.1f}ms")
+        for hook in self.timing_hooks:
+            try:
+                hook(stage, seconds)
+            except Exception as e:
+                logger.warning(f"Timing hook failed for stage {stage}: {e}")
+
+    def resolve_scope(self, document_ids: List[str] = (), thread_id: str = None) -> Optional[Set[str]]:
+        """
+        Return the chunk ids retrieval is limited to, or None to search every document.
 
-    async def answer(self, question: str):
-        async for chunk in self.llm.astream(question):
-            yield chunk.content
+        document_ids are content hashes or source names, looked up in thread_id
+        first (KeyError if unknown); the documents attached to thread_id are
+        added to them, including the windows already indexed of documents still
+        being ingested into the thread.
+        """
+        if not document_ids and not thread_id:
+            return None
+        sources = []
+        for document_id in document_ids:
+            source = self.registry.find_source(document_id, thread_id)
+            if source is None:
+                raise KeyError(document_id)
+            sources.append(source)
+        scope = self.registry.scope_chunk_ids(sources, thread_id)
+        if thread_id:
+            for run in list(self._runs.values()):
+                if run["thread_id"] == thread_id:
+                    scope |= run["indexed_ids"]
+        return scope
 
-    async def context_answer(self, question: str):
+    async def aretrieve(self, question: str, scope: Optional[Set[str]] = None) -> List["Document"]:
+        """
+        Retrieve the most relevant chunks without blocking the event loop.
+        Query embedding and the similarity search run on the retrieval thread
+        pool and are timed separately. scope (from resolve_scope) limits the
+        search to those chunk ids.
+        """
+        ranked, _ = await self._aretrieve_with_embedding(question, self.retrieval_k, scope)
+        return [doc for doc, _ in ranked]
+
+    async def _aretrieve_with_embedding(self, question: str, k: int, scope: Optional[Set[str]] = None):
+        if self.vectorstore is None:
+            raise RuntimeError("Ingest at least one PDF document to build context.")
+        if scope is not None and not scope:
+            raise RuntimeError("No documents in the selected scope.")
+
+        loop = asyncio.get_running_loop()
+
+        # Keyword-shaped queries (error codes, part numbers) skip the embedding round trip
+        if self.lexical_fast_path and is_keyword_query(question):
+            lexical = await self._alexical_search(question, k, scope)
+            if lexical:
+                return [(self.lexical_index.document(chunk_id), score) for chunk_id, score in lexical], None
+
+        start = time.perf_counter()
+        embedding = await loop.run_in_executor(
+            self._retrieval_executor, self.embedding_function.embed_query, question
+        )
+        self._record_timing("embed", time.perf_counter() - start)
+
+        # Scoped searches only consider the chunks of the selected documents
+        where = {"chunk_hash": {"$in": sorted(scope)}} if scope is not None else None
+        start = time.perf_counter()
+        ranked = await loop.run_in_executor(
+            self._retrieval_executor,
+            functools.partial(self.vectorstore.similarity_search_by_vector_with_relevance_scores, embedding, k, filter=where),
+        )
+        self._record_timing("search", time.perf_counter() - start)
+
+        if self.hybrid_retrieval and len(self.lexical_index):
+            lexical = await self._alexical_search(question, k, scope)
+            docs_by_id = {chunk_id: None for chunk_id, _ in lexical}
+            vector_ids = []
+            for doc, _ in ranked:
+                chunk_id = doc.metadata.get("chunk_hash") or hash_text(doc.page_content)
+                docs_by_id[chunk_id] = doc
+                vector_ids.append(chunk_id)
+            fused = reciprocal_rank_fusion([vector_ids, [chunk_id for chunk_id, _ in lexical]], [1.0, LEXICAL_WEIGHT])
+            ranked = [
+                (docs_by_id[chunk_id] or self.lexical_index.document(chunk_id), score)
+                for chunk_id, score in fused[:k]
+            ]
+        return ranked, embedding
+
+    async def _alexical_search(self, question: str, k: int, scope: Optional[Set[str]] = None):
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        results = await loop.run_in_executor(self._retrieval_executor, self.lexical_index.search, question, k, scope)
+        self._record_timing("lexical", time.perf_counter() - start)
+        return results
+
+    async def context_answer(self, question: str, model_name: str, prompt: str = DEFAULT_PROMPT,
+                             stats: Optional[dict] = None, scope: Optional[Set[str]] = None):
+        """
+        Stream an answer grounded in retrieved chunks.
+
+        Retrieval is limited to scope when given (see resolve_scope).
+        Candidates are packed into the model's token budget before generation.
+        If stats is given it is filled with the packing report, tokens sent and
+        prefill latency (time until the chain produces its first output).
+        """
         if self.vectorstore is None or self.retriever is None:
             raise RuntimeError("Ingest at least one PDF document to build context.")
 
-        if self.llm is None:
-            raise RuntimeError("Load an Ollama model first using load_model().")
+        start = time.perf_counter()
+        ranked, query_embedding = await self._aretrieve_with_embedding(question, self.retrieval_candidates, scope)
+        self._record_timing("retrieve", time.perf_counter() - start)
+        relevant_docs, report = self.context_packer.pack(ranked, model_name)
+        report["prompt_tokens"] = report["context_tokens"] + count_tokens(question, model_name)
+        if stats is not None:
+            stats.update(report)
+
+        version = self.collection_version
+        chunk_ids = [doc.metadata.get("chunk_hash") or hash_text(doc.page_content) for doc in relevant_docs]
 
-        relevant_docs = self.retriever.get_relevant_documents(question)
+        cache_model = model_name if prompt == DEFAULT_PROMPT else f"{model_name}:{prompt}"
+        cached = self.answer_cache.get(cache_model, question, chunk_ids, query_embedding, version)
+        if cached is not None:
+            if stats is not None:
+                stats.update({"cached": True, "prompt_tokens": 0})
+            for chunk in cached:
+                yield chunk
+            return
 
-        chain = load_qa_chain(self.llm, chain_type="stuff")
-        async for chunk in chain.astream({"input_documents": relevant_docs, "question": question}):
-            yield chunk["output_text"]
\ No newline at end of file
+        chunks = []
+        async with self.model_pool.acquire(model_name) as llm:
+            chain = self.chains.get(llm, model_name, chain_type="stuff", prompt=prompt)
+            start = time.perf_counter()
+            async for chunk in chain.astream({"input_documents": relevant_docs, "question": question}):
+                if not chunks:
+                    prefill = time.perf_counter() - start
+                    self._record_timing("prefill", prefill)
+                    report["prefill_seconds"] = round(prefill, 4)
+                    if stats is not None:
+                        stats["prefill_seconds"] = report["prefill_seconds"]
+                chunks.append(chunk["output_text"])
+                yield chunk["output_text"]
+        logger.info(f"Context answer for {model_name}: {report}")
+        self.answer_cache.put(cache_model, question, chunks, chunk_ids, query_embedding, version)
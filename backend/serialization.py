@@ -0,0 +1,69 @@
+import os
+import json
+from datetime import date, datetime
+from typing import Any, Callable
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # Optional speedup; the standard library encoder is the fallback
+    orjson = None
+
+# JSON encoder for responses and stream frames: "orjson" (used when installed) or "json"
+JSON_SERIALIZER = os.getenv("JSON_SERIALIZER", "orjson")
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    return str(obj)
+
+
+def _json_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+def _orjson_dumps(obj: Any) -> bytes:
+    return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def get_serializer(name: str = JSON_SERIALIZER) -> Callable[[Any], bytes]:
+    """Return the dumps function for name, falling back to the json module if orjson is missing."""
+    if name == "orjson" and orjson is not None:
+        return _orjson_dumps
+    return _json_dumps
+
+
+# Compact UTF-8 JSON bytes
+dumps = get_serializer()
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with the configured serializer instead of json.dumps."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def sse_event(payload: Any) -> bytes:
+    """Encode payload as one server-sent event frame."""
+    return b"data: " + dumps(payload) + b"\n\n"
+
+
+class SSEFrame:
+    """
+    Pre-encoded server-sent event frame for payloads that differ in one field.
+
+    The frame's bytes around the varying value (the "data: " prefix, the key
+    and any fixed fields) are encoded once, so each event only serializes its
+    value: SSEFrame("content", context_used=True)("hi") gives
+    b'data: {"content":"hi","context_used":true}\\n\\n'.
+    """
+
+    def __init__(self, field: str, **fixed: Any):
+        self.prefix = b"data: {" + dumps(field) + b":"
+        self.suffix = (b"," + dumps(fixed)[1:] if fixed else b"}") + b"\n\n"
+
+    def __call__(self, value: Any) -> bytes:
+        return self.prefix + dumps(value) + self.suffix
@@ -0,0 +1,90 @@
+import os
+import asyncio
+from typing import AsyncIterator, List
+
+# Streamed text is flushed once this many bytes are buffered (0 disables coalescing)
+STREAM_FLUSH_BYTES = int(os.getenv("STREAM_FLUSH_BYTES", "64"))
+# ... or once the oldest buffered text has waited this many milliseconds
+STREAM_FLUSH_MS = float(os.getenv("STREAM_FLUSH_MS", "20"))
+
+
+async def coalesce(chunks: AsyncIterator[str], max_bytes: int = STREAM_FLUSH_BYTES,
+                   max_delay_ms: float = STREAM_FLUSH_MS) -> AsyncIterator[str]:
+    """
+    Merge small text chunks from a token stream into fewer, larger ones.
+
+    The first chunk is passed through immediately so time-to-first-token is
+    unchanged. After that, chunks are buffered and flushed as one string when
+    max_bytes (UTF-8) are waiting or max_delay_ms has passed since the first
+    buffered chunk arrived, whichever comes first; the deadline is enforced
+    even if the model stalls. Whatever is left is flushed when the stream ends,
+    and errors from chunks propagate after the text before them.
+    """
+    if max_bytes <= 0 or max_delay_ms <= 0:
+        async for chunk in chunks:
+            yield chunk
+        return
+
+    loop = asyncio.get_running_loop()
+    iterator = chunks.__aiter__()
+    max_delay = max_delay_ms / 1000
+    buffer: List[str] = []
+    size = 0
+    deadline = 0.0
+    pending = None
+    try:
+        async for first in iterator:
+            yield first
+            break
+        else:
+            return
+
+        while True:
+            if not buffer and pending is None:
+                # Nothing waiting, so there is no deadline to watch
+                try:
+                    chunk = await iterator.__anext__()
+                except StopAsyncIteration:
+                    break
+            else:
+                if pending is None:
+                    pending = asyncio.ensure_future(iterator.__anext__())
+                timeout = max(0.0, deadline - loop.time()) if buffer else None
+                done, _ = await asyncio.wait((pending,), timeout=timeout)
+                if not done:
+                    # The model is slower than the window; send what has arrived
+                    yield "".join(buffer)
+                    buffer, size = [], 0
+                    continue
+                next_chunk, pending = pending, None
+                try:
+                    chunk = next_chunk.result()
+                except StopAsyncIteration:
+                    break
+
+            if not buffer:
+                deadline = loop.time() + max_delay
+            buffer.append(chunk)
+            size += len(chunk.encode("utf-8"))
+            if size >= max_bytes or loop.time() >= deadline:
+                yield "".join(buffer)
+                buffer, size = [], 0
+    except Exception:
+        # Send the text that arrived before a failure, then re-raise
+        if buffer:
+            yield "".join(buffer)
+            buffer = []
+        raise
+    finally:
+        if pending is not None:
+            pending.cancel()
+            try:
+                await pending
+            except BaseException:
+                pass
+        aclose = getattr(iterator, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+    if buffer:
+        yield "".join(buffer)
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Test script for the BM25 keyword index helpers.
+Checks which queries take the lexical fast path; no server is needed.
+"""
+
+import sys
+import os
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bm25_index import is_keyword_query
+
+
+def test_keyword_queries():
+    """Test that codes, identifiers and quoted phrases take the fast path"""
+    print("=== Testing Keyword Queries ===")
+
+    queries = [
+        "ID-00042-017",
+        "ID-00042-017?",
+        "E1234",
+        "ERR_CONN_RESET",
+        "HTTP404 ID-00001-002",
+        '"connection reset by peer"',
+    ]
+    success = True
+    for query in queries:
+        if is_keyword_query(query):
+            print(f"✓ {query!r} is a keyword query")
+        else:
+            print(f"❌ {query!r} should be a keyword query")
+            success = False
+    return success
+
+
+def test_natural_questions_with_numbers():
+    """Test that short natural questions containing numbers still use vector search"""
+    print("\n=== Testing Natural Questions With Numbers ===")
+
+    queries = [
+        "Who won in 2020?",
+        "Tell me about iPhone 15 battery",
+        "What's on page 43 line 7?",
+        "what is ID-00042-017",
+        "2020",
+    ]
+    success = True
+    for query in queries:
+        if not is_keyword_query(query):
+            print(f"✓ {query!r} is not a keyword query")
+        else:
+            print(f"❌ {query!r} should not be a keyword query")
+            success = False
+    return success
+
+
+if __name__ == "__main__":
+    success = test_keyword_queries()
+    success = test_natural_questions_with_numbers() and success
+
+    if success:
+        print("\n🎉 All BM25 index tests passed!")
+    else:
+        print("\n❌ Some tests failed.")
+        sys.exit(1)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test script for context packing.
+Checks that only real splitter overlap is trimmed from packed chunks; no
+server is needed.
+"""
+
+import sys
+import os
+
+# Add the backend directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.documents import Document
+
+from context_packer import ContextPacker, _strip_overlap
+
+
+def test_strip_overlap():
+    """Test that short or mid-word matches are not treated as overlap"""
+    print("=== Testing Overlap Stripping ===")
+
+    cases = [
+        # (previous, text, expected)
+        ("The pool handles requests", "system overview follows", "system overview follows"),
+        ("ends with a", "a new chunk", "a new chunk"),
+        ("x" * 10 + " shared words at the boundary", "shared words at the boundary and more", " and more"),
+        ("the tail of the earlier chunk", "earlier chunkier text follows here", "earlier chunkier text follows here"),
+    ]
+    success = True
+    for previous, text, expected in cases:
+        result = _strip_overlap(previous, text)
+        if result == expected:
+            print(f"✓ {text!r} -> {result!r}")
+        else:
+            print(f"❌ {text!r}: expected {expected!r}, got {result!r}")
+            success = False
+    return success
+
+
+def test_pack_keeps_other_pages_intact():
+    """Test that chunks of different pages are never trimmed against each other"""
+    print("\n=== Testing Packing Across Pages ===")
+
+    shared = "identical sentence ending one page"
+    first = Document(page_content=f"Page one text. {shared}", metadata={"source": "a.pdf", "page": 0})
+    second = Document(page_content=f"{shared} starts page two as well.", metadata={"source": "a.pdf", "page": 1})
+    packed, _ = ContextPacker(budgets={"test": 1000}).pack([(first, 0.9), (second, 0.8)], "test")
+
+    if [doc.page_content for doc in packed] == [first.page_content, second.page_content]:
+        print("✓ Chunks of different pages are kept whole")
+        return True
+    print(f"❌ Unexpected packing: {[doc.page_content for doc in packed]}")
+    return False
+
+
+def test_pack_trims_splitter_overlap():
+    """Test that the overlap between neighbouring chunks of a page is trimmed once"""
+    print("\n=== Testing Splitter Overlap ===")
+
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+    from ingest_worker import CHUNK_SIZE, CHUNK_OVERLAP
+
+    text = " ".join(f"word{i}" for i in range(CHUNK_SIZE // 3))
+    splitter = RecursiveCharacterTextSplitter(chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP)
+    chunks = [Document(page_content=chunk, metadata={"source": "a.pdf", "page": 0})
+              for chunk in splitter.split_text(text)][:2]
+    packed, _ = ContextPacker(budgets={"test": 10000}).pack([(chunk, 1.0) for chunk in chunks], "test")
+
+    joined = " ".join(doc.page_content.strip() for doc in packed)
+    if joined == " ".join(text.split()[:len(joined.split())]):
+        print(f"✓ Overlap trimmed ({len(chunks[1].page_content) - len(packed[1].page_content)} characters)")
+        return True
+    print("❌ Packed chunks don't join back into the original text")
+    return False
+
+
+if __name__ == "__main__":
+    success = test_strip_overlap()
+    success = test_pack_keeps_other_pages_intact() and success
+    success = test_pack_trims_splitter_overlap() and success
+
+    if success:
+        print("\n🎉 All context packing tests passed!")
+    else:
+        print("\n❌ Some tests failed.")
+        sys.exit(1)
@@ -204,6 +204,116 @@ def test_json_format():
         print(f"❌ JSON format test failed: {e}")
         return False
 
+def test_message_pagination():
+    """Test offset/limit paging of messages in GET /conversations/{thread_id}"""
+    
+    base_url = "http://127.0.0.1:8001"
+    
+    print("\n=== Testing Message Pagination ===")
+    
+    try:
+        response = requests.post(f"{base_url}/threads")
+        thread_id = response.json()["thread_id"]
+        for i in range(3):
+            requests.post(
+                f"{base_url}/conversations/{thread_id}/",
+                json={"question": f"Question {i}", "answer": f"Answer {i}", "model": "test"},
+            ).raise_for_status()
+        
+        full = requests.get(f"{base_url}/conversations/{thread_id}").json()
+        page = requests.get(f"{base_url}/conversations/{thread_id}", params={"offset": 1, "limit": 1}).json()
+        
+        assert full['total_messages'] == 3, f"expected 3 messages, got {full['total_messages']}"
+        assert len(page['messages']) == 1, "page should hold one message"
+        assert page['messages'][0]['message_id'] == full['messages'][1]['message_id'], "page should be the second message"
+        assert page['total_messages'] == 3 and page['has_more'], "page should report totals and more messages"
+        
+        past_end = requests.get(f"{base_url}/conversations/{thread_id}", params={"offset": 10, "limit": 5}).json()
+        assert past_end['messages'] == [] and past_end['total_messages'] == 3, "page past the end should be empty"
+        
+        print("✓ Message pagination works")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Message pagination test failed: {e}")
+        return False
+
+def test_thread_export():
+    """Test the streaming NDJSON and JSON export of a thread"""
+    
+    base_url = "http://127.0.0.1:8001"
+    
+    print("\n=== Testing Thread Export ===")
+    
+    try:
+        response = requests.post(f"{base_url}/threads")
+        thread_id = response.json()["thread_id"]
+        for i in range(2):
+            requests.post(
+                f"{base_url}/conversations/{thread_id}/",
+                json={"question": f"Question {i}", "answer": f"Answer {i}", "model": "test"},
+            ).raise_for_status()
+        
+        with requests.get(f"{base_url}/threads/{thread_id}/export", stream=True) as export:
+            lines = [json.loads(line) for line in export.iter_lines() if line]
+        assert lines[0]["type"] == "thread", "first line should describe the thread"
+        assert [line["type"] for line in lines[1:-1]] == ["edit", "edit"], "one line per edit expected"
+        assert lines[-1] == {"type": "end", "total_messages": 2, "total_edits": 2}, f"unexpected totals: {lines[-1]}"
+        
+        exported = requests.get(f"{base_url}/threads/{thread_id}/export", params={"format": "json"}).json()
+        history = requests.get(f"{base_url}/conversations/{thread_id}").json()
+        assert exported["messages"] == history["messages"], "JSON export should match the history endpoint"
+        
+        print("✓ Thread export works")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Thread export test failed: {e}")
+        return False
+
+def test_latency_timings():
+    """Test saving a message with a trace id and reading latency percentiles"""
+    
+    base_url = "http://127.0.0.1:8001"
+    
+    print("\n=== Testing Stored Timings ===")
+    
+    try:
+        response = requests.post(f"{base_url}/threads")
+        thread_id = response.json()["thread_id"]
+        
+        # Stream an answer so there is a finished trace to link
+        with requests.post(f"{base_url}/llm_call", json={"question": "Say hi", "model": "qwen3:0.6b"}, stream=True) as stream:
+            trace_id = stream.headers.get("X-Trace-Id")
+            answer = "".join(
+                json.loads(line[6:]).get("content", "") for line in stream.iter_lines(decode_unicode=True)
+                if line.startswith("data: ")
+            )
+        assert trace_id, "X-Trace-Id header missing"
+        
+        requests.post(
+            f"{base_url}/conversations/{thread_id}/",
+            json={"question": "Say hi", "answer": answer or "hi", "model": "qwen3:0.6b", "trace_id": trace_id},
+        ).raise_for_status()
+        
+        # An unknown trace id is ignored rather than rejected
+        requests.post(
+            f"{base_url}/conversations/{thread_id}/",
+            json={"question": "Again", "answer": "hi", "model": "qwen3:0.6b", "trace_id": "unknown"},
+        ).raise_for_status()
+        
+        latency = requests.get(f"{base_url}/metrics/latency", params={"model": "qwen3:0.6b"}).json()
+        stats = latency["models"][0]
+        assert stats["count"] >= 1, "the traced message should be counted"
+        assert stats["time_to_first_token"]["p50"] is not None, "time to first token should be stored"
+        
+        print(f"✓ Stored timings work: {stats}")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Stored timings test failed: {e}")
+        return False
+
 if __name__ == "__main__":
     print("Starting conversation API tests...")
     print("Make sure the FastAPI server is running: python backend/run_server.py\n")
@@ -211,6 +321,12 @@ if __name__ == "__main__":
     success = test_conversation_api()
     if success:
         success = test_json_format()
+    if success:
+        success = test_message_pagination()
+    if success:
+        success = test_thread_export()
+    if success:
+        success = test_latency_timings()
     
     if success:
         print("\n🎉 All tests passed! The conversation retrieval API is working correctly.")
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Test script for the background document ingestion API.
+Run this after starting the FastAPI server (and Ollama) to test
+POST /documents, GET /documents/{job_id}, the SSE progress stream,
+thread/document scoped /rag/ calls and same-named uploads in two threads.
+"""
+
+import requests
+import json
+import os
+import sys
+import tempfile
+import time
+
+# Reuse the PDF generator from the benchmark helpers
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+from bench_utils import make_pdf
+
+BASE_URL = "http://localhost:8001"
+
+
+def test_documents_api():
+    """Test uploading a PDF and following its ingestion job"""
+    print("Testing /documents endpoints...")
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pdf_path = os.path.join(tmp_dir, "ingestion_test.pdf")
+            make_pdf(pdf_path, 30)
+
+            with open(pdf_path, "rb") as f:
+                response = requests.post(
+                    f"{BASE_URL}/documents",
+                    files={"pdf_file": ("ingestion_test.pdf", f, "application/pdf")},
+                    data={"thread_id": "documents-api-test-thread"},
+                )
+
+        print(f"Status Code: {response.status_code}")
+        if response.status_code != 200:
+            print(f"✗ Upload failed: {response.text}")
+            return
+        job = response.json()
+        print(f"✓ Upload returned job {job['job_id']} with status {job['status']}")
+
+        # Follow the SSE progress stream until the job finishes
+        events = 0
+        final = None
+        with requests.get(f"{BASE_URL}/documents/{job['job_id']}/events", stream=True) as stream:
+            for line in stream.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data: "):
+                    continue
+                state = json.loads(line[len("data: "):])
+                events += 1
+                print(f"  {state['status']}: pages {state['pages_parsed']}/{state['pages_total']}, "
+                      f"embedded {state['chunks_embedded']}, written {state['vectors_written']}")
+                final = state
+        print(f"✓ Received {events} progress events")
+
+        if final and final["status"] == "completed":
+            print(f"✓ Job completed: {final['result']}")
+        else:
+            print(f"✗ Job did not complete: {final}")
+
+        response = requests.get(f"{BASE_URL}/documents/{job['job_id']}")
+        if response.status_code == 200 and response.json()["status"] == final["status"]:
+            print("✓ Job status is available by polling")
+        else:
+            print(f"✗ Unexpected job status response: {response.status_code} {response.text}")
+
+        # Retrieval scoped to the thread the document was uploaded to
+        document_id = ((final or {}).get("result") or {}).get("document_id")
+        if document_id:
+            print(f"✓ Document id: {document_id}")
+        else:
+            print("✗ Job result has no document_id")
+
+        response = requests.post(
+            f"{BASE_URL}/rag/",
+            data={"question": "What is identifier ID-00003-004 about?", "model": "qwen3:0.6b",
+                  "thread_id": "documents-api-test-thread"},
+            stream=True,
+        )
+        context_used = False
+        for line in response.iter_lines(decode_unicode=True):
+            if line and line.startswith("data: "):
+                context_used = context_used or json.loads(line[len("data: "):]).get("context_used", False)
+        if response.status_code == 200 and context_used:
+            print("✓ Thread-scoped RAG call used the thread's document")
+        else:
+            print(f"✗ Thread-scoped RAG call did not use document context: {response.status_code}")
+
+        # Unknown document ids are rejected before generation starts
+        response = requests.post(
+            f"{BASE_URL}/rag/",
+            data={"question": "Anything?", "model": "qwen3:0.6b", "document_ids": "not-a-document"},
+        )
+        if response.status_code == 400:
+            print("✓ Correctly rejected unknown document id")
+        else:
+            print(f"✗ Unexpected status code for unknown document id: {response.status_code}")
+
+        # Unknown jobs return 404
+        response = requests.get(f"{BASE_URL}/documents/non-existent-job")
+        if response.status_code == 404:
+            print("✓ Correctly returned 404 for non-existent job")
+        else:
+            print(f"✗ Unexpected status code: {response.status_code}")
+
+        # Non-PDF uploads are rejected
+        response = requests.post(f"{BASE_URL}/documents", files={"pdf_file": ("notes.txt", b"hello", "text/plain")})
+        if response.status_code == 400:
+            print("✓ Correctly rejected non-PDF upload")
+        else:
+            print(f"✗ Unexpected status code for non-PDF upload: {response.status_code}")
+
+    except requests.exceptions.ConnectionError:
+        print("Error: Could not connect to server. Make sure FastAPI server is running on localhost:8001")
+
+
+def wait_for_job(job_id: str, timeout: float = 120.0):
+    """Poll an ingestion job until it finishes; returns its last state."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        state = requests.get(f"{BASE_URL}/documents/{job_id}").json()
+        if state["status"] in ("completed", "failed"):
+            return state
+        time.sleep(0.5)
+    return state
+
+
+def test_same_filename_in_two_threads():
+    """Test that different PDFs uploaded under one filename to two threads stay separate"""
+    print("\nTesting uploads with the same filename in two threads...")
+
+    try:
+        results = {}
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for thread_id, label in (("same-name-thread-a", "AAA"), ("same-name-thread-b", "BBB")):
+                pdf_path = os.path.join(tmp_dir, f"{label}.pdf")
+                make_pdf(pdf_path, 3, label=label)
+                with open(pdf_path, "rb") as f:
+                    response = requests.post(
+                        f"{BASE_URL}/documents",
+                        files={"pdf_file": ("shared_name.pdf", f, "application/pdf")},
+                        data={"thread_id": thread_id},
+                    )
+                if response.status_code != 200:
+                    print(f"✗ Upload to {thread_id} failed: {response.text}")
+                    return
+                final = wait_for_job(response.json()["job_id"])
+                if final["status"] != "completed":
+                    print(f"✗ Job for {thread_id} did not complete: {final}")
+                    return
+                results[thread_id] = final["result"]
+
+        first, second = results["same-name-thread-a"], results["same-name-thread-b"]
+        if first["removed"] == 0 and second["removed"] == 0:
+            print("✓ The second upload did not delete the first one's chunks")
+        else:
+            print(f"✗ Chunks were removed: {first['removed']}, {second['removed']}")
+
+        # Both document ids stay valid, each in its own thread
+        for thread_id, result in results.items():
+            response = requests.post(
+                f"{BASE_URL}/rag/",
+                data={"question": "What is this document about?", "model": "qwen3:0.6b",
+                      "thread_id": thread_id, "document_ids": result["document_id"]},
+                stream=True,
+            )
+            context_used = False
+            for line in response.iter_lines(decode_unicode=True):
+                if line and line.startswith("data: "):
+                    context_used = context_used or json.loads(line[len("data: "):]).get("context_used", False)
+            if response.status_code == 200 and context_used:
+                print(f"✓ Document {result['document_id'][:12]} answers in {thread_id}")
+            else:
+                print(f"✗ Document {result['document_id'][:12]} failed in {thread_id}: {response.status_code}")
+
+    except requests.exceptions.ConnectionError:
+        print("Error: Could not connect to server. Make sure FastAPI server is running on localhost:8001")
+
+
+if __name__ == "__main__":
+    print("=== Documents API Test ===")
+    test_documents_api()
+    test_same_filename_in_two_threads()
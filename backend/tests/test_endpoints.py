@@ -96,6 +96,18 @@ def test_endpoints():
     except Exception as e:
         print(f"❌ Error: {e}")
     
+    # Test 5: Prometheus metrics
+    print("\n5. Testing /metrics")
+    try:
+        response = client.get("/metrics")
+        print(f"Status Code: {response.status_code}")
+        if response.status_code == 200 and "# TYPE asyst_request_duration_seconds histogram" in response.text:
+            print("✅ Metrics exposed in Prometheus text format")
+        else:
+            print(f"❌ Unexpected metrics response: {response.text[:200]}")
+    except Exception as e:
+        print(f"❌ Error: {e}")
+    
     print("\n" + "=" * 50)
     print("Endpoint testing completed!")
 
@@ -61,6 +61,48 @@ def test_thread_titles_endpoint():
     except Exception as e:
         print(f"Error: {e}")
 
+def test_thread_titles_pagination():
+    """Test cursor pagination and ETag revalidation of GET /threads/titles"""
+    base_url = "http://localhost:8001"
+    
+    print("Testing /threads/titles pagination...")
+    
+    try:
+        # Make sure there are at least two threads to page through
+        for _ in range(2):
+            requests.post(f"{base_url}/threads")
+        
+        first = requests.get(f"{base_url}/threads/titles", params={"limit": 1})
+        cursor = first.headers.get("X-Next-Cursor")
+        if first.status_code == 200 and len(first.json()) == 1 and cursor:
+            print("✓ First page has one thread and a next cursor")
+        else:
+            print(f"✗ Unexpected first page: {first.status_code} {first.headers} {first.text}")
+            return
+        
+        second = requests.get(f"{base_url}/threads/titles", params={"limit": 1, "cursor": cursor})
+        if second.status_code == 200 and second.json() and second.json()[0]["thread_id"] != first.json()[0]["thread_id"]:
+            print("✓ Second page continues after the first")
+        else:
+            print(f"✗ Unexpected second page: {second.status_code} {second.text}")
+        
+        etag = first.headers.get("ETag")
+        cached = requests.get(f"{base_url}/threads/titles", params={"limit": 1}, headers={"If-None-Match": etag})
+        if cached.status_code == 304:
+            print("✓ Matching If-None-Match returned 304 Not Modified")
+        else:
+            print(f"✗ Expected 304 for ETag {etag}, got {cached.status_code}")
+        
+        invalid = requests.get(f"{base_url}/threads/titles", params={"cursor": "not-a-cursor"})
+        if invalid.status_code == 400:
+            print("✓ Correctly rejected invalid cursor")
+        else:
+            print(f"✗ Unexpected status code for invalid cursor: {invalid.status_code}")
+            
+    except requests.exceptions.ConnectionError:
+        print("Error: Could not connect to server. Make sure FastAPI server is running on localhost:8001")
+
+
 def test_health_endpoint():
     """Test the health endpoint to ensure server is running"""
     base_url = "http://localhost:8001"
@@ -84,6 +126,8 @@ if __name__ == "__main__":
     if test_health_endpoint():
         print()
         test_thread_titles_endpoint()
+        print()
+        test_thread_titles_pagination()
     else:
         print("Please start the FastAPI server first:")
         print("python backend/run_server.py")
\ No newline at end of file
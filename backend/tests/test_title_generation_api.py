@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test script for background thread title generation.
+Run this after starting the FastAPI server to check that creating the first
+message returns immediately and the title is filled in afterwards.
+"""
+
+import requests
+import time
+
+BASE_URL = "http://localhost:8001"
+MODEL = "qwen3:0.6b"
+
+
+def create_message(thread_id, first_message):
+    """Create a message and return (response, seconds taken)."""
+    start = time.perf_counter()
+    response = requests.post(
+        f"{BASE_URL}/conversations/{thread_id}/",
+        json={
+            "question": "How do I reverse a linked list in Python?",
+            "answer": "Walk the list and flip each next pointer.",
+            "model": MODEL,
+            "firstMessage": first_message,
+        },
+    )
+    return response, time.perf_counter() - start
+
+
+def test_title_generation():
+    """Test that the first message doesn't wait on title generation"""
+    print("Testing background title generation...")
+
+    try:
+        thread_id = requests.post(f"{BASE_URL}/threads").json()["thread_id"]
+        print(f"Created thread {thread_id}")
+
+        response, first_took = create_message(thread_id, True)
+        if response.status_code != 200:
+            print(f"✗ Failed to create first message: {response.status_code} {response.text}")
+            return
+        data = response.json()
+        print(f"First message took {first_took * 1000:.1f}ms (title_status={data.get('title_status')})")
+
+        if data.get("title_status") == "pending":
+            print("✓ Title generation was queued")
+        else:
+            print("✗ Expected title_status 'pending'")
+
+        _, second_took = create_message(thread_id, False)
+        print(f"Regular message took {second_took * 1000:.1f}ms")
+        if first_took < second_took * 3 + 0.1:
+            print("✓ First message latency matches a normal insert")
+        else:
+            print("✗ First message is still waiting on title generation")
+
+        # Long-poll until the worker writes the generated title
+        response = requests.get(f"{BASE_URL}/threads/{thread_id}/title", params={"wait": 30})
+        title = response.json()
+        print(f"Title response: {title}")
+        if not title["pending"] and title["title"] != "New Conversation":
+            print("✓ Generated title was stored")
+        else:
+            print("✗ Title was not generated in time")
+
+        # Unknown threads return 404
+        response = requests.get(f"{BASE_URL}/threads/non-existent-thread/title")
+        if response.status_code == 404:
+            print("✓ Correctly returned 404 for non-existent thread")
+        else:
+            print(f"✗ Unexpected status code: {response.status_code}")
+
+    except requests.exceptions.ConnectionError:
+        print("Error: Could not connect to server. Make sure FastAPI server is running on localhost:8001")
+
+
+if __name__ == "__main__":
+    print("=== Title Generation API Test ===")
+    test_title_generation()
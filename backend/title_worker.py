@@ -0,0 +1,152 @@
+import os
+import re
+import asyncio
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+
+from database import get_async_db_session
+from models import ThreadTitle
+
+logger = logging.getLogger(__name__)
+
+# Worker configuration
+TITLE_WORKERS = int(os.getenv("TITLE_WORKERS", "2"))
+TITLE_MAX_RETRIES = int(os.getenv("TITLE_MAX_RETRIES", "3"))
+TITLE_RETRY_DELAY = float(os.getenv("TITLE_RETRY_DELAY", "1.0"))
+
+
+def clean_title(raw_title: str, thread_id: str) -> str:
+    """Strip thinking output, tags and quotes from a generated title."""
+    generated_title = raw_title.strip()
+
+    # Remove thinking tags and content
+    if "<think>" in generated_title:
+        # Extract content after </think> tag
+        parts = generated_title.split("</think>")
+        if len(parts) > 1:
+            generated_title = parts[-1].strip()
+        else:
+            generated_title = generated_title.replace("<think>", "").strip()
+
+    # Remove any remaining XML-like tags
+    generated_title = re.sub(r'<[^>]+>', '', generated_title)
+
+    # Remove quotes and extra whitespace
+    generated_title = generated_title.replace('"', '').replace("'", "").strip()
+
+    # Limit to reasonable title length (much less than 500 chars)
+    if len(generated_title) > 100:
+        generated_title = generated_title[:97] + "..."
+
+    # Fallback to default if generation failed or is empty
+    if not generated_title:
+        generated_title = f"Conversation {thread_id[:8]}"
+
+    return generated_title
+
+
+class TitleQueue:
+    """
+    In-process background queue for thread title generation.
+
+    Jobs are keyed by thread_id: enqueueing a thread that already has a pending
+    job is a no-op. A fixed pool of asyncio workers generates the title with
+    the RAG instance, retries with exponential backoff, and writes the result
+    to ThreadTitle. Waiters can block on a thread's job via wait().
+    """
+
+    def __init__(self, rag, workers: int = TITLE_WORKERS, max_retries: int = TITLE_MAX_RETRIES,
+                 retry_delay: float = TITLE_RETRY_DELAY):
+        self.rag = rag
+        self.workers = workers
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self._queue: "asyncio.Queue[Optional[Tuple[str, str, str]]]" = asyncio.Queue()
+        self._pending: Dict[str, asyncio.Event] = {}
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self):
+        """Start the worker tasks on the running event loop."""
+        for i in range(self.workers):
+            self._tasks.append(asyncio.create_task(self._worker(i)))
+        logger.info(f"Started {self.workers} title workers")
+
+    async def stop(self):
+        """Stop the workers, letting in-flight jobs finish."""
+        for _ in self._tasks:
+            self._queue.put_nowait(None)
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        logger.info("Stopped title workers")
+
+    def enqueue(self, thread_id: str, question: str, model: str) -> bool:
+        """Queue title generation for a thread. Returns False if one is already pending."""
+        if thread_id in self._pending:
+            return False
+        self._pending[thread_id] = asyncio.Event()
+        self._queue.put_nowait((thread_id, question, model))
+        return True
+
+    def is_pending(self, thread_id: str) -> bool:
+        return thread_id in self._pending
+
+    async def wait(self, thread_id: str, timeout: float) -> bool:
+        """Wait up to timeout seconds for a pending job. Returns True if nothing is pending anymore."""
+        event = self._pending.get(thread_id)
+        if event is None:
+            return True
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def _worker(self, worker_id: int):
+        while True:
+            job = await self._queue.get()
+            if job is None:
+                self._queue.task_done()
+                return
+            thread_id, question, model = job
+            try:
+                await self._run_job(thread_id, question, model)
+            finally:
+                event = self._pending.pop(thread_id, None)
+                if event is not None:
+                    event.set()
+                self._queue.task_done()
+
+    async def _run_job(self, thread_id: str, question: str, model: str):
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                title_chunks = []
+                async for chunk in self.rag.generate_question(question, model):
+                    title_chunks.append(chunk)
+                generated_title = clean_title("".join(title_chunks), thread_id)
+                await self._save_title(thread_id, generated_title)
+                return
+            except Exception as e:
+                logger.error(f"Title generation attempt {attempt} failed for thread {thread_id}: {e}")
+                if attempt < self.max_retries:
+                    await asyncio.sleep(self.retry_delay * 2 ** (attempt - 1))
+        logger.error(f"Giving up on title generation for thread {thread_id}")
+
+    async def _save_title(self, thread_id: str, generated_title: str):
+        title_db = get_async_db_session()
+        try:
+            thread_title = await title_db.scalar(
+                select(ThreadTitle).where(ThreadTitle.thread_id == thread_id)
+            )
+            if thread_title:
+                thread_title.title = generated_title
+                await title_db.commit()
+                logger.info(f"Generated and updated title for thread {thread_id}: {generated_title}")
+            else:
+                logger.warning(f"Thread title not found for thread {thread_id}")
+        except Exception:
+            await title_db.rollback()
+            raise
+        finally:
+            await title_db.close()
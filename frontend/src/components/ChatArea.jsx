@@ -142,9 +142,12 @@ function ChatArea({ useContext, setUseContext }) {
 
           // Use the original File object if available, otherwise fall back to path/filename
           const firstPDF = uploadedFiles.find(file => file.name.toLowerCase().endsWith('.pdf'))
-          const pdfFile = firstPDF ? (firstPDF.originalFile || firstPDF.path || firstPDF.name) : null
+          const pdfFile = firstPDF && !firstPDF.jobId ? (firstPDF.originalFile || firstPDF.path || firstPDF.name) : null
 
-          stream = await apiService.callRAG(message, selectedModel, pdfFile)
+          stream = await apiService.callRAG(message, selectedModel, pdfFile, {
+            threadId,
+            documentIds: uploadedFiles.filter(file => file.documentId).map(file => file.documentId)
+          })
           processStreamFunction = apiService.processRAGStream
         } else {
           // Use regular LLM endpoint when no PDFs
@@ -185,7 +188,8 @@ function ChatArea({ useContext, setUseContext }) {
               fullResponse,
               selectedModel,
               isFirstMessage,
-              timeTook
+              timeTook,
+              stream.traceId
             )
 
             // Use the thread_id to refresh the conversation
@@ -206,6 +210,13 @@ function ChatArea({ useContext, setUseContext }) {
             updateSessionModel(actualSessionId, selectedModel, transformedConversation.messages)
             updateSessionTitle(actualSessionId, transformedConversation.title)
 
+            // The title of a new thread is generated in the background; update it when ready
+            if (isFirstMessage) {
+              apiService.getThreadTitle(threadId, 30)
+                .then(({ title }) => updateSessionTitle(actualSessionId, title))
+                .catch(error => console.error('Failed to fetch generated title:', error))
+            }
+
             setIsLoading(false)
             setStreamingMessage("")
             setGenerationStartTime(null)
@@ -331,6 +342,38 @@ function ChatArea({ useContext, setUseContext }) {
   const handleFileUpload = async (file, onProgress) => {
     setIsProcessing(true)
 
+    // API mode: ingest PDFs in the background and follow the job's progress
+    if (apiMode && file.name.toLowerCase().endsWith('.pdf')) {
+      try {
+        const job = await apiService.uploadDocument(file, currentSession?.isTemporary ? null : currentSession?.id)
+        const finishedJob = await apiService.watchDocumentJob(job.job_id, (state) => {
+          // Parsing counts for the first half of the bar, writing vectors for the second
+          const parsed = state.pages_total ? state.pages_parsed / state.pages_total : 0
+          const written = state.chunks_total ? state.vectors_written / state.chunks_total : 0
+          onProgress(Math.round(parsed * 50 + written * 50))
+        })
+
+        const uploadedFile = {
+          id: `file_${job.job_id}`,
+          name: file.name,
+          size: file.size,
+          type: file.type,
+          uploadedAt: new Date().toISOString(),
+          // Already ingested on the server, so RAG calls don't need to resend it
+          jobId: job.job_id,
+          // Scopes RAG retrieval to this document
+          documentId: finishedJob.result?.document_id
+        }
+
+        setUploadedFiles(prev => [...prev, uploadedFile])
+        setIsProcessing(false)
+        return uploadedFile
+      } catch (error) {
+        setIsProcessing(false)
+        throw error
+      }
+    }
+
     // Mock mode: Simulate file upload without actual processing
     try {
       // Simulate upload progress
@@ -402,9 +445,12 @@ function ChatArea({ useContext, setUseContext }) {
             // Use RAG endpoint when PDFs are available
             console.log('Using RAG endpoint for edit due to PDF files')
             const firstPDF = uploadedFiles.find(file => file.name.toLowerCase().endsWith('.pdf'))
-            const pdfFile = firstPDF ? (firstPDF.originalFile || firstPDF.path || firstPDF.name) : null
+            const pdfFile = firstPDF && !firstPDF.jobId ? (firstPDF.originalFile || firstPDF.path || firstPDF.name) : null
 
-            stream = await apiService.callRAG(updatedMessage, selectedModel, pdfFile)
+            stream = await apiService.callRAG(updatedMessage, selectedModel, pdfFile, {
+              threadId: currentSession?.isTemporary ? null : currentSession?.id,
+              documentIds: uploadedFiles.filter(file => file.documentId).map(file => file.documentId)
+            })
             processStreamFunction = apiService.processRAGStream
           } else {
             // Use regular LLM endpoint when no PDFs
@@ -432,7 +478,8 @@ function ChatArea({ useContext, setUseContext }) {
                 updatedMessage,
                 fullResponse,
                 selectedModel,
-                editTimeTook
+                editTimeTook,
+                stream.traceId
               )
 
               // Refresh the conversation to get the updated data
@@ -9,6 +9,8 @@ function Sidebar() {
     createSession,
     switchSession,
     deleteSession,
+    loadMoreSessions,
+    hasMoreSessions,
     isLoading
   } = useSession()
 
@@ -121,6 +123,14 @@ function Sidebar() {
             </div>
           ))
         )}
+        {!isLoading && hasMoreSessions && !isCollapsed && (
+          <button
+            onClick={() => loadMoreSessions().catch(() => {})}
+            className="w-full p-3 text-sm text-primary-600 dark:text-primary-400 hover:bg-gray-100 dark:hover:bg-gray-700"
+          >
+            Load older chats
+          </button>
+        )}
       </div>
 
       <div className="p-3 border-t border-gray-200 dark:border-gray-700">
@@ -12,6 +12,8 @@ export function SessionProvider({ children }) {
   const [sessions, setSessions] = useState([])
   const [currentSessionId, setCurrentSessionId] = useState(null)
   const [isLoading, setIsLoading] = useState(true)
+  // Cursor for the next page of threads (null once every thread is loaded)
+  const [nextCursor, setNextCursor] = useState(null)
 
   // Get current session object
   const currentSession = sessions.find(session => session.id === currentSessionId) || null
@@ -20,9 +22,10 @@ export function SessionProvider({ children }) {
   useEffect(() => {
     setIsLoading(true)
 
-    // Load thread titles from API
-    apiService.getThreadTitles()
-      .then(threadTitles => {
+    // Load the first page of thread titles from API
+    apiService.getThreadTitlesPage()
+      .then(({ threads: threadTitles, nextCursor }) => {
+        setNextCursor(nextCursor)
         const formattedSessions = apiService.transformThreadTitles(threadTitles).map(session => ({
           ...session,
           messages: [] // Initialize with empty messages array
@@ -305,11 +308,31 @@ export function SessionProvider({ children }) {
     )
   }
 
+  // Load the next page of older threads into the sidebar
+  const loadMoreSessions = async () => {
+    if (!nextCursor) return
+    try {
+      const page = await apiService.getThreadTitlesPage(nextCursor)
+      const olderSessions = apiService.transformThreadTitles(page.threads).map(session => ({
+        ...session,
+        messages: []
+      }))
+      setSessions(prevSessions => {
+        const loadedIds = new Set(prevSessions.map(session => session.id))
+        return [...prevSessions, ...olderSessions.filter(session => !loadedIds.has(session.id))]
+      })
+      setNextCursor(page.nextCursor)
+    } catch (error) {
+      console.error('Failed to load more threads:', error)
+      throw error
+    }
+  }
+
   // Refresh thread titles from API (useful after title generation)
   const refreshThreadTitles = async () => {
     try {
-      const threadTitles = await apiService.getThreadTitles()
-      const formattedSessions = apiService.transformThreadTitles(threadTitles).map(session => {
+      const page = await apiService.getThreadTitlesPage()
+      const formattedSessions = apiService.transformThreadTitles(page.threads).map(session => {
         // Preserve existing messages and temporary status
         const existingSession = sessions.find(s => s.id === session.id)
         return {
@@ -321,7 +344,13 @@ export function SessionProvider({ children }) {
 
       // Add any temporary sessions that aren't in the API response
       const tempSessions = sessions.filter(s => s.isTemporary)
-      const allSessions = [...tempSessions, ...formattedSessions]
+      // Keep older pages that were already loaded; only the first page is refreshed
+      const refreshedIds = new Set(formattedSessions.map(s => s.id))
+      const olderSessions = sessions.filter(s => !s.isTemporary && !refreshedIds.has(s.id))
+      const allSessions = [...tempSessions, ...formattedSessions, ...olderSessions]
+      if (olderSessions.length === 0) {
+        setNextCursor(page.nextCursor)
+      }
 
       setSessions(allSessions)
       return allSessions
@@ -344,6 +373,8 @@ export function SessionProvider({ children }) {
       convertTemporarySession,
       updateSessionTitle,
       refreshThreadTitles,
+      loadMoreSessions,
+      hasMoreSessions: Boolean(nextCursor),
       isLoading
     }}>
       {children}
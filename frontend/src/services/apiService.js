@@ -40,19 +40,52 @@ const apiService = {
   },
 
   /**
-   * Get all thread titles for sidebar display
-   * @returns {Promise} Promise that resolves to an array of thread titles
+   * Get the most recent thread titles for sidebar display
+   * @returns {Promise} Promise that resolves to an array of thread titles (first page)
    */
   getThreadTitles: async () => {
+    const { threads } = await apiService.getThreadTitlesPage()
+    return threads
+  },
+
+  /**
+   * Get a page of thread titles, newest first
+   * @param {string|null} cursor - nextCursor of the previous page (null for the first page)
+   * @param {number} limit - Number of threads per page
+   * @returns {Promise} Promise that resolves to { threads, nextCursor } (nextCursor is null on the last page)
+   */
+  getThreadTitlesPage: async (cursor = null, limit = 50) => {
     try {
-      const response = await fetch(`${API_BASE_URL}/threads/titles`)
-      return await handleResponse(response)
+      const params = new URLSearchParams({ limit: String(limit) })
+      if (cursor) {
+        params.set('cursor', cursor)
+      }
+      // The browser revalidates with If-None-Match and reuses its cached page on 304
+      const response = await fetch(`${API_BASE_URL}/threads/titles?${params}`)
+      const threads = await handleResponse(response)
+      return { threads, nextCursor: response.headers.get('X-Next-Cursor') }
     } catch (error) {
       console.error('Failed to fetch thread titles:', error)
       throw error
     }
   },
 
+  /**
+   * Get the current title of a thread, optionally waiting for background generation
+   * @param {string} threadId - The ID of the thread
+   * @param {number} wait - Seconds to wait for a pending title (0 returns immediately)
+   * @returns {Promise} Promise that resolves to { thread_id, title, pending }
+   */
+  getThreadTitle: async (threadId, wait = 0) => {
+    try {
+      const response = await fetch(`${API_BASE_URL}/threads/${threadId}/title?wait=${wait}`)
+      return await handleResponse(response)
+    } catch (error) {
+      console.error(`Failed to fetch title for thread ${threadId}:`, error)
+      throw error
+    }
+  },
+
   /**
    * Get full conversation history for a specific thread
    * @param {string} threadId - The ID of the thread to get (received from backend)
@@ -92,9 +125,10 @@ const apiService = {
    * @param {string} model - The model used
    * @param {boolean} firstMessage - Whether this is the first message in the thread
    * @param {number} timeTook - Time taken to generate the answer in seconds
+   * @param {string} traceId - Trace id of the stream that produced the answer (stream.traceId)
    * @returns {Promise} Promise that resolves to the created message with backend-generated IDs
    */
-  createMessage: async (threadId, question, answer, model, firstMessage = false, timeTook = null) => {
+  createMessage: async (threadId, question, answer, model, firstMessage = false, timeTook = null, traceId = null) => {
     try {
       const response = await fetch(`${API_BASE_URL}/conversations/${threadId}/`, {
         method: 'POST',
@@ -106,7 +140,8 @@ const apiService = {
           answer,
           model,
           firstMessage,
-          time_took: timeTook
+          time_took: timeTook,
+          trace_id: traceId
         })
       })
       return await handleResponse(response)
@@ -123,9 +158,10 @@ const apiService = {
    * @param {string} answer - The edited answer text
    * @param {string} model - The model used
    * @param {number} timeTook - Time taken to generate the edited answer in seconds
+   * @param {string} traceId - Trace id of the stream that produced the answer (stream.traceId)
    * @returns {Promise} Promise that resolves to the created edit with backend-generated edit_id
    */
-  createMessageEdit: async (messageId, question, answer, model, timeTook = null) => {
+  createMessageEdit: async (messageId, question, answer, model, timeTook = null, traceId = null) => {
     try {
       const response = await fetch(`${API_BASE_URL}/conversations/${messageId}/edits`, {
         method: 'POST',
@@ -136,7 +172,8 @@ const apiService = {
           question,
           answer,
           model,
-          time_took: timeTook
+          time_took: timeTook,
+          trace_id: traceId
         })
       })
       return await handleResponse(response)
@@ -212,6 +249,8 @@ const apiService = {
         throw new Error(errorData.detail?.message || errorData.detail || `HTTP ${response.status}`)
       }
 
+      // Lets the saved message be linked to the server-side timings of this response
+      response.body.traceId = response.headers.get('X-Trace-Id')
       return response.body
     } catch (error) {
       console.error('Failed to call LLM:', error)
@@ -248,14 +287,17 @@ const apiService = {
       const reader = stream.getReader()
       const decoder = new TextDecoder()
       let fullResponse = ''
+      let buffered = ''
 
       while (true) {
         const { done, value } = await reader.read()
 
         if (done) break
 
-        const chunk = decoder.decode(value, { stream: true })
-        const lines = chunk.split('\n')
+        // A read can end mid-frame; keep the partial line for the next one
+        buffered += decoder.decode(value, { stream: true })
+        const lines = buffered.split('\n')
+        buffered = lines.pop()
 
         for (const line of lines) {
           if (line.startsWith('data: ')) {
@@ -285,14 +327,70 @@ const apiService = {
     }
   },
 
+  /**
+   * Upload a PDF for background ingestion
+   * @param {File} file - The PDF file to upload
+   * @param {string} threadId - Optional thread the document belongs to
+   * @returns {Promise} Promise that resolves to the ingestion job ({ job_id, status, ... })
+   */
+  uploadDocument: async (file, threadId = null) => {
+    try {
+      const formData = new FormData()
+      formData.append('pdf_file', file)
+      if (threadId) {
+        formData.append('thread_id', threadId)
+      }
+
+      const response = await fetch(`${API_BASE_URL}/documents`, {
+        method: 'POST',
+        body: formData
+      })
+      return await handleResponse(response)
+    } catch (error) {
+      console.error(`Failed to upload document ${file.name}:`, error)
+      throw error
+    }
+  },
+
+  /**
+   * Follow an ingestion job's progress until it completes or fails
+   * @param {string} jobId - The ingestion job ID returned by uploadDocument
+   * @param {function} onProgress - Callback with the job state on every update
+   * @returns {Promise} Promise that resolves to the final job state (rejects if the job failed)
+   */
+  watchDocumentJob: (jobId, onProgress) => {
+    return new Promise((resolve, reject) => {
+      const source = new EventSource(`${API_BASE_URL}/documents/${jobId}/events`)
+
+      source.onmessage = (event) => {
+        const job = JSON.parse(event.data)
+        onProgress?.(job)
+
+        if (job.status === 'completed') {
+          source.close()
+          resolve(job)
+        } else if (job.status === 'failed') {
+          source.close()
+          reject(new Error(job.error || 'Document ingestion failed'))
+        }
+      }
+
+      source.onerror = () => {
+        source.close()
+        reject(new Error(`Lost connection to ingestion job ${jobId}`))
+      }
+    })
+  },
+
   /**
    * Call RAG endpoint for context-aware responses
    * @param {string} question - The question to ask the RAG system
    * @param {string} model - The model to use for generation
    * @param {File|string} pdfFile - PDF File object to upload or path string
+   * @param {Object} scope - Optional retrieval scope: { threadId, documentIds }
    * @returns {Promise<ReadableStream>} Promise that resolves to a readable stream
    */
-  callRAG: async (question, model, pdfFile = null) => {
+  callRAG: async (question, model, pdfFile = null, scope = {}) => {
     try {
       // Use FormData to handle file uploads
       const formData = new FormData()
@@ -309,6 +407,14 @@ const apiService = {
         }
       }
 
+      // Only search the documents of this conversation
+      if (scope.threadId) {
+        formData.append('thread_id', scope.threadId)
+      }
+      if (scope.documentIds?.length) {
+        formData.append('document_ids', scope.documentIds.join(','))
+      }
+
       const response = await fetch(`${API_BASE_URL}/rag/`, {
         method: 'POST',
         body: formData // Don't set Content-Type header, let browser set it for FormData
@@ -319,6 +425,7 @@ const apiService = {
         throw new Error(errorData.detail?.message || errorData.detail || `HTTP ${response.status}`)
       }
 
+      response.body.traceId = response.headers.get('X-Trace-Id')
       return response.body
     } catch (error) {
       console.error('Failed to call RAG:', error)
@@ -338,6 +445,7 @@ const apiService = {
       const reader = stream.getReader()
       const decoder = new TextDecoder()
       let fullResponse = ''
+      let buffered = ''
       let contextUsed = false
 
       while (true) {
@@ -345,8 +453,10 @@ const apiService = {
 
         if (done) break
 
-        const chunk = decoder.decode(value, { stream: true })
-        const lines = chunk.split('\n')
+        // A read can end mid-frame; keep the partial line for the next one
+        buffered += decoder.decode(value, { stream: true })
+        const lines = buffered.split('\n')
+        buffered = lines.pop()
 
         for (const line of lines) {
           if (line.startsWith('data: ')) {
@@ -18,15 +18,28 @@ class RAG:
         self.embedding_model_name = "all-minilm" 
         self.embedding_function = None
 
-    def ingest_pdf(self, pdf_path: str):
+    def ingest_pdf(self, pdf_path: str, window_pages: int = 25):
         if self.embedding_function is None:
             self.embedding_function = OllamaEmbeddings(model=self.embedding_model_name)
 
+        # Load pages lazily and split/embed them a window at a time to keep memory flat
         loader = PyPDFLoader(pdf_path)
-        documents = loader.load()
         splitter = RecursiveCharacterTextSplitter(chunk_size=2000, chunk_overlap=100)
-        chunks = splitter.split_documents(documents)
+        window = []
+        for page in loader.lazy_load():
+            window.append(page)
+            if len(window) >= window_pages:
+                self._add_chunks(splitter.split_documents(window))
+                window = []
+        if window:
+            self._add_chunks(splitter.split_documents(window))
 
+        if self.vectorstore is not None:
+            self.retriever = self.vectorstore.as_retriever()
+
+    def _add_chunks(self, chunks):
+        if not chunks:
+            return
         if self.vectorstore is None:
             self.vectorstore = Chroma.from_documents(
                 documents=chunks,
@@ -37,8 +50,6 @@ class RAG:
         else:
             self.vectorstore.add_documents(chunks)
 
-        self.retriever = self.vectorstore.as_retriever()
-
     def load_model(self, model_name: str):
         # Lazily create the Ollama Chat model from LangChain integration
         self.llm = ChatOllama(model=model_name, temperature=0)
@@ -56,7 +56,7 @@ CREATE TABLE threads (
 );
 
 -- Create index for threads table
-CREATE INDEX idx_threads_started_at ON threads(started_at);
+CREATE INDEX idx_threads_started_at_thread_id ON threads(started_at, thread_id);
 
 -- Create thread_titles table
 -- Stores the current title for each thread (can be updated)
@@ -81,6 +81,12 @@ CREATE TABLE conversations (
     created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
     model VARCHAR(100) NOT NULL,
     time_took FLOAT,
+    trace_id VARCHAR(64),
+    time_to_first_token FLOAT,
+    generation_time FLOAT,
+    retrieval_time FLOAT,
+    prompt_tokens INTEGER,
+    completion_tokens INTEGER,
     PRIMARY KEY (thread_id, message_id, edit_id),
     CONSTRAINT fk_conversations_thread_id 
         FOREIGN KEY (thread_id) 
@@ -91,8 +97,10 @@ CREATE TABLE conversations (
 -- Create indexes for conversations table
 CREATE INDEX idx_conversations_thread_id ON conversations(thread_id);
 CREATE INDEX idx_conversations_message_id ON conversations(thread_id, message_id);
-CREATE INDEX idx_conversations_created_at ON conversations(created_at);
-CREATE INDEX idx_conversations_model ON conversations(model);
+CREATE INDEX idx_conversations_model_created_at ON conversations(model, created_at)
+    INCLUDE (time_to_first_token, generation_time, retrieval_time, completion_tokens);
+CREATE INDEX idx_conversations_created_at_model ON conversations(created_at)
+    INCLUDE (model, time_to_first_token, generation_time, retrieval_time, completion_tokens);
 
 -- Verify table creation
 \dt
@@ -189,7 +197,7 @@ echo ""
 echo "Database initialization with mock data complete!"
 echo "================================================"
 echo "Tables created:"
-echo "- threads (with idx_threads_started_at index)"
+echo "- threads (with idx_threads_started_at_thread_id index)"
 echo "- thread_titles (with foreign key to threads, CASCADE DELETE)"
 echo "- conversations (with composite primary key and multiple indexes, CASCADE DELETE)"
 echo ""
@@ -204,11 +212,11 @@ echo "- thread_titles.thread_id -> threads.thread_id (CASCADE DELETE)"
 echo "- conversations.thread_id -> threads.thread_id (CASCADE DELETE)"
 echo ""
 echo "Indexes created:"
-echo "- idx_threads_started_at on threads(started_at)"
+echo "- idx_threads_started_at_thread_id on threads(started_at, thread_id)"
 echo "- idx_conversations_thread_id on conversations(thread_id)"
 echo "- idx_conversations_message_id on conversations(thread_id, message_id)"
-echo "- idx_conversations_created_at on conversations(created_at)"
-echo "- idx_conversations_model on conversations(model)"
+echo "- idx_conversations_model_created_at on conversations(model, created_at), covering the generation timings"
+echo "- idx_conversations_created_at_model on conversations(created_at), covering the model and generation timings"
 echo ""
 echo "To connect to the database and verify:"
 echo "podman exec -it ${CONTAINER_NAME} psql -U ${POSTGRES_USER} -d ${POSTGRES_DB}"
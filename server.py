@@ -35,12 +35,13 @@ async def upload_pdf(file: UploadFile = File(...)):
     # Save uploaded file temporarily
     temp_file_path = f"temp_{file.filename}"
     try:
+        # Copy the upload in blocks rather than reading it into memory whole
         with open(temp_file_path, "wb") as temp_file:
-            content = await file.read()
-            temp_file.write(content)
+            while block := await file.read(1024 * 1024):
+                temp_file.write(block)
         
-        # Ingest PDF
-        rag.ingest_pdf(temp_file_path)
+        # Ingest PDF off the event loop so other requests keep streaming
+        await asyncio.to_thread(rag.ingest_pdf, temp_file_path)
         return {"message": f"Successfully ingested {file.filename}"}
     finally:
         # Clean up temporary file